@@ -0,0 +1,59 @@
+"""Wakeups and on_nothing calls of the polling monitor loop, fixed interval vs adaptive backoff.
+
+Runs the loop without push events on the fake backend through three phases: no
+session at all, a playing session, then the same session paused.
+
+Run from the DynamicIsland directory: python benchmarks/adaptive_polling.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend
+from functions.media_backend import PLAYING, PAUSED
+from functions.media_checker import MediaPlayerController
+from functions.media_events import FakeEventSource
+
+
+async def run(label, phase, interval, max_interval):
+    backend = FakeMediaBackend()
+    controller = MediaPlayerController(backend=backend, event_source=FakeEventSource(available=False))
+    counts = {"nothing": 0}
+
+    async def on_nothing():
+        counts["nothing"] += 1
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(
+        on_nothing=on_nothing, interval=interval, max_interval=max_interval))
+    rows = []
+    for name, step in (("no session", None),
+                       ("playing", {"title": "Track", "status": PLAYING}),
+                       ("paused", {"status": PAUSED})):
+        if step:
+            backend.update("player", **step)
+        before = controller.poll_interval.wakeups if controller.poll_interval else 0
+        nothing_before = counts["nothing"]
+        await asyncio.sleep(phase)
+        stats = controller.monitor_stats()
+        rows.append(f"{name} {stats['wakeups'] - before:4d} wakeups, on_nothing {counts['nothing'] - nothing_before}, "
+                    f"interval {stats['interval']:.2f} s")
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    print(f"{label:8} | " + " | ".join(rows))
+
+
+def main(phase, interval, max_interval):
+    asyncio.run(run("fixed", phase, interval, interval))
+    asyncio.run(run("adaptive", phase, interval, max_interval))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--phase", type=float, default=6.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--max-interval", type=float, default=4.0)
+    args = parser.parse_args()
+    main(args.phase, args.interval, args.max_interval)
@@ -0,0 +1,41 @@
+"""Accuracy and sampling cost of the fitted animation curves against the raw Blender frames.
+
+Run from the DynamicIsland directory: python benchmarks/animation_curves.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.animation_bundle import load_bundle
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main():
+    bundle = load_bundle()
+    manager = AnimationManager(scale_factor=70, bundle=bundle)
+    print(f"{'clip':16} {'frames':>6} {'knots':>6} {'max err px':>10} {'sample us':>10} {'render@120 us':>14}")
+    for name in bundle.names():
+        manager.load_animation(name, name)
+        first_frame, clip = manager.get_animation(name)
+        curve = manager.get_curve(name)
+        frames = np.arange(first_frame, first_frame + clip.shape[1])
+        width, height = curve.sample(frames, manager.scale)
+        error = max(np.abs(width - clip[0] * manager.scale).max(), np.abs(height - clip[1] * manager.scale).max())
+        middle = (curve.first_frame + curve.last_frame) / 2 + 0.37
+        sample_cost = timed(lambda: manager.sample(name, middle), 2000)
+        render_cost = timed(lambda: manager.render(name, 120), 500)
+        print(f"{name:16} {clip.shape[1]:6d} {len(curve):6d} {error:10.4f} {sample_cost:10.2f} {render_cost:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Frame rate, jitter and dropped frames of the animation scheduler against a fake container.
+
+Plays the hover clips back to back, preempting every other clip halfway through like
+a user sweeping the mouse over the island.
+
+Run from the DynamicIsland directory: python benchmarks/animation_playback.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.AnimationScheduler import AnimationScheduler
+from fakes import FakeContainer
+
+
+async def run(fps, update_cost, rounds):
+    manager = AnimationManager(scale_factor=70)
+    for name, prefix in (("callback", "callback"), ("close", "callback_out"),
+                         ("side_hovered", "side_hovered"), ("side_unhovered", "side_unhovered")):
+        manager.load_animation(name, prefix)
+    container = FakeContainer(update_cost)
+
+    def apply_frame(width, height):
+        container.width, container.height = width, height
+        container.update()
+
+    scheduler = AnimationScheduler(manager, apply_frame, fps=fps)
+    start = time.perf_counter()
+    for i in range(rounds):
+        for name in ("callback", "close", "side_hovered", "side_unhovered"):
+            future = scheduler.play(name, speed=0.01)
+            if i % 2:
+                await asyncio.sleep(manager.frame_count(name) * 0.005)
+            else:
+                await future
+    await asyncio.sleep(0.05)
+    return scheduler.stats(), container.updates, time.perf_counter() - start
+
+
+def main(fps, update_cost, rounds):
+    stats, updates, elapsed = asyncio.run(run(fps, update_cost, rounds))
+    print(f"target {fps} fps, update cost {update_cost * 1000:.1f} ms, {elapsed:.2f} s")
+    for key, value in stats.items():
+        print(f"{key:16} {value:10.2f}" if isinstance(value, float) else f"{key:16} {value:10d}")
+    print(f"{'container.update':16} {updates:10d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--update-cost", type=float, default=0.002)
+    parser.add_argument("--rounds", type=int, default=4)
+    args = parser.parse_args()
+    main(args.fps, args.update_cost, args.rounds)
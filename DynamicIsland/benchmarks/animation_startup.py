@@ -0,0 +1,64 @@
+"""Startup cost of loading the six island clips: text parsing vs the compiled bundle.
+
+Run from the DynamicIsland directory: python benchmarks/animation_startup.py
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+os.chdir(SRC)  # convert_frames resolves assets/ relative to the working directory
+
+from convert_frames import convert_frames_to_dict
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.animation_bundle import build_bundle, load_bundle
+
+CLIPS = {
+    "open": "frames_open",
+    "callback": "callback",
+    "close": "callback_out",
+    "show_side": "show_side",
+    "side_hovered": "side_hovered",
+    "side_unhovered": "side_unhovered",
+}
+
+
+def load_text():
+    animations = {name: convert_frames_to_dict(prefix) for name, prefix in CLIPS.items()}
+    return max(animations["open"].keys())
+
+
+def load_compiled():
+    manager = AnimationManager(scale_factor=70)
+    for name, prefix in CLIPS.items():
+        manager.load_animation(name, prefix)
+    return manager.frame_count("open")
+
+
+def measure(function, repeat):
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat, peak
+
+
+def main(repeat):
+    build_bundle()
+    load_bundle()
+    text = measure(load_text, repeat)
+    compiled = measure(load_compiled, repeat)
+    print(f"text parsing:     {text[0]:7.3f} ms, peak {text[1] / 1024:7.1f} KiB")
+    print(f"compiled bundle:  {compiled[0]:7.3f} ms, peak {compiled[1] / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args().repeat)
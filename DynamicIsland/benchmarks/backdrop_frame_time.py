@@ -0,0 +1,99 @@
+"""Per-frame raster cost of the island background, live blur vs the pre-blurred backdrop.
+
+Replays the island sizes of the resize clips and, for every frame, does the pixel work the
+renderer has to do for the background: the live path scales the cover 10x into the
+500x500 layer and blurs it with sigma 50, the static path stretches the 32 px backdrop.
+PIL on the CPU stands in for the compositor, absolute numbers are a proxy but the
+ratio between the two paths is what the change is about.
+
+Run from the DynamicIsland directory: python benchmarks/backdrop_frame_time.py
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from PIL import Image, ImageFilter
+from animation_functions.AnimationManager import AnimationManager
+from functions.image_pipeline import process_cover
+from fakes import synthetic_covers
+
+LAYER_SIZE = 500
+LIVE_SCALE = 10
+LIVE_SIGMA = 50
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def island_sizes(clips):
+    manager = AnimationManager(scale_factor=70)
+    sizes = []
+    for name in clips:
+        manager.load_animation(name, name)
+        sizes.extend((int(w), int(h)) for w, h in manager.render(name, fps=60))
+    return sizes
+
+
+def live_frame(cover: Image.Image, width, height):
+    # ft.Image(scale=10) centered in the layer: only the middle tenth of the cover is visible
+    crop = cover.width / LIVE_SCALE
+    left = (cover.width - crop) / 2
+    layer = cover.resize((LAYER_SIZE, LAYER_SIZE), Image.BILINEAR, box=(left, left, left + crop, left + crop))
+    layer = layer.filter(ImageFilter.GaussianBlur(LIVE_SIGMA))
+    return _clip(layer, width, height)
+
+
+def static_frame(backdrop: Image.Image, width, height):
+    layer = backdrop.resize((LAYER_SIZE, LAYER_SIZE), Image.BILINEAR)
+    return _clip(layer, width, height)
+
+
+def _clip(layer, width, height):
+    left = (LAYER_SIZE - min(width, LAYER_SIZE)) // 2
+    top = (LAYER_SIZE - min(height, LAYER_SIZE)) // 2
+    return layer.crop((left, top, left + min(width, LAYER_SIZE), top + min(height, LAYER_SIZE)))
+
+
+def measure(render, source, sizes):
+    times = []
+    for width, height in sizes:
+        start = time.perf_counter()
+        render(source, width, height)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(label, times):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    over = sum(t > FRAME_BUDGET_MS for t in times)
+    print(f"{label:8} p50 {statistics.median(times):8.2f} ms  p95 {p95:8.2f} ms  "
+          f"max {times[-1]:8.2f} ms  over budget {over}/{len(times)}")
+
+
+def main(size, clips, modes):
+    data = synthetic_covers(1, size)[0]
+    start = time.perf_counter()
+    art = process_cover(data)
+    prepare_ms = (time.perf_counter() - start) * 1000
+    cover = Image.open(io.BytesIO(art.jpeg)).convert("RGB")
+    backdrop = Image.open(io.BytesIO(art.backdrop_jpeg)).convert("RGB")
+    sizes = island_sizes(clips)
+    print(f"{len(sizes)} frames from {', '.join(clips)}, cover {size}px, backdrop {len(art.backdrop_jpeg)} B, "
+          f"process_cover {prepare_ms:.1f} ms once per cover")
+    if "live" in modes:
+        report("live", measure(live_frame, cover, sizes))
+    if "static" in modes:
+        report("static", measure(static_frame, backdrop, sizes))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=600)
+    parser.add_argument("--clips", nargs="+", default=["show_side", "side_hovered", "side_unhovered"])
+    parser.add_argument("--modes", nargs="+", choices=["live", "static"], default=["live", "static"])
+    args = parser.parse_args()
+    main(args.size, args.clips, args.modes)
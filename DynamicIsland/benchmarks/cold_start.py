@@ -0,0 +1,92 @@
+"""Cold-start cost of what the island needs before its first paint, in fresh interpreters.
+
+Each stage runs in a new Python process so import time is included, and reports the
+wall time plus whether NumPy and PIL had to be imported for it:
+
+    collapsed  deferred clips, only the collapsed size read from the bundle (current startup)
+    eager      every clip loaded up front (startup before the clips were deferred)
+    media      importing and creating the media controller on the fake backend
+
+Flet and WinRT are not needed, their import is outside what this measures.
+
+Run from the DynamicIsland directory: python benchmarks/cold_start.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+CLIPS = {
+    "open": "frames_open",
+    "callback": "callback",
+    "close": "callback_out",
+    "show_side": "show_side",
+    "side_hovered": "side_hovered",
+    "side_unhovered": "side_unhovered",
+}
+
+PRELUDE = f"""
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {SRC!r})
+"""
+
+EPILOGUE = """
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000,
+                  'numpy': 'numpy' in sys.modules, 'PIL': 'PIL' in sys.modules}))
+"""
+
+STAGES = {
+    'collapsed': f"""
+from animation_functions.AnimationManager import AnimationManager
+manager = AnimationManager(scale_factor=70)
+for name, prefix in {CLIPS!r}.items():
+    manager.defer_animation(name, prefix)
+manager.get_frame_data("open", 1)
+""",
+    'eager': f"""
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.animation_curves import AnimationCurve
+manager = AnimationManager(scale_factor=70)
+for name, prefix in {CLIPS!r}.items():
+    manager.load_animation(name, prefix)
+manager.get_frame_data("open", 1)
+""",
+    'media': """
+from functions.fake_media_backend import FakeMediaBackend
+from functions.media_checker import MediaPlayerController
+controller = MediaPlayerController(backend=FakeMediaBackend())
+controller.image_pipeline.shutdown()
+""",
+}
+
+
+def run_stage(code):
+    output = subprocess.run([sys.executable, "-c", PRELUDE + code + EPILOGUE],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(stages, repeat):
+    # One untimed run so every stage reads a warm OS file cache and an existing bundle
+    run_stage(STAGES['eager'])
+    for name in stages:
+        runs = [run_stage(STAGES[name]) for _ in range(repeat)]
+        loaded = [module for module in ("numpy", "PIL") if runs[-1][module]]
+        print(f"{name:10} {statistics.median(run['ms'] for run in runs):8.1f} ms  "
+              f"imports {', '.join(loaded) or 'neither NumPy nor PIL'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("stages", nargs="*", help=f"subset to run: {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    main(args.stages or list(STAGES), args.repeat)
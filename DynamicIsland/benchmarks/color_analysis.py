@@ -0,0 +1,89 @@
+"""Compare the vectorized color analysis with the original per-pixel contrast color.
+
+Run from the DynamicIsland directory: python benchmarks/color_analysis.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from PIL import Image, ImageDraw
+from functions.color_analysis import analyze_colors
+from functions.image_pipeline import THUMBNAIL_SIZE
+
+
+def legacy_contrast_color(image: Image.Image) -> str:
+    """Center crop contrast color the music layer used before the NumPy rewrite"""
+    image = image.convert("RGB")
+    width, height = image.size
+
+    center_x, center_y = width // 2, height // 2
+
+    square_size = 30
+    left = max(center_x - square_size // 2, 0)
+    top = max(center_y - square_size // 2, 0)
+    right = min(center_x + square_size // 2, width)
+    bottom = min(center_y + square_size // 2, height)
+
+    cropped_image = image.crop((left, top, right, bottom))
+    pixels = list(cropped_image.getdata())
+
+    avg_pixel = tuple(sum(channel) // len(pixels) for channel in zip(*pixels))
+
+    brightness = (avg_pixel[0] * 0.299 + avg_pixel[1] * 0.587 + avg_pixel[2] * 0.114)
+
+    return 'black' if brightness > 150 else 'white,0.8'
+
+
+def generated_covers(count, size, seed=4):
+    """Flat backgrounds with a few shapes, some of them over the center"""
+    rng = random.Random(seed)
+    covers = []
+    for _ in range(count):
+        image = Image.new("RGB", (size, size), tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(rng.randrange(1, 6)):
+            x, y = rng.randrange(size), rng.randrange(size)
+            radius = rng.randrange(size // 20, size // 3)
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius),
+                         fill=tuple(rng.randrange(256) for _ in range(3)))
+        covers.append(image)
+    return covers
+
+
+def time_per_cover(function, covers):
+    start = time.perf_counter()
+    for cover in covers:
+        function(cover)
+    return (time.perf_counter() - start) * 1000 / len(covers)
+
+
+def main(count, size):
+    covers = generated_covers(count, size)
+    thumbnails = []
+    for cover in covers:
+        thumbnail = cover.copy()
+        thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        thumbnails.append(thumbnail)
+
+    legacy = time_per_cover(legacy_contrast_color, covers)
+    full = time_per_cover(analyze_colors, covers)
+    thumb = time_per_cover(analyze_colors, thumbnails)
+    agree = sum(legacy_contrast_color(c) == analyze_colors(t).contrast_color for c, t in zip(covers, thumbnails))
+
+    print(f"{count} covers of {size}x{size}")
+    print(f"legacy center crop:          {legacy:7.3f} ms/cover")
+    print(f"numpy on full cover:         {full:7.3f} ms/cover")
+    print(f"numpy on pipeline thumbnail: {thumb:7.3f} ms/cover")
+    print(f"same contrast color as legacy on {agree}/{count} covers")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--size", type=int, default=600)
+    args = parser.parse_args()
+    main(args.count, args.size)
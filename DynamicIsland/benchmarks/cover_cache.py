@@ -0,0 +1,63 @@
+"""Replay synthetic thumbnail bytes through the cover path with and without the cache.
+
+Run from the DynamicIsland directory: python benchmarks/cover_cache.py
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from PIL import Image
+from functions.cover_cache import CoverCache, cover_key
+from functions.image_pipeline import process_cover
+
+
+def synthetic_thumbnails(count, size=300, seed=1):
+    rng = random.Random(seed)
+    thumbnails = []
+    for _ in range(count):
+        image = Image.new("RGBA", (size, size), tuple(rng.randrange(256) for _ in range(4)))
+        image.paste(tuple(rng.randrange(256) for _ in range(3)), (size // 4, size // 4, size // 2, size // 2))
+        data = io.BytesIO()
+        image.save(data, format="PNG")
+        thumbnails.append(data.getvalue())
+    return thumbnails
+
+
+def replay_sequence(thumbnails, ticks_per_track):
+    """Every track stays on screen for ticks_per_track monitor ticks, then the playlist loops once"""
+    return [data for data in thumbnails * 2 for _ in range(ticks_per_track)]
+
+
+def main(tracks, ticks_per_track):
+    sequence = replay_sequence(synthetic_thumbnails(tracks), ticks_per_track)
+
+    start = time.perf_counter()
+    for data in sequence:
+        process_cover(data)
+    uncached = time.perf_counter() - start
+
+    cache = CoverCache(max_entries=tracks // 2)
+    start = time.perf_counter()
+    for data in sequence:
+        key = cover_key(data)
+        if cache.get(key) is None:
+            cache.put(process_cover(data, key))
+    cached = time.perf_counter() - start
+
+    print(f"ticks replayed:  {len(sequence)}")
+    print(f"uncached:        {uncached * 1000 / len(sequence):8.3f} ms/tick")
+    print(f"cached:          {cached * 1000 / len(sequence):8.3f} ms/tick")
+    print(f"cache stats:     {cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=20)
+    parser.add_argument("--ticks-per-track", type=int, default=50)
+    args = parser.parse_args()
+    main(args.tracks, args.ticks_per_track)
@@ -0,0 +1,46 @@
+"""Bytes pushed through the Flet channel per track change: base64 covers vs cover store paths.
+
+Counts the JSON encoded image properties that change_music_cover assigns, which is
+what ends up in the update message for the two image controls.
+
+Run from the DynamicIsland directory: python benchmarks/cover_payload.py
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.cover_store import CoverStore
+from functions.image_pipeline import process_cover
+from fakes import synthetic_covers
+
+
+def payload(props: dict) -> int:
+    return len(json.dumps(props).encode("utf-8"))
+
+
+def main(count, size):
+    covers = synthetic_covers(count, size)
+    with tempfile.TemporaryDirectory() as directory:
+        store = CoverStore(directory, max_bytes=4 * 1024 * 1024)
+        base64_bytes = path_bytes = 0
+        for data in covers:
+            cover = process_cover(data, store=store)
+            # Before: the display JPEG as base64 on both the cover and the blurred background
+            base64_bytes += payload({"src_base64": cover.base64}) * 2
+            path_bytes += payload({"src": cover.thumbnail_src}) + payload({"src": cover.src})
+        print(f"{count} track changes, {size}x{size} source covers")
+        print(f"base64 properties: {base64_bytes / count / 1024:9.1f} KiB per track change")
+        print(f"store paths:       {path_bytes / count:9.1f} B per track change")
+        print(f"store stats:       {store.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--size", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.count, args.size)
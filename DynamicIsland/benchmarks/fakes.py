@@ -0,0 +1,79 @@
+"""Stand-ins for Flet and media players shared by the benchmarks, nothing here needs Flet or WinRT."""
+import io
+import random
+import time
+
+from PIL import Image
+from functions.media_backend import PLAYING, PAUSED
+
+
+class FakePage:
+    """Counts page.update() messages and the controls they carry"""
+
+    def __init__(self):
+        self.messages = 0
+        self.controls = 0
+
+    def update(self, *controls):
+        self.messages += 1
+        self.controls += len(controls)
+
+
+class FakeControl:
+    """Control with arbitrary properties whose update() goes through its page"""
+
+    def __init__(self, page, **props):
+        self.page = page
+        self.__dict__.update(props)
+
+    def update(self):
+        self.page.update(self)
+
+
+class FakeContainer:
+    """Stands in for the island ft.Container; update() optionally burns time like a Flet round-trip"""
+
+    def __init__(self, update_cost=0.0):
+        self.width = None
+        self.height = None
+        self.update_cost = update_cost
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+        if self.update_cost:
+            time.sleep(self.update_cost)
+
+
+def cover_bytes(color, size=300):
+    """Flat single-color PNG cover"""
+    data = io.BytesIO()
+    Image.new("RGB", (size, size), color).save(data, format="PNG")
+    return data.getvalue()
+
+
+def synthetic_covers(count, size, seed=3):
+    """Noisy PNG covers, the worst case for decoding and color analysis"""
+    rng = random.Random(seed)
+    covers = []
+    for _ in range(count):
+        image = Image.effect_noise((size, size), rng.randrange(20, 120)).convert("RGB")
+        data = io.BytesIO()
+        image.save(data, format="PNG")
+        covers.append(data.getvalue())
+    return covers
+
+
+def scripted_timeline(tracks, gap):
+    """FakeMediaBackend steps: track changes, pauses, a second player and the first one closing"""
+    covers = [cover_bytes(((i * 47) % 256, (i * 91) % 256, (i * 13) % 256)) for i in range(tracks)]
+    steps = []
+    for i in range(tracks):
+        steps.append({"at": i * gap, "session": "player.a", "title": f"Track {i}", "artist": "Artist",
+                      "album": "Album", "status": PLAYING, "thumbnail": covers[i], "duration": 180.0})
+        if i % 3 == 2:
+            steps.append({"at": i * gap + gap / 2, "session": "player.a", "status": PAUSED})
+    steps.append({"at": tracks * gap / 2, "session": "player.b", "title": "Video", "artist": "Channel",
+                  "album": "", "status": PAUSED, "thumbnail": covers[0]})
+    steps.append({"at": tracks * gap, "session": "player.a", "closed": True})
+    return steps
@@ -0,0 +1,91 @@
+"""Hit-test region updates per animation clip, against a recording window.
+
+Plays every island clip through the real scheduler, once to the end and once preempted
+halfway like a mouse sweep, with the region following each frame. Reports per clip the
+frames rendered, the region updates the window received and the updates the precomputed
+frames predict, for the snapped region and for one snapped to every pixel.
+
+Also measures how badly the old fixed 300x40 rectangle fitted: frames where it cut the
+island off and the desktop area it blocked while the island was collapsed.
+
+Exits non-zero when a play issues more updates than its budget.
+
+Run from the DynamicIsland directory: python benchmarks/hit_region.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.AnimationScheduler import AnimationScheduler
+from functions.fake_island_window import RecordingIslandWindow
+from functions.hit_region import HitRegion, STEP
+
+CLIPS = (("open", "frames_open"), ("callback", "callback"), ("close", "callback_out"),
+         ("show_side", "show_side"), ("side_hovered", "side_hovered"), ("side_unhovered", "side_unhovered"))
+FIXED = (300, 40)
+
+
+async def run(step, fps):
+    manager = AnimationManager(scale_factor=70)
+    for name, prefix in CLIPS:
+        manager.defer_animation(name, prefix)
+    first = manager.get_frame_data("open", 1)
+    window = RecordingIslandWindow()
+    region = HitRegion(first['height'] / 2, window, step=step, fps=fps)
+    sizes = []
+
+    def apply_frame(width, height):
+        sizes.append((width, height))
+        region.update(width, height)
+
+    scheduler = AnimationScheduler(manager, apply_frame, fps=fps)
+    scheduler.set_size(first['width'], first['height'])
+    for preempt in (False, True):
+        for name, _ in CLIPS:
+            region.begin(name, manager)
+            future = scheduler.play(name, speed=0.01)
+            if preempt:
+                await asyncio.sleep(manager.frame_count(name) * 0.005)
+            else:
+                await future
+    scheduler.cancel()
+    return region, window, sizes, first
+
+
+def fixed_fit(sizes, first):
+    """Frames the fixed rectangle clipped, and its blocked area around the collapsed island"""
+    clipped = sum(1 for width, height in sizes if width > FIXED[0] or height > FIXED[1])
+    blocked = FIXED[0] * FIXED[1] - first['width'] * first['height']
+    return clipped, blocked
+
+
+def main(step, fps):
+    region, window, sizes, first = asyncio.run(run(step, fps))
+    per_pixel, _, _, _ = asyncio.run(run(1, fps))
+    print(f"{'clip':15} {'plays':>5} {'updates':>8} {'predicted':>9} {'per pixel':>9}")
+    for name, _ in CLIPS:
+        print(f"{name:15} {region.plays.get(name, 0):5d} {region.calls.get(name, 0):8d} "
+              f"{region.expected.get(name, 0):9d} {per_pixel.calls.get(name, 0):9d}")
+    stats = region.stats()
+    print(f"{stats['frames']} frames, {len(window.regions)} region updates at a {step} px step "
+          f"({per_pixel.updates} at 1 px), {stats['regions_cached']} regions cached, "
+          f"{stats['over_budget']} plays over budget")
+    clipped, blocked = fixed_fit(sizes, first)
+    island = region.region(first['width'], first['height'])
+    print(f"fixed {FIXED[0]}x{FIXED[1]} rect: cut off the island on {clipped}/{len(sizes)} frames, "
+          f"blocked {blocked:.0f} px2 of desktop around the collapsed island "
+          f"(snapped region adds {island.width * island.height - first['width'] * first['height']:.0f} px2)")
+    if stats['over_budget']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--step", type=int, default=STEP, help="region snap in pixels")
+    parser.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args()
+    main(args.step, args.fps)
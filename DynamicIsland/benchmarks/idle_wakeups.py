@@ -0,0 +1,35 @@
+"""Count monitor loop wakeups per minute while no media event happens.
+
+Run from the DynamicIsland directory: python benchmarks/idle_wakeups.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.media_events import MediaChangeWatcher, FakeEventSource
+
+
+async def count_wakeups(watcher, wait_interval, seconds):
+    await watcher.start()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        await watcher.wait(wait_interval)
+    await watcher.stop()
+    return watcher.wakeups * 60 / seconds
+
+
+async def main(seconds):
+    polling = await count_wakeups(MediaChangeWatcher(None), 0.05, seconds)
+    pushed = await count_wakeups(MediaChangeWatcher(FakeEventSource()), 2.0, seconds)
+    print(f"polling (interval=0.05):        {polling:8.1f} wakeups/min")
+    print(f"event-driven (fallback=2.0):    {pushed:8.1f} wakeups/min")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args().seconds))
@@ -0,0 +1,69 @@
+"""Measure how long cover processing blocks the asyncio loop, inline vs on the image pipeline.
+
+A heartbeat task ticks every 5 ms; the worst and total lag it observes is the time the
+loop could not run animations or click handlers.
+
+Run from the DynamicIsland directory: python benchmarks/image_pipeline.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.image_pipeline import ImagePipeline, process_cover
+from fakes import synthetic_covers
+
+HEARTBEAT = 0.005
+
+
+async def heartbeat(lags, stop):
+    loop = asyncio.get_running_loop()
+    expected = loop.time() + HEARTBEAT
+    while not stop.is_set():
+        await asyncio.sleep(HEARTBEAT)
+        now = loop.time()
+        lags.append(max(0.0, now - expected))
+        expected = now + HEARTBEAT
+
+
+async def measure(covers, worker):
+    lags, stop = [], asyncio.Event()
+    task = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT * 2)
+    start = time.perf_counter()
+    for data in covers:
+        await worker(data)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    return elapsed, max(lags), sum(lags)
+
+
+async def main(count, size):
+    covers = synthetic_covers(count, size)
+
+    async def inline(data):
+        process_cover(data)
+
+    pipeline = ImagePipeline()
+    results = {
+        "inline": await measure(covers, inline),
+        "pipeline": await measure(covers, pipeline.process),
+    }
+    pipeline.shutdown()
+
+    print(f"{count} covers of {size}x{size} PNG")
+    for name, (elapsed, worst, total) in results.items():
+        print(f"{name:9} total {elapsed * 1000:8.1f} ms | worst loop stall {worst * 1000:7.2f} ms"
+              f" | summed stall {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--size", type=int, default=1200)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.size))
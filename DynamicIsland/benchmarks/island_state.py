@@ -0,0 +1,160 @@
+"""Island state machine under hover storms, track bursts and random event mixes, no GUI.
+
+Drives IslandStateMachine with fake actions that sleep like the real clips, and compares
+it with the old toggled flags, where every hover event started its own animation:
+
+    hover_storm  the pointer jitters across the island edge, 2 ms between events
+    track_hover  hover events arriving while a track transition runs
+    track_burst  twenty tracks and a clear in quick succession
+    fuzz         random events at random gaps, pointer-only and mixed
+
+Checks that at most one action ran at a time, every posted future resolved, the machine
+ends in a stable mode and, for pointer-only runs, that the final mode follows the
+last pointer event. Exits non-zero when a check fails.
+
+Run from the DynamicIsland directory: python benchmarks/island_state.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.island_state import (
+    IslandStateMachine, COLLAPSED, HOVERED, MEDIA, TRANSITIONING,
+    HOVER_ENTER, HOVER_EXIT, CLICK, TRACK, CLEAR,
+)
+
+# Seconds per action, roughly the clip lengths at 0.01 s per Blender frame
+DURATIONS = {
+    "callback": 0.2,
+    "close": 0.14,
+    "side_hovered": 0.4,
+    "side_unhovered": 0.4,
+    "show_track": 0.52,
+    "reset": 0.32,
+}
+
+
+class FakeIsland:
+    """Actions that only sleep, recording how many ran and how many overlapped"""
+
+    def __init__(self, time_scale):
+        self.time_scale = time_scale
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    def actions(self) -> dict:
+        return {name: (lambda payload, name=name: self.run(name, payload)) for name in DURATIONS}
+
+    async def run(self, name, payload):
+        self.started.append((name, payload))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(DURATIONS[name] * self.time_scale)
+        finally:
+            self.running -= 1
+
+
+def toggled_flags(events) -> int:
+    """Animations the old __on_hover started for the same events, one per hover event"""
+    return sum(event in (HOVER_ENTER, HOVER_EXIT) for event, _ in events)
+
+
+async def play(events, time_scale, initial=COLLAPSED):
+    island = FakeIsland(time_scale)
+    machine = IslandStateMachine(island.actions(), initial=initial)
+    futures = []
+    for event, gap in events:
+        futures.append(machine.post(event, payload=len(futures)))
+        await asyncio.sleep(gap * time_scale)
+    await machine.settle()
+    await asyncio.sleep(0)
+    return machine, island, futures
+
+
+def check(name, machine, island, futures, expected=None):
+    failures = []
+    if island.max_running > 1:
+        failures.append(f"{island.max_running} actions overlapped")
+    if not all(future.done() for future in futures):
+        failures.append("unresolved futures")
+    if machine.mode == TRANSITIONING:
+        failures.append("ended mid-transition")
+    if expected is not None and machine.mode != expected:
+        failures.append(f"ended {machine.mode}, expected {expected}")
+    stats = machine.stats()
+    print(f"{name:22} posted {stats['posted']:4d}  actions {len(island.started):3d}  "
+          f"coalesced {stats['coalesced']:4d}  ignored {stats['ignored']:3d}  "
+          f"interrupted {stats['interrupted']:3d}  mode {machine.mode:14}"
+          + (f"  FAIL: {'; '.join(failures)}" if failures else ""))
+    return not failures
+
+
+async def hover_storm(time_scale, count):
+    events = [(HOVER_ENTER if i % 2 == 0 else HOVER_EXIT, 0.002) for i in range(count)]
+    machine, island, futures = await play(events, time_scale)
+    print(f"{'':22} old toggled flags would have started {toggled_flags(events)} animations")
+    return check("hover_storm", machine, island, futures, HOVERED if count % 2 else COLLAPSED)
+
+
+async def track_hover(time_scale):
+    events = [(TRACK, 0.05)] + [(HOVER_ENTER if i % 2 == 0 else HOVER_EXIT, 0.03) for i in range(7)]
+    machine, island, futures = await play(events, time_scale)
+    return check("track_hover", machine, island, futures)
+
+
+async def track_burst(time_scale):
+    events = [(TRACK, 0.025) for _ in range(20)] + [(CLEAR, 0.01), (TRACK, 0.0)]
+    machine, island, futures = await play(events, time_scale)
+    last = island.started[-1] if island.started else (None, None)
+    ok = check("track_burst", machine, island, futures, MEDIA)
+    if last != ("show_track", len(events) - 1):
+        print(f"{'':22} FAIL: last action {last}, expected the final track")
+        ok = False
+    return ok
+
+
+async def fuzz(time_scale, runs, seed, pointer_only):
+    rng = random.Random(seed)
+    kinds = [HOVER_ENTER, HOVER_EXIT, CLICK] if pointer_only else [HOVER_ENTER, HOVER_EXIT, CLICK, TRACK, CLEAR]
+    ok = True
+    for run in range(runs):
+        events = [(rng.choice(kinds), rng.choice((0.0, 0.002, 0.05, 0.3))) for _ in range(rng.randrange(5, 40))]
+        machine, island, futures = await play(events, time_scale)
+        expected = None
+        if pointer_only:
+            expected = HOVERED if events[-1][0] == HOVER_ENTER else COLLAPSED
+        if run == runs - 1 or island.max_running > 1 or (expected and machine.mode != expected):
+            ok = check(f"fuzz {'pointer' if pointer_only else 'mixed'} #{run}", machine, island, futures, expected) and ok
+    return ok
+
+
+async def run(time_scale, storm, runs, seed):
+    results = [
+        await hover_storm(time_scale, storm),
+        await track_hover(time_scale),
+        await track_burst(time_scale),
+        await fuzz(time_scale, runs, seed, pointer_only=True),
+        await fuzz(time_scale, runs, seed + 1, pointer_only=False),
+    ]
+    return all(results)
+
+
+def main(time_scale, storm, runs, seed):
+    if not asyncio.run(run(time_scale, storm, runs, seed)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-scale", type=float, default=0.25, help="multiplier on action durations and gaps")
+    parser.add_argument("--storm", type=int, default=201)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.time_scale, args.storm, args.runs, args.seed)
@@ -0,0 +1,64 @@
+"""Per-tick cost of MediaPlayerController.monitor_track_changes on the in-memory fake backend.
+
+Replays a scripted session timeline (track changes, pauses, a second player, the
+player closing) and reports wakeups, CPU per wakeup, dispatched callbacks and how
+often the session registry rescanned the session list or read a playback status.
+
+Run from the DynamicIsland directory: python benchmarks/monitor_loop.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend
+from functions.media_checker import MediaPlayerController
+from functions.media_events import FakeEventSource
+from fakes import scripted_timeline
+
+
+async def run(mode, tracks, gap, interval):
+    backend = FakeMediaBackend()
+    source = backend.events() if mode == "events" else FakeEventSource(available=False)
+    controller = MediaPlayerController(backend=backend, event_source=source)
+    counts = {"track": 0, "playback": 0, "nothing": 0}
+
+    async def on_track(track, cover):
+        counts["track"] += 1
+
+    async def on_playback(is_playing):
+        counts["playback"] += 1
+
+    async def on_nothing():
+        counts["nothing"] += 1
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(
+        change_callback=on_track, playback_state_callback=on_playback,
+        on_nothing=on_nothing, interval=interval))
+    cpu, wall = time.process_time(), time.perf_counter()
+    await backend.replay(scripted_timeline(tracks, gap))
+    await asyncio.sleep(interval * 4)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    wakeups = controller.watcher.wakeups
+    print(f"{mode:6} {wall:6.2f} s | {wakeups:5d} wakeups | {cpu * 1000 / max(wakeups, 1):7.3f} ms CPU/wakeup"
+          f" | backend calls {backend.calls:5d} | callbacks {counts}")
+    print(f"{'':6} session registry {controller.sessions.stats()}")
+
+
+def main(tracks, gap, interval):
+    for mode in ("poll", "events"):
+        asyncio.run(run(mode, tracks, gap, interval))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=10)
+    parser.add_argument("--gap", type=float, default=0.3)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.tracks, args.gap, args.interval)
@@ -0,0 +1,125 @@
+"""Cost of per-session updates and session switches with many concurrent media sessions.
+
+Opens a dozen fake sessions (a browser with many tabs), then changes the track of one
+background session at a time and measures backend calls per change, and switches the
+island between sessions measuring the time and backend calls until the controller has
+the new one, and until a fake island driven by the real state table shows it. A switch
+is swapped in place, a new track of the same player would wait for the debounce and a
+full transition (SHOW_TIME). Exits non-zero when the island takes longer than the bound.
+
+Run from the DynamicIsland directory: python benchmarks/multi_session.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend, FakeSession
+from functions.island_state import IslandStateMachine, TRACK, SWITCH
+from functions.media_backend import PLAYING, PAUSED
+from functions.media_checker import MediaPlayerController
+from fakes import cover_bytes
+
+# Collapse sleeps, show_side and reveal of DynamicIslandClass.__show_track
+SHOW_TIME = 0.02 + 0.3 + 0.4 + 0.2
+DEBOUNCE = 0.15
+BOUND = 0.1
+
+
+class FakeIsland:
+    """Island actions that sleep like the real ones and record which session is on screen"""
+
+    def __init__(self):
+        self.shown = None
+        self.full_transitions = 0
+
+    def actions(self) -> dict:
+        return {"show_track": self.show_track, "swap_track": self.swap_track}
+
+    async def show_track(self, session_id):
+        self.full_transitions += 1
+        await asyncio.sleep(SHOW_TIME)
+        self.shown = session_id
+
+    async def swap_track(self, session_id):
+        self.shown = session_id
+
+
+async def wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate() and loop.time() < deadline:
+        await asyncio.sleep(0.001)
+
+
+async def run(sessions, changes):
+    backend = FakeMediaBackend([
+        FakeSession(f"tab.{i}", title=f"Video {i}", artist="Channel", album="",
+                    status=PLAYING if i == 0 else PAUSED, thumbnail=cover_bytes((i * 20, 80, 160)))
+        for i in range(sessions)
+    ])
+    controller = MediaPlayerController(backend=backend)
+    island = FakeIsland()
+    machine = IslandStateMachine(island.actions())
+    listed = []
+
+    async def on_sessions(states, active_id):
+        listed.append(len(states))
+
+    async def on_track(info, cover):
+        machine.post(SWITCH if info['switched'] else TRACK, info['session_id'])
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(
+        change_callback=on_track, sessions_callback=on_sessions))
+    await wait_for(lambda: len(controller.store) == sessions and island.shown is not None)
+
+    start_calls = backend.calls
+    for i in range(changes):
+        session_id = f"tab.{1 + i % (sessions - 1)}"
+        title = f"Video {session_id} #{i}"
+        backend.update(session_id, title=title)
+        await wait_for(lambda: controller.store.get(session_id).title == title)
+    update_calls = (backend.calls - start_calls) / changes
+
+    switch_times = []
+    island_times = []
+    start_calls = backend.calls
+    start_transitions = island.full_transitions
+    for i in range(changes):
+        session_id = f"tab.{i % sessions}"
+        start = time.perf_counter()
+        controller.select_session(session_id)
+        await wait_for(lambda: controller.changes.state and controller.changes.state.session_id == session_id)
+        switch_times.append((time.perf_counter() - start) * 1000)
+        await wait_for(lambda: island.shown == session_id)
+        island_times.append((time.perf_counter() - start) * 1000)
+    switch_calls = (backend.calls - start_calls) / changes
+    full_transitions = island.full_transitions - start_transitions
+
+    monitor.cancel()
+    machine.stop()
+    controller.image_pipeline.shutdown()
+    print(f"{sessions} sessions | {update_calls:5.1f} backend calls per background track change"
+          f" | switch {sum(switch_times) / len(switch_times):6.1f} ms avg, {max(switch_times):6.1f} ms max,"
+          f" {switch_calls:5.1f} backend calls | switcher updates {len(listed)}")
+    print(f"island shows the switch {sum(island_times) / len(island_times):6.1f} ms avg, "
+          f"{max(island_times):6.1f} ms max, {full_transitions} full transitions "
+          f"| debounce and full transition: {(DEBOUNCE + SHOW_TIME) * 1000:.0f} ms")
+    return max(island_times) <= BOUND * 1000 and full_transitions == 0
+
+
+def main(sessions, changes):
+    if not asyncio.run(run(sessions, changes)):
+        print(f"FAIL: island switch over the {BOUND * 1000:.0f} ms bound or not swapped in place")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--changes", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sessions, args.changes)
@@ -0,0 +1,217 @@
+"""Notification bursts through the notification center and island state machine, no GUI.
+
+Fake island actions sleep like the real clips and count the frames they would render,
+a fake card sends its text changes through UpdateCoalescer to a counting page:
+
+    burst     100 notifications from five apps inside one second on the collapsed island
+    media     a burst over the media controls with a new track arriving meanwhile
+    priority  a full queue of low priority notifications and one high priority one
+    trickle   one notification every 4 s, each shown on its own
+
+Reports UI messages (clip frames plus card updates) and clips started, next to showing
+every notification on its own. Checks that a burst opens and closes the island once,
+that every notification is counted and that the island ends where it started.
+Exits non-zero when a check fails.
+
+Run from the DynamicIsland directory: python benchmarks/notification_burst.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.island_state import IslandStateMachine, COLLAPSED, MEDIA, TRACK
+from functions.notification_center import NotificationCenter
+from functions.notification_queue import NotificationQueue
+from functions.notification_sources import FakeNotificationSource, LOW, NORMAL, HIGH
+from functions.update_coalescer import UpdateCoalescer
+from fakes import FakePage, FakeControl
+
+FPS = 60
+# Seconds per clip at 0.01 s per Blender frame
+CLIPS = {"card_open": 0.46, "card_close": 0.36, "show_side": 0.4}
+APPS = ("mail", "chat", "calendar", "build", "news")
+
+
+class FakeIsland:
+    """Island actions that sleep like the clips, counting frames and card messages"""
+
+    def __init__(self, time_scale):
+        self.time_scale = time_scale
+        self.page = FakePage()
+        self.updates = UpdateCoalescer(self.page)
+        self.card = {name: FakeControl(self.page, value="") for name in ("app", "title", "body")}
+        self.clips = []
+        self.frames = 0
+        self.shown = []
+        self.tracks = []
+
+    def actions(self) -> dict:
+        return {
+            "show_notification": self.show_notification,
+            "update_notification": self.update_notification,
+            "hide_notification": lambda payload: self.clip("card_close"),
+            "restore_media": self.restore_media,
+            "hold_track": lambda cover: self.tracks.append(cover) or asyncio.sleep(0),
+            "drop_track": lambda payload: asyncio.sleep(0),
+        }
+
+    async def clip(self, name):
+        self.clips.append(name)
+        self.frames += round(CLIPS[name] * FPS)
+        await asyncio.sleep(CLIPS[name] * self.time_scale)
+
+    def show_card(self, batch):
+        """Same assignments as NotificationCard.show"""
+        self.shown.append(batch)
+        top = batch.top
+        with self.updates.batch():
+            if batch.count == 1:
+                self.updates.set(self.card["app"], value=top.app_id)
+                self.updates.set(self.card["body"], value=top.body)
+            else:
+                self.updates.set(self.card["app"], value=", ".join(sorted(batch.apps)))
+                self.updates.set(self.card["body"], value=top.title)
+            self.updates.set(self.card["title"], value=batch.title)
+
+    async def show_notification(self, batch):
+        self.show_card(batch)
+        await self.clip("card_open")
+
+    async def update_notification(self, batch):
+        self.show_card(batch)
+
+    async def restore_media(self, payload):
+        await self.clip("card_close")
+        await self.clip("show_side")
+
+    @property
+    def messages(self):
+        return self.frames + self.updates.messages_sent
+
+
+def one_by_one(count):
+    """Clips and UI messages when every notification opens and closes the island by itself"""
+    frames = count * round((CLIPS["card_open"] + CLIPS["card_close"]) * FPS)
+    return 2 * count, frames + count
+
+
+async def run_center(time_scale, initial, feed, capacity=32):
+    island = FakeIsland(time_scale)
+    machine = IslandStateMachine(island.actions(), initial=initial)
+    center = NotificationCenter(machine, NotificationQueue(capacity=capacity),
+                                coalesce_window=0.25 * time_scale, display_time=2.0 * time_scale,
+                                refresh_interval=0.5 * time_scale, max_display=6.0 * time_scale)
+    source = FakeNotificationSource()
+    await center.attach(source)
+    await feed(source, machine)
+    while center._task is not None and not center._task.done():
+        await asyncio.sleep(0.01)
+    await machine.settle()
+    return island, machine, center
+
+
+def report(name, island, machine, center, received, failures):
+    stats = center.stats()
+    clips, messages = one_by_one(received)
+    print(f"{name:9} {received:4d} received  clips {len(island.clips):3d}  UI messages {island.messages:5d} "
+          f"(card {island.updates.messages_sent:3d})  refreshes {stats['refreshes']:3d}  limited {stats['limited']:3d}  "
+          f"dropped {stats['dropped']:3d}  mode {machine.mode}"
+          + (f"  FAIL: {'; '.join(failures)}" if failures else ""))
+    print(f"{'':9} one by one: {clips} clips, {messages} UI messages")
+    return not failures
+
+
+async def burst(time_scale, count, seed):
+    rng = random.Random(seed)
+
+    async def feed(source, machine):
+        for i in range(count):
+            source.emit(rng.choice(APPS), f"Message {i}", "body", rng.choice((LOW, NORMAL, NORMAL, HIGH)))
+            await asyncio.sleep(1.0 * time_scale / count)
+
+    island, machine, center = await run_center(time_scale, COLLAPSED, feed)
+    failures = []
+    if island.clips != ["card_open", "card_close"]:
+        failures.append(f"clips {island.clips}")
+    if not island.shown or island.shown[-1].count != count:
+        failures.append(f"last card counts {island.shown[-1].count if island.shown else 0} of {count}")
+    if machine.mode != COLLAPSED:
+        failures.append(f"ended {machine.mode}")
+    return report("burst", island, machine, center, count, failures)
+
+
+async def media(time_scale, count):
+    async def feed(source, machine):
+        for i in range(count):
+            source.emit(APPS[i % 2], f"Message {i}")
+            await asyncio.sleep(0.5 * time_scale / count)
+        # The card is up by now, the track waits under it
+        await asyncio.sleep(1.0 * time_scale)
+        machine.post(TRACK, "new cover")
+
+    island, machine, center = await run_center(time_scale, MEDIA, feed)
+    failures = []
+    if island.clips != ["card_open", "card_close", "show_side"]:
+        failures.append(f"clips {island.clips}")
+    if island.tracks != ["new cover"]:
+        failures.append(f"held tracks {island.tracks}")
+    if machine.mode != MEDIA:
+        failures.append(f"ended {machine.mode}")
+    return report("media", island, machine, center, count, failures)
+
+
+async def priority(time_scale, count):
+    async def feed(source, machine):
+        for i in range(count):
+            source.emit(f"spam{i}", f"Low {i}", priority=LOW)
+        source.emit("pager", "Server down", priority=HIGH)
+
+    island, machine, center = await run_center(time_scale, COLLAPSED, feed, capacity=8)
+    failures = []
+    top = island.shown[0].top if island.shown else None
+    if top is None or top.app_id != "pager":
+        failures.append(f"top {top}")
+    if not island.shown or island.shown[0].count != count + 1:
+        failures.append("lost count")
+    return report("priority", island, machine, center, count + 1, failures)
+
+
+async def trickle(time_scale, count):
+    async def feed(source, machine):
+        for i in range(count):
+            source.emit("mail", f"Message {i}")
+            await asyncio.sleep(4.0 * time_scale)
+
+    island, machine, center = await run_center(time_scale, COLLAPSED, feed)
+    failures = []
+    if len(island.shown) != count or any(batch.count != 1 for batch in island.shown):
+        failures.append(f"cards {[batch.count for batch in island.shown]}")
+    return report("trickle", island, machine, center, count, failures)
+
+
+async def run(time_scale, count, seed):
+    results = [
+        await burst(time_scale, count, seed),
+        await media(time_scale, 20),
+        await priority(time_scale, 50),
+        await trickle(time_scale, 3),
+    ]
+    return all(results)
+
+
+def main(time_scale, count, seed):
+    if not asyncio.run(run(time_scale, count, seed)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-scale", type=float, default=0.25, help="multiplier on clip lengths, gaps and timers")
+    parser.add_argument("--count", type=int, default=100, help="notifications in the burst")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    main(args.time_scale, args.count, args.seed)
@@ -0,0 +1,184 @@
+"""Drift correction of the extrapolated playback timeline, on a fake clock.
+
+Simulates a player against a PlaybackTimeline whose clock is fully scripted, then checks
+how far the predicted position strays from the player and how often the model resyncs:
+
+    steady      reports with up to 0.3 s of jitter, none of them should cause a resync
+    drift       the player runs 2% fast, the model resyncs once the error passes the threshold
+    seek        a timeline event moves the position at once
+    pause       the prediction stops while paused and resumes from the same spot
+    stale       reports measured up to 3 s earlier (WinRT last_updated_time) are aged correctly
+    redraws     thumb moves per minute at the capped redraw rate vs polling the backend
+
+Exits non-zero when a check fails.
+
+Run from the DynamicIsland directory: python benchmarks/playback_timeline.py
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.playback_timeline import PlaybackTimeline
+
+DURATION = 240.0
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakePlayer:
+    """Ground truth position on the fake clock"""
+
+    def __init__(self, clock, rate=1.0):
+        self.clock = clock
+        self.rate = rate
+        self.position = 0.0
+        self.playing = True
+        self.updated = clock()
+
+    def true_position(self, now=None):
+        now = self.clock() if now is None else now
+        position = self.position + ((now - self.updated) * self.rate if self.playing else 0.0)
+        return min(position, DURATION)
+
+    def set(self, position=None, playing=None):
+        self.position = self.true_position() if position is None else position
+        self.updated = self.clock()
+        if playing is not None:
+            self.playing = playing
+
+
+def report(timeline, player, session="player", jitter=0.0, age=0.0, rng=None, event=False, rate=1.0):
+    measured_at = player.clock() - age
+    position = player.true_position(measured_at) + (rng.uniform(-jitter, jitter) if jitter else 0.0)
+    return timeline.observe(position, DURATION, player.playing, rate, measured_at, session, event=event)
+
+
+def check(name, ok, detail):
+    print(f"{name:8} {'ok  ' if ok else 'FAIL'} {detail}")
+    return ok
+
+
+def steady(threshold, seed):
+    clock, rng = FakeClock(), random.Random(seed)
+    timeline, player = PlaybackTimeline(threshold, clock), FakePlayer(clock)
+    report(timeline, player, event=True)
+    error = 0.0
+    for _ in range(120):
+        clock.advance(1.0)
+        report(timeline, player, jitter=0.3, rng=rng)
+        error = max(error, abs(timeline.position() - player.true_position()))
+    return check("steady", timeline.resyncs == 1 and error <= 0.3 + 1e-9,
+                 f"resyncs {timeline.resyncs}, max error {error:.3f} s, max drift seen {timeline.max_drift:.3f} s")
+
+
+def drift(threshold):
+    clock = FakeClock()
+    timeline, player = PlaybackTimeline(threshold, clock), FakePlayer(clock, rate=1.02)
+    report(timeline, player, event=True)
+    error = 0.0
+    for _ in range(200):
+        clock.advance(1.0)
+        report(timeline, player)
+        error = max(error, abs(timeline.position() - player.true_position()))
+    # 0.02 s of error a second, one correction each time it passes the threshold
+    expected = int(200 * 0.02 // (threshold + 0.02))
+    return check("drift", error <= threshold + 0.02 and timeline.drift_corrections >= expected,
+                 f"corrections {timeline.drift_corrections}, max error {error:.3f} s (threshold {threshold} s)")
+
+
+def seek(threshold):
+    clock = FakeClock()
+    timeline, player = PlaybackTimeline(threshold, clock), FakePlayer(clock)
+    report(timeline, player, event=True)
+    clock.advance(10.0)
+    player.set(position=120.0)
+    report(timeline, player, event=True)
+    clock.advance(0.5)
+    error = abs(timeline.position() - player.true_position())
+    timeline.seek(30.0)
+    local = timeline.position()
+    return check("seek", error < 1e-6 and abs(local - 30.0) < 1e-6,
+                 f"error after event {error:.3f} s, local seek lands at {local:.1f} s")
+
+
+def pause(threshold):
+    clock = FakeClock()
+    timeline, player = PlaybackTimeline(threshold, clock), FakePlayer(clock)
+    report(timeline, player, event=True)
+    clock.advance(20.0)
+    player.set(playing=False)
+    report(timeline, player)
+    frozen = timeline.position()
+    clock.advance(60.0)
+    still = timeline.position()
+    player.set(playing=True)
+    report(timeline, player)
+    clock.advance(5.0)
+    error = abs(timeline.position() - player.true_position())
+    return check("pause", frozen == still and abs(frozen - 20.0) < 1e-6 and error < 1e-6,
+                 f"paused at {frozen:.1f} s, after 60 s {still:.1f} s, error after resume {error:.3f} s")
+
+
+def stale(threshold, seed):
+    clock, rng = FakeClock(), random.Random(seed)
+    timeline, player = PlaybackTimeline(threshold, clock), FakePlayer(clock)
+    report(timeline, player, event=True)
+    error = 0.0
+    for _ in range(60):
+        clock.advance(2.0)
+        report(timeline, player, age=rng.uniform(0.0, 3.0))
+        error = max(error, abs(timeline.position() - player.true_position()))
+    return check("stale", timeline.resyncs == 1 and error < 1e-6,
+                 f"resyncs {timeline.resyncs}, max error {error:.3f} s with reports up to 3 s old")
+
+
+def redraws(max_fps, width):
+    """Thumb moves a minute: one per pixel of progress, capped by max_fps; polling reads every frame"""
+    clock = FakeClock()
+    timeline, player = PlaybackTimeline(1.0, clock), FakePlayer(clock)
+    report(timeline, player, event=True)
+    shown, moves, ticks = 0.0, 0, 0
+    while clock() - 1000.0 < 60.0:
+        clock.advance(1 / max_fps)
+        ticks += 1
+        value = timeline.fraction()
+        if abs(value - shown) * width >= 1:
+            shown, moves = value, moves + 1
+    print(f"redraws  {moves} thumb moves/min at {max_fps} fps cap on a {width} px bar, "
+          f"{ticks} ticks without a backend read (polling at 60 fps: {60 * 60} timeline reads/min)")
+    return True
+
+
+def main(threshold, seed, max_fps, width):
+    results = [
+        steady(threshold, seed),
+        drift(threshold),
+        seek(threshold),
+        pause(threshold),
+        stale(threshold, seed),
+        redraws(max_fps, width),
+    ]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=1.0, help="drift threshold in seconds")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--max-fps", type=int, default=10)
+    parser.add_argument("--width", type=int, default=240)
+    args = parser.parse_args()
+    main(args.threshold, args.seed, args.max_fps, args.width)
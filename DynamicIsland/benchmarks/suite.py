@@ -0,0 +1,269 @@
+"""Headless benchmark suite for the island hot paths, with JSON results and a baseline check.
+
+Runs on any platform without Flet or WinRT, on the fakes in benchmarks/fakes.py and the
+in-memory media backend, and measures:
+
+    startup      AnimationManager with all clips loaded, and a full bundle rebuild
+    monitor      CPU per wakeup of monitor_track_changes, polling and event-driven
+    track_change latency from a player changing track to the island transition starting
+    animation    frame rate, jitter and dropped frames of the animation scheduler
+    cover        cover decode + resize + encode, and the color analysis alone
+
+Results are written as JSON. With --baseline every metric is compared against a
+stored run and the suite exits non-zero when one regresses past --tolerance.
+
+Run from the DynamicIsland directory:
+    python benchmarks/suite.py --output results.json --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from PIL import Image
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.AnimationScheduler import AnimationScheduler
+from animation_functions.animation_bundle import build_bundle_bytes, load_bundle
+from functions.color_analysis import analyze_colors
+from functions.fake_media_backend import FakeMediaBackend
+from functions.image_pipeline import THUMBNAIL_SIZE, process_cover
+from functions.media_backend import PLAYING
+from functions.media_checker import MediaPlayerController
+from functions.media_events import FakeEventSource
+from functions.track_transitions import TrackTransitionPipeline
+from fakes import FakeContainer, cover_bytes, scripted_timeline, synthetic_covers
+
+CLIPS = {
+    "open": "frames_open",
+    "callback": "callback",
+    "close": "callback_out",
+    "show_side": "show_side",
+    "side_hovered": "side_hovered",
+    "side_unhovered": "side_unhovered",
+}
+
+# Metrics where a larger value is better, every other metric is a cost
+HIGHER_IS_BETTER = {"animation.fps"}
+# Absolute change a metric must also exceed to count as a regression, timer-driven ones are noisy
+NOISE_FLOOR = {
+    "animation.jitter_ms": 2.0,
+    "animation.frames_dropped": 3,
+    "track_change.latency_p50_ms": 20.0,
+    "track_change.latency_max_ms": 50.0,
+    "track_change.overhead_p50_ms": 20.0,
+}
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def bench_startup(quick):
+    repeat = 5 if quick else 30
+    load_bundle()
+
+    def start_manager():
+        manager = AnimationManager(scale_factor=70)
+        for name, prefix in CLIPS.items():
+            manager.load_animation(name, prefix)
+        manager.get_frame_data("open", 1)
+
+    return {
+        'startup.animation_manager_ms': median_ms(start_manager, repeat),
+        'startup.bundle_rebuild_ms': median_ms(build_bundle_bytes, max(1, repeat // 5)),
+    }
+
+
+async def _monitor(mode, tracks, gap):
+    backend = FakeMediaBackend()
+    source = backend.events() if mode == "events" else FakeEventSource(available=False)
+    controller = MediaPlayerController(backend=backend, event_source=source)
+
+    async def on_track(track, cover):
+        pass
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(change_callback=on_track, interval=0.05))
+    cpu = time.process_time()
+    await backend.replay(scripted_timeline(tracks, gap))
+    await asyncio.sleep(0.2)
+    cpu = time.process_time() - cpu
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    return cpu * 1000 / max(controller.watcher.wakeups, 1)
+
+
+def bench_monitor(quick):
+    tracks, gap = (4, 0.15) if quick else (10, 0.3)
+    return {
+        'monitor.poll_cpu_per_wakeup_ms': asyncio.run(_monitor("poll", tracks, gap)),
+        'monitor.events_cpu_per_wakeup_ms': asyncio.run(_monitor("events", tracks, gap)),
+    }
+
+
+async def _track_change(changes):
+    backend = FakeMediaBackend()
+    backend.update("player", title="Start", artist="Artist", album="Album", status=PLAYING,
+                   thumbnail=cover_bytes((10, 20, 30)))
+    controller = MediaPlayerController(backend=backend)
+    loop = asyncio.get_running_loop()
+    shown = {}
+
+    async def transition(title):
+        shown[title] = loop.time()
+
+    pipeline = TrackTransitionPipeline(transition)
+
+    async def on_track(track, cover):
+        pipeline.submit(track['title'])
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(change_callback=on_track))
+    await asyncio.sleep(0.3)
+    latencies = []
+    for i in range(changes):
+        title = f"Track {i}"
+        changed_at = loop.time()
+        backend.update("player", title=title, thumbnail=cover_bytes((i * 30 % 256, 90, 150)))
+        while title not in shown and loop.time() - changed_at < 5:
+            await asyncio.sleep(0.002)
+        latencies.append((shown.get(title, loop.time()) - changed_at) * 1000)
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    return latencies, pipeline.debounce * 1000
+
+
+def bench_track_change(quick):
+    latencies, debounce_ms = asyncio.run(_track_change(5 if quick else 20))
+    latencies.sort()
+    return {
+        'track_change.latency_p50_ms': statistics.median(latencies),
+        'track_change.latency_max_ms': latencies[-1],
+        # What the monitor and cover processing add on top of the deliberate debounce window
+        'track_change.overhead_p50_ms': statistics.median(latencies) - debounce_ms,
+    }
+
+
+async def _animation(rounds):
+    manager = AnimationManager(scale_factor=70)
+    for name in ("callback", "close", "side_hovered", "side_unhovered"):
+        manager.load_animation(name, CLIPS[name])
+    container = FakeContainer(update_cost=0.002)
+
+    def apply_frame(width, height):
+        container.width, container.height = width, height
+        container.update()
+
+    scheduler = AnimationScheduler(manager, apply_frame, fps=60)
+    for _ in range(rounds):
+        for name in ("callback", "close", "side_hovered", "side_unhovered"):
+            await scheduler.play(name, speed=0.01)
+    return scheduler.stats()
+
+
+def bench_animation(quick):
+    stats = asyncio.run(_animation(1 if quick else 3))
+    return {
+        'animation.fps': stats['fps'],
+        'animation.jitter_ms': stats['jitter_ms'],
+        'animation.frames_dropped': stats['frames_dropped'],
+    }
+
+
+def bench_cover(quick):
+    covers = synthetic_covers(3 if quick else 10, 600)
+    thumbnails = [Image.open(io.BytesIO(data)).convert("RGB").resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE)) for data in covers]
+    return {
+        'cover.process_ms': statistics.median(median_ms(lambda: process_cover(data), 3) for data in covers),
+        'cover.color_analysis_ms': statistics.median(median_ms(lambda: analyze_colors(image), 5) for image in thumbnails),
+    }
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'monitor': bench_monitor,
+    'track_change': bench_track_change,
+    'animation': bench_animation,
+    'cover': bench_cover,
+}
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every metric against the baseline, and the names of the regressed ones"""
+    lines, regressions = [], []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:40} {value:10.3f}  (no baseline)")
+            continue
+        if name in HIGHER_IS_BETTER:
+            regressed = value < base * (1 - tolerance)
+        else:
+            regressed = value > base * (1 + tolerance) and value - base > NOISE_FLOOR.get(name, 0.05)
+        change = (value - base) / base * 100 if base else 0.0
+        lines.append(f"{name:40} {value:10.3f}  baseline {base:10.3f}  {change:+7.1f}%" + ("  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(name)
+    return lines, regressions
+
+
+def main(selected, output, baseline_path, save_baseline, tolerance, quick):
+    results = {}
+    for name in selected:
+        start = time.perf_counter()
+        results.update(BENCHMARKS[name](quick))
+        print(f"{name:14} done in {time.perf_counter() - start:6.2f} s", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'metrics': results,
+    }
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+    if save_baseline:
+        with open(save_baseline, "w") as file:
+            json.dump(report, file, indent=2)
+
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path, "r") as file:
+            stored = json.load(file)
+        if stored.get('quick') != quick:
+            sys.exit(f"{baseline_path} was recorded {'with' if stored.get('quick') else 'without'} --quick, "
+                     f"run the suite the same way to compare")
+        baseline = stored['metrics']
+    lines, regressions = compare(results, baseline, tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", help=f"subset to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a results file saved earlier")
+    parser.add_argument("--save-baseline", help="also write the results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions, for a smoke run")
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    main(args.benchmarks or list(BENCHMARKS), args.output, args.baseline, args.save_baseline, args.tolerance, args.quick)
@@ -0,0 +1,94 @@
+"""Cost of the instrumentation spans with tracing off and on, plus a sample trace.
+
+Times an empty loop, the same loop through tracer.span() while disabled and while
+enabled, and through the enabled check the per-frame paths use instead of a span.
+Then replays the monitor loop timeline on the fake backend with tracing on, prints
+the latency histograms and writes a Chrome trace to the temp directory (open it in
+chrome://tracing or ui.perfetto.dev).
+
+Run from the DynamicIsland directory: python benchmarks/trace_overhead.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend
+from functions.instrumentation import Tracer, tracer
+from functions.media_checker import MediaPlayerController
+from fakes import scripted_timeline
+
+
+def per_call_ns(iterations, body):
+    start = time.perf_counter_ns()
+    body(iterations)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def bare(iterations):
+    for _ in range(iterations):
+        pass
+
+
+def spans(probe):
+    def body(iterations):
+        for _ in range(iterations):
+            with probe.span("bench", "bench"):
+                pass
+    return body
+
+
+def guarded(probe):
+    def body(iterations):
+        for _ in range(iterations):
+            started = time.perf_counter_ns() if probe.enabled else 0
+            if started:
+                probe.complete("bench", "bench", started)
+    return body
+
+
+async def sample_trace(tracks, gap):
+    backend = FakeMediaBackend()
+    controller = MediaPlayerController(backend=backend)
+
+    async def on_track(track, cover):
+        pass
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(change_callback=on_track))
+    await backend.replay(scripted_timeline(tracks, gap))
+    await asyncio.sleep(0.2)
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+
+
+def main(iterations, trace_path, tracks, gap):
+    base = per_call_ns(iterations, bare)
+    disabled = per_call_ns(iterations, spans(Tracer(enabled=False)))
+    enabled = per_call_ns(iterations, spans(Tracer(enabled=True, capacity=10_000)))
+    check = per_call_ns(iterations, guarded(Tracer(enabled=False)))
+    print(f"empty loop     {base:7.1f} ns/iteration")
+    print(f"span disabled  {disabled - base:7.1f} ns/span")
+    print(f"span enabled   {enabled - base:7.1f} ns/span")
+    print(f"check disabled {check - base:7.1f} ns/call site")
+
+    tracer.enable()
+    asyncio.run(sample_trace(tracks, gap))
+    tracer.disable()
+    for name, summary in tracer.summary().items():
+        print(f"{name:28} n={summary['count']:5d} p50 {summary['p50_ms']:7.2f} ms  "
+              f"p95 {summary['p95_ms']:7.2f} ms  max {summary['max_ms']:7.2f} ms")
+    print(f"wrote {tracer.export_chrome_trace(trace_path)} ({len(tracer.events)} events)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--trace", default=os.path.join(tempfile.gettempdir(), "island_trace.json"))
+    parser.add_argument("--tracks", type=int, default=6)
+    parser.add_argument("--gap", type=float, default=0.2)
+    args = parser.parse_args()
+    main(args.iterations, args.trace, args.tracks, args.gap)
@@ -0,0 +1,109 @@
+"""Latency from the last of a burst of skips to the island showing that track.
+
+Fires 20 track changes within 500 ms on the fake backend while the monitor loop runs,
+and drives a fake island whose transition takes as long as the real change_track
+(0.32 s of collapse sleeps, then a 0.2 s reveal). "serial" awaits every full transition
+in the change callback like before, "pipeline" goes through TrackTransitionPipeline and
+skips the collapse sleeps when it replaces a track that is up or still coming up.
+Exits non-zero when the pipeline misses the latency bound, is not faster than serial or
+ends on a stale track.
+
+Run from the DynamicIsland directory: python benchmarks/track_skip_burst.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend
+from functions.media_backend import PLAYING
+from functions.media_checker import MediaPlayerController
+from functions.track_transitions import TrackTransitionPipeline
+
+RESET_TIME = 0.32
+REVEAL_TIME = 0.2
+
+
+class FakeIsland:
+    """Records which track is on screen and when its transition finished"""
+
+    def __init__(self, replace_in_place=False):
+        self.replace_in_place = replace_in_place
+        self.shown = None
+        self.on_island = None
+        self.settled_at = None
+        self.transitions = 0
+        self.interrupted = 0
+
+    async def transition(self, title):
+        self.transitions += 1
+        self.settled_at = None
+        replacing, self.on_island = self.on_island is not None, title
+        if not (self.replace_in_place and replacing):
+            await asyncio.sleep(RESET_TIME)
+        self.shown = title
+        await asyncio.sleep(REVEAL_TIME)
+        self.settled_at = asyncio.get_running_loop().time()
+
+    def cancel(self):
+        self.interrupted += 1
+
+
+async def run(mode, changes, burst, debounce, interval):
+    backend = FakeMediaBackend()
+    backend.update("player", title="Track start", artist="Artist", album="Album", status=PLAYING)
+    controller = MediaPlayerController(backend=backend)
+    island = FakeIsland(replace_in_place=mode == "pipeline")
+    pipeline = TrackTransitionPipeline(island.transition, debounce=debounce, on_cancel=island.cancel)
+
+    async def on_track(track, cover):
+        if mode == "serial":
+            await island.transition(track['title'])
+        else:
+            pipeline.submit(track['title'])
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(change_callback=on_track, interval=interval))
+    await asyncio.sleep(1.0)
+
+    loop = asyncio.get_running_loop()
+    for i in range(changes):
+        backend.update("player", title=f"Track {i}")
+        await asyncio.sleep(burst / changes)
+    last_change = loop.time()
+    final = f"Track {changes - 1}"
+
+    deadline = last_change + 10
+    while loop.time() < deadline and not (island.shown == final and island.settled_at):
+        await asyncio.sleep(0.01)
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+
+    latency = island.settled_at - last_change if island.settled_at else float("inf")
+    print(f"{mode:8} final {island.shown!r:12} latency {latency * 1000:7.1f} ms | "
+          f"transitions started {island.transitions:3d}, interrupted {island.interrupted:3d}"
+          + (f" | {pipeline.stats()}" if mode == "pipeline" else ""))
+    return island.shown == final, latency
+
+
+def main(changes, burst, debounce, interval):
+    _, serial = asyncio.run(run("serial", changes, burst, debounce, interval))
+    converged, latency = asyncio.run(run("pipeline", changes, burst, debounce, interval))
+    # One monitor tick to notice the change, the debounce window, then the reveal
+    bound = interval + debounce + REVEAL_TIME + 0.05
+    if not converged or latency > bound or latency >= serial:
+        print(f"FAIL: pipeline latency {latency * 1000:.1f} ms, bound {bound * 1000:.1f} ms, "
+              f"serial {serial * 1000:.1f} ms")
+        sys.exit(1)
+    print(f"ok: within {bound * 1000:.1f} ms bound, serial {serial * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--burst", type=float, default=0.5)
+    parser.add_argument("--debounce", type=float, default=0.15)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.changes, args.burst, args.debounce, args.interval)
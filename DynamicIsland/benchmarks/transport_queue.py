@@ -0,0 +1,176 @@
+"""Transport commands through the coalescing queue vs one task per click, on the fake backend.
+
+Every backend command takes a random 20-150 ms (--min-latency/--max-latency), so
+commands sent concurrently can finish out of order:
+
+    toggles  an odd number of fast play/pause clicks, the player must end paused
+    skips    five fast nexts, the player must land five tracks on
+    undo     next, next, previous, one skip is all the player should see
+    reject   the player ignores a pause, the button must go back to playing
+
+The direct path is the old click handler, a task per click calling the backend. The
+queue path goes through MediaPlayerController with its monitor loop confirming states.
+Reports backend calls, wrong end states over the seeds, and command latencies.
+Exits non-zero when the queue ends in a wrong state.
+
+Run from the DynamicIsland directory: python benchmarks/transport_queue.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from functions.fake_media_backend import FakeMediaBackend, FakeSession
+from functions.instrumentation import Histogram
+from functions.media_backend import PLAYING, PAUSED
+from functions.media_checker import MediaPlayerController
+
+PLAYLIST = [{'title': f"Track {i}", 'artist': "Artist", 'album': "Album", 'duration': 200.0} for i in range(20)]
+CLICK_GAP = 0.03
+
+
+class IgnoresPause(FakeMediaBackend):
+    """A player that accepts the pause command and keeps playing"""
+
+    async def pause(self, session):
+        await self._command(session, "pause")
+
+
+def make_backend(seed, min_latency, max_latency, backend_class=FakeMediaBackend):
+    rng = random.Random(seed)
+    backend = backend_class(latency=lambda name: rng.uniform(min_latency, max_latency))
+    backend.add_session(FakeSession("player", status=PLAYING, playlist=PLAYLIST, **PLAYLIST[0]))
+    return backend
+
+
+def toggles(count):
+    clicks = ["pause" if i % 2 == 0 else "play" for i in range(count)]
+    return clicks, (PAUSED if count % 2 else PLAYING), 0
+
+
+SCENARIOS = {
+    'toggles': lambda: toggles(5),
+    'skips': lambda: (["next"] * 5, PLAYING, 5),
+    'undo': lambda: (["next", "next", "previous"], PLAYING, 1),
+}
+
+
+async def direct(backend, clicks):
+    """The old handlers: every click starts its own backend call"""
+    session = backend.sessions["player"]
+    calls = {'play': backend.play, 'pause': backend.pause,
+             'next': backend.next_track, 'previous': backend.previous_track}
+    tasks = []
+    for click in clicks:
+        tasks.append(asyncio.ensure_future(calls[click](session)))
+        await asyncio.sleep(CLICK_GAP)
+    await asyncio.gather(*tasks)
+
+
+async def queued(controller, clicks, shown):
+    calls = {'play': controller.play, 'pause': controller.pause,
+             'next': controller.next_track, 'previous': controller.previous_track}
+    tasks = []
+    for click in clicks:
+        if click in ("play", "pause"):
+            # What SoundControl does before handing the click over
+            shown.append(click == "play")
+        tasks.append(asyncio.ensure_future(calls[click]()))
+        await asyncio.sleep(CLICK_GAP)
+    await asyncio.gather(*tasks)
+    await controller.transport.flush()
+
+
+async def with_controller(backend, run, settle=0.3):
+    controller = MediaPlayerController(backend=backend)
+    controller.transport.grace = 0.5
+    shown = []
+
+    async def on_playback(playing):
+        shown.append(playing)
+
+    monitor = asyncio.ensure_future(controller.monitor_track_changes(
+        playback_state_callback=on_playback, interval=0.02, fallback_interval=0.5))
+    await asyncio.sleep(0.1)
+    await run(controller, shown)
+    await asyncio.sleep(settle)
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    return controller, shown
+
+
+def merge(into, histograms):
+    """Add the latency histograms of one run, keyed by (kind, command)"""
+    for key, histogram in histograms.items():
+        total = into.setdefault(key, Histogram())
+        total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+        total.count += histogram.count
+        total.total += histogram.total
+        total.min = min(total.min, histogram.min)
+        total.max = max(total.max, histogram.max)
+
+
+async def scenario(name, seeds, min_latency, max_latency, latencies):
+    wrong_direct = wrong_queued = calls_direct = calls_queued = 0
+    for seed in range(seeds):
+        clicks, status, track = SCENARIOS[name]()
+        backend = make_backend(seed, min_latency, max_latency)
+        await direct(backend, clicks)
+        session = backend.sessions["player"]
+        calls_direct += len(backend.commands)
+        wrong_direct += (session.status, session.track_index) != (status, track)
+
+        backend = make_backend(seed, min_latency, max_latency)
+        controller, shown = await with_controller(backend, lambda c, s: queued(c, clicks, s))
+        session = backend.sessions["player"]
+        calls_queued += len(backend.commands)
+        wrong_queued += ((session.status, session.track_index) != (status, track)
+                         or bool(shown) and shown[-1] != (status == PLAYING))
+        transport = controller.transport
+        merge(latencies, {('sent', command): h for command, h in transport.sent_latency.items() if h.count})
+        merge(latencies, {('confirmed', command): h for command, h in transport.confirm_latency.items() if h.count})
+    print(f"{name:8} direct {calls_direct / seeds:4.1f} calls, wrong end state {wrong_direct}/{seeds}   "
+          f"queue {calls_queued / seeds:4.1f} calls, wrong end state {wrong_queued}/{seeds}")
+    return wrong_queued == 0
+
+
+async def reject(min_latency, max_latency):
+    backend = make_backend(0, min_latency, max_latency, IgnoresPause)
+
+    async def run(controller, shown):
+        shown.append(False)
+        await controller.pause()
+
+    controller, shown = await with_controller(backend, run, settle=0.8)
+    ok = shown[-1] is True and controller.transport.reverted == 1
+    print(f"reject   button states {['playing' if s else 'paused' for s in shown]}, "
+          f"reverted {controller.transport.reverted}")
+    return ok
+
+
+async def run(seeds, min_latency, max_latency):
+    latencies = {}
+    results = [await scenario(name, seeds, min_latency, max_latency, latencies) for name in SCENARIOS]
+    results.append(await reject(min_latency, max_latency))
+    for (kind, command), histogram in sorted(latencies.items()):
+        summary = histogram.summary()
+        print(f"{kind:9} {command:8} {summary['count']:3d} x  p50 {summary['p50_ms']:6.1f} ms  "
+              f"max {summary['max_ms']:6.1f} ms  (click to {kind})")
+    return all(results)
+
+
+def main(seeds, min_latency, max_latency):
+    if not asyncio.run(run(seeds, min_latency, max_latency)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--min-latency", type=float, default=0.02)
+    parser.add_argument("--max-latency", type=float, default=0.15)
+    args = parser.parse_args()
+    main(args.seeds, args.min_latency, args.max_latency)
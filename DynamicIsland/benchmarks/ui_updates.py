@@ -0,0 +1,67 @@
+"""Count Flet messages for a hover animation plus a track change, direct updates vs the coalescer.
+
+Run from the DynamicIsland directory: python benchmarks/ui_updates.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.AnimationScheduler import AnimationScheduler
+from functions.update_coalescer import UpdateCoalescer
+from fakes import FakePage, FakeControl
+
+
+class DirectUpdates:
+    """The pre-coalescer behaviour: every assignment is followed by control.update()"""
+
+    def set(self, control, **props):
+        control.__dict__.update(props)
+        control.update()
+        return True
+
+    def flush(self):
+        return 0
+
+
+async def island_session(updates, page):
+    container = FakeControl(page, width=0.0, height=0.0)
+    buttons = [FakeControl(page, color="white,0.8") for _ in range(3)]
+    cover, background = FakeControl(page, src_base64=None), FakeControl(page, src_base64=None)
+
+    manager = AnimationManager(scale_factor=70)
+    manager.load_animation("show_side", "show_side")
+    manager.load_animation("side_hovered", "side_hovered")
+    manager.load_animation("side_unhovered", "side_unhovered")
+
+    def apply_frame(width, height):
+        # The scheduler may hand over the same size several times at the end of a clip
+        updates.set(container, width=round(width), height=round(height))
+        updates.flush()
+
+    scheduler = AnimationScheduler(manager, apply_frame, fps=60)
+    for name in ("show_side", "side_hovered", "side_unhovered"):
+        await scheduler.play(name, speed=0.01)
+
+    for track in range(3):
+        # change_music_cover + change_color_buttons; the second track keeps the same colors
+        updates.set(cover, src_base64=f"cover-{track}")
+        updates.set(background, src_base64=f"cover-{track}")
+        for button in buttons:
+            updates.set(button, color="black" if track == 1 else "white,0.8")
+        updates.flush()
+
+
+def main():
+    for name, factory in (("direct", lambda page: DirectUpdates()),
+                          ("coalesced", lambda page: UpdateCoalescer(page))):
+        page = FakePage()
+        updates = factory(page)
+        asyncio.run(island_session(updates, page))
+        print(f"{name:10} {page.messages:5d} messages, {page.controls:5d} control payloads")
+
+
+if __name__ == "__main__":
+    main()
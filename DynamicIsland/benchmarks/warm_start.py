@@ -0,0 +1,114 @@
+"""Cold vs warm time to first content: from process start to a cover the island can paint.
+
+Each path runs in a fresh interpreter so imports count:
+
+    cold  import the media stack, start the monitor on the fake backend and wait for the
+          first change callback, which carries the processed cover (WinRT start-up on
+          Windows comes on top of this)
+    warm  read the snapshot the last run left and rebuild the cover from it
+
+Also reports the snapshot size, its write time and whether the warm path had to import
+NumPy or PIL.
+
+Run from the DynamicIsland directory: python benchmarks/warm_start.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from functions.image_pipeline import process_cover
+from functions.media_backend import PLAYING
+from functions.track_state import TrackState
+from functions.warm_snapshot import WarmSnapshot
+from fakes import synthetic_covers
+
+# asyncio is imported before the clock starts, Flet has loaded it before either path runs
+PRELUDE = f"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {SRC!r})
+"""
+
+EPILOGUE = """
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000, 'painted': painted,
+                  'numpy': 'numpy' in sys.modules, 'PIL': 'PIL' in sys.modules}))
+"""
+
+COLD = """
+import asyncio
+from functions.fake_media_backend import FakeMediaBackend
+from functions.media_backend import PLAYING
+from functions.media_checker import MediaPlayerController
+
+async def first_content():
+    backend = FakeMediaBackend()
+    backend.update("player", title="Track", artist="Artist", album="Album", status=PLAYING,
+                   thumbnail=open({cover_path!r}, "rb").read(), duration=200.0)
+    controller = MediaPlayerController(backend=backend)
+    shown = asyncio.get_running_loop().create_future()
+
+    async def on_track(track, cover):
+        if cover and not shown.done():
+            shown.set_result(cover)
+
+    monitor = asyncio.create_task(controller.monitor_track_changes(change_callback=on_track))
+    cover = await shown
+    monitor.cancel()
+    controller.image_pipeline.shutdown()
+    return cover
+
+painted = asyncio.run(first_content()).key is not None
+"""
+
+WARM = """
+from functions.warm_snapshot import WarmSnapshot
+snapshot = WarmSnapshot({snapshot_path!r}).load()
+painted = snapshot is not None and snapshot.cover is not None
+"""
+
+
+def run(code):
+    output = subprocess.run([sys.executable, "-c", PRELUDE + code + EPILOGUE],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(label, runs):
+    loaded = [module for module in ("numpy", "PIL") if runs[-1][module]]
+    painted = all(run['painted'] for run in runs)
+    print(f"{label:5} {statistics.median(run['ms'] for run in runs):8.1f} ms to first content"
+          f"  imports {', '.join(loaded) or 'neither NumPy nor PIL'}" + ("" if painted else "  (nothing to paint)"))
+    return statistics.median(run['ms'] for run in runs)
+
+
+def main(size, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        cover_path = os.path.join(directory, "cover.png")
+        data = synthetic_covers(1, size)[0]
+        with open(cover_path, "wb") as file:
+            file.write(data)
+        track = TrackState("player", "Track", "Artist", "Album", process_cover(data), PLAYING, 0.0, 200.0)
+        snapshot = WarmSnapshot(os.path.join(directory, "snapshot.bin"))
+        start = time.perf_counter()
+        written = snapshot.write(track, "media")
+        print(f"snapshot {written} B, written in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        cold = report("cold", [run(COLD.format(cover_path=cover_path)) for _ in range(repeat)])
+        warm = report("warm", [run(WARM.format(snapshot_path=snapshot.path)) for _ in range(repeat)])
+        print(f"warm start paints {cold / warm:.1f}x sooner")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=600, help="cover size in pixels")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.size, args.repeat)
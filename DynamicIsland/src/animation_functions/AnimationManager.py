@@ -1,40 +1,108 @@
-from convert_frames import convert_frames_to_dict
+from animation_functions.animation_bundle import load_bundle
+from functions.log import get_logger
+
+log = get_logger("animation")
+
 class AnimationManager:
     """Manages multiple animations for dynamic island"""
-    
-    def __init__(self, scale_factor=70):
+
+    def __init__(self, scale_factor=70, bundle=None, dpi_scale=1.0):
         self.animations = {}
+        self.deferred = {}
+        self.curves = {}
         self.scale_factor = scale_factor
+        self.dpi_scale = dpi_scale
         self.current_animation = None
-    
+        self.bundle = bundle
+
+    @property
+    def scale(self):
+        """Pixels per Blender unit on the current display"""
+        return self.scale_factor * self.dpi_scale
+
+    def _get_bundle(self):
+        """Open the compiled animation bundle on first use"""
+        if self.bundle is None:
+            self.bundle = load_bundle()
+        return self.bundle
+
     def load_animation(self, name, file_prefix):
-        """Load animation data from file and store it in animations dictionary"""
-        self.animations[name] = convert_frames_to_dict(file_prefix)
+        """Register a clip of the animation bundle under name"""
+        clip = self._get_bundle().clip(file_prefix)
+        if clip is None:
+            log.error("animation_missing", clip=file_prefix)
+            return None
+        self.animations[name] = (self.bundle.first_frame(file_prefix), clip)
+        self.deferred.pop(name, None)
+        self.curves.pop(name, None)
         return self.animations[name]
-    
+
+    def defer_animation(self, name, file_prefix):
+        """Register a clip to be loaded the first time it is played"""
+        self.deferred[name] = file_prefix
+        self.animations.pop(name, None)
+        self.curves.pop(name, None)
+
     def get_animation(self, name):
-        """Get animation data by name"""
+        """Get animation data by name, loading a deferred clip"""
+        if name in self.deferred:
+            return self.load_animation(name, self.deferred[name])
         return self.animations.get(name)
-    
+
     def set_current_animation(self, name):
         """Set the current animation to use"""
-        if name in self.animations:
+        if name in self.animations or name in self.deferred:
             self.current_animation = name
             return True
         return False
-    
+
     def get_frame_data(self, name, frame_number):
         """Get specific frame data from named animation"""
-        if name in self.animations and frame_number in self.animations[name]:
-            frame_data = self.animations[name][frame_number]
-            return {
-                'width': float(frame_data['y']) * self.scale_factor,
-                'height': float(frame_data['z']) * self.scale_factor
-            }
+        if name in self.deferred:
+            # A single frame of a clip that has not played yet, without building its array
+            values = self._get_bundle().frame(self.deferred[name], frame_number)
+            if values is not None:
+                return {'width': values[0] * self.scale, 'height': values[1] * self.scale}
+            return None
+        if name in self.animations:
+            first_frame, clip = self.animations[name]
+            index = frame_number - first_frame
+            if 0 <= index < clip.shape[1]:
+                return {
+                    'width': float(clip[0, index]) * self.scale,
+                    'height': float(clip[1, index]) * self.scale
+                }
         return None
-    
+
+    def get_curve(self, name):
+        """Interpolated curve of a named animation, fitted on first use"""
+        curve = self.curves.get(name)
+        if curve is None and self.get_animation(name) is not None:
+            from animation_functions.animation_curves import AnimationCurve
+
+            first_frame, clip = self.animations[name]
+            curve = self.curves[name] = AnimationCurve.fit(clip, first_frame)
+        return curve
+
+    def sample(self, name, position):
+        """Width and height in pixels at a fractional frame position, or None"""
+        curve = self.get_curve(name)
+        if curve is None:
+            return None
+        width, height = curve.sample(position, self.scale)
+        return float(width), float(height)
+
+    def render(self, name, fps, frame_duration=0.01):
+        """Pre-render a named animation to a (frames, 2) array for a display refresh rate"""
+        curve = self.get_curve(name)
+        return curve.render(fps, frame_duration, self.scale) if curve is not None else None
+
     def frame_count(self, name):
         """Get the total number of frames in an animation"""
-        if name in self.animations:
-            return max(self.animations[name].keys())
-        return 0
\ No newline at end of file
+        if name in self.deferred:
+            first_frame, frame_count, _ = self._get_bundle().index.get(self.deferred[name], (1, 0, 0))
+            return first_frame + frame_count - 1
+        if self.get_animation(name) is not None:
+            first_frame, clip = self.animations[name]
+            return first_frame + clip.shape[1] - 1
+        return 0
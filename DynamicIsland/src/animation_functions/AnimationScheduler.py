@@ -0,0 +1,161 @@
+import asyncio
+import time
+from functions.instrumentation import tracer
+from functions.log import get_logger
+
+log = get_logger("scheduler")
+
+
+class _ClipPlayback:
+    """A clip being played: its frame range, start time and the size it blends from"""
+
+    def __init__(self, name, start_frame, end_frame, frame_duration, started_at, future, blend_from):
+        self.name = name
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.frame_duration = frame_duration
+        self.started_at = started_at
+        self.future = future
+        self.blend_from = blend_from
+
+    def position(self, now):
+        """Clip frame (fractional) reached at time now"""
+        return self.start_frame + (now - self.started_at) / self.frame_duration
+
+
+class AnimationScheduler:
+    """Plays animation clips on one asyncio ticker with monotonic frame pacing.
+
+    Only one clip runs at a time: a new clip preempts the running one and starts
+    from the current size. apply_frame(width, height) is called once per rendered frame.
+    """
+
+    def __init__(self, animation_manager, apply_frame, fps=60, blend_frames=6, clock=time.monotonic):
+        self.animation_manager = animation_manager
+        self.apply_frame = apply_frame
+        self.fps = fps
+        self.blend_frames = blend_frames
+        self.clock = clock
+        self.width = None
+        self.height = None
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.clips_finished = 0
+        self.clips_preempted = 0
+        self.frame_intervals = []
+        self._clip = None
+        self._task = None
+
+    @property
+    def running(self):
+        return self._clip is not None
+
+    @property
+    def current_clip(self):
+        return self._clip.name if self._clip else None
+
+    def set_size(self, width, height):
+        """Record a size applied outside the scheduler, e.g. by an implicit Flet animation"""
+        self.width = width
+        self.height = height
+
+    def play(self, name, speed=1 / 60, start_frame=1, end_frame=None) -> asyncio.Future:
+        """Start a clip, replacing the running one.
+
+        speed is the duration of one clip frame in seconds. The returned future
+        resolves to True when the clip finished and False when it was preempted.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self.animation_manager.get_animation(name) is None:
+            log.warning("animation_missing", clip=name)
+            future.set_result(False)
+            return future
+        if end_frame is None:
+            end_frame = self.animation_manager.frame_count(name)
+
+        self._finish(False)
+        blend_from = (self.width, self.height) if self.width is not None else None
+        self._clip = _ClipPlayback(name, start_frame, end_frame, speed, self.clock(), future, blend_from)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return future
+
+    def cancel(self):
+        """Stop the running clip where it is"""
+        self._finish(False)
+
+    def _finish(self, completed):
+        clip, self._clip = self._clip, None
+        if clip is None:
+            return
+        if completed:
+            self.clips_finished += 1
+        else:
+            self.clips_preempted += 1
+        if not clip.future.done():
+            clip.future.set_result(completed)
+
+    def _render(self, clip, now):
+        position = min(clip.position(now), clip.end_frame)
+        size = self.animation_manager.sample(clip.name, position)
+        if size is None:
+            return True
+        width, height = size
+        if clip.blend_from is not None:
+            # Ease from the size the previous clip left behind into this clip
+            alpha = min(1.0, (position - clip.start_frame + 1) / self.blend_frames)
+            width = clip.blend_from[0] + (width - clip.blend_from[0]) * alpha
+            height = clip.blend_from[1] + (height - clip.blend_from[1]) * alpha
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.apply_frame(width, height)
+        self.frames_rendered += 1
+        return position >= clip.end_frame
+
+    async def _run(self):
+        frame_time = 1 / self.fps
+        next_tick = self.clock()
+        last_tick = None
+        while self._clip is not None:
+            now = self.clock()
+            if last_tick is not None:
+                self.frame_intervals.append(now - last_tick)
+                if tracer.enabled:
+                    tracer.record("animation.frame_interval", (now - last_tick) * 1000, "animation")
+                del self.frame_intervals[:-600]
+            last_tick = now
+
+            clip = self._clip
+            started = time.perf_counter_ns() if tracer.enabled else 0
+            try:
+                done = self._render(clip, now)
+                if started:
+                    tracer.complete("animation.frame", "animation", started)
+            except Exception:
+                log.exception("animation_render_failed", clip=clip.name)
+                done = True
+            if done:
+                self._finish(True)
+
+            next_tick += frame_time
+            now = self.clock()
+            if now > next_tick:
+                # Behind schedule: skip the ticks we missed instead of rendering them late
+                missed = int((now - next_tick) / frame_time) + 1
+                self.frames_dropped += missed
+                next_tick += missed * frame_time
+            await asyncio.sleep(next_tick - now)
+
+    def stats(self) -> dict:
+        intervals = self.frame_intervals
+        mean = sum(intervals) / len(intervals) if intervals else 0.0
+        jitter = (sum((i - mean) ** 2 for i in intervals) / len(intervals)) ** 0.5 if intervals else 0.0
+        return {
+            'frames_rendered': self.frames_rendered,
+            'frames_dropped': self.frames_dropped,
+            'clips_finished': self.clips_finished,
+            'clips_preempted': self.clips_preempted,
+            'fps': 1 / mean if mean else 0.0,
+            'jitter_ms': jitter * 1000,
+        }
@@ -0,0 +1,141 @@
+"""Compiled animation bundle built from the Blender dumps in assets/animation_data.
+
+Layout (little endian):
+    header  magic b"DIAB", version u16, clip count u16
+    index   per clip: name 32s, first frame u32, frame count u32, data offset u32
+    data    per clip: float32 Y values then float32 Z values, frame count each
+
+Rebuild by hand from the src directory with: python -m animation_functions.animation_bundle
+"""
+import glob
+import mmap
+import os
+import struct
+from convert_frames import parse_frames_file
+from functions.log import get_logger
+
+log = get_logger("animation_bundle")
+
+MAGIC = b"DIAB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+INDEX_ENTRY = struct.Struct("<32sIII")
+VALUE = struct.Struct("<f")
+
+ANIMATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "animation_data")
+BUNDLE_PATH = os.path.join(ANIMATION_DIR, "animations.bin")
+
+
+def source_files(source_dir=ANIMATION_DIR) -> list:
+    return sorted(glob.glob(os.path.join(source_dir, "*.txt")))
+
+
+def build_bundle_bytes(source_dir=ANIMATION_DIR) -> bytes:
+    """Pack every *.txt clip of source_dir into the bundle format"""
+    import numpy as np
+
+    clips = []
+    for path in source_files(source_dir):
+        frames = parse_frames_file(path)
+        if not frames:
+            continue
+        first_frame = frames[0][0]
+        if [frame for frame, _, _ in frames] != list(range(first_frame, first_frame + len(frames))):
+            raise ValueError(f"{path} has missing frames")
+        name = os.path.splitext(os.path.basename(path))[0]
+        data = np.array([[y for _, y, _ in frames], [z for _, _, z in frames]], dtype="<f4")
+        clips.append((name, first_frame, data))
+
+    offset = HEADER.size + INDEX_ENTRY.size * len(clips)
+    index, blobs = [], []
+    for name, first_frame, data in clips:
+        index.append(INDEX_ENTRY.pack(name.encode("utf-8"), first_frame, data.shape[1], offset))
+        blobs.append(data.tobytes())
+        offset += data.nbytes
+    return HEADER.pack(MAGIC, VERSION, len(clips)) + b"".join(index) + b"".join(blobs)
+
+
+def build_bundle(source_dir=ANIMATION_DIR, bundle_path=BUNDLE_PATH):
+    """Write the bundle atomically next to the sources"""
+    data = build_bundle_bytes(source_dir)
+    tmp_path = bundle_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+def is_stale(source_dir=ANIMATION_DIR, bundle_path=BUNDLE_PATH) -> bool:
+    if not os.path.exists(bundle_path):
+        return True
+    bundle_mtime = os.path.getmtime(bundle_path)
+    return any(os.path.getmtime(path) > bundle_mtime for path in source_files(source_dir))
+
+
+class AnimationBundle:
+    """Read-only view over a bundle, clip arrays are created on first access"""
+
+    def __init__(self, buffer, path=None):
+        self.path = path
+        self._buffer = buffer
+        magic, version, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported animation bundle {path or ''}")
+        self.index = {}
+        for i in range(count):
+            name, first_frame, frame_count, offset = INDEX_ENTRY.unpack_from(buffer, HEADER.size + i * INDEX_ENTRY.size)
+            self.index[name.rstrip(b"\0").decode("utf-8")] = (first_frame, frame_count, offset)
+        self._clips = {}
+
+    @classmethod
+    def open(cls, path=BUNDLE_PATH):
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def names(self):
+        return list(self.index)
+
+    def first_frame(self, name) -> int:
+        return self.index[name][0]
+
+    def frame(self, name, frame_number):
+        """Y/Z values of one frame read straight from the buffer, without NumPy, or None"""
+        if name not in self.index:
+            return None
+        first_frame, frame_count, offset = self.index[name]
+        index = frame_number - first_frame
+        if not 0 <= index < frame_count:
+            return None
+        y, = VALUE.unpack_from(self._buffer, offset + index * VALUE.size)
+        z, = VALUE.unpack_from(self._buffer, offset + (frame_count + index) * VALUE.size)
+        return y, z
+
+    def clip(self, name):
+        """Return the (2, frame count) float32 array of Y/Z values for a clip, or None"""
+        clip = self._clips.get(name)
+        if clip is None and name in self.index:
+            import numpy as np
+            _, frame_count, offset = self.index[name]
+            clip = np.frombuffer(self._buffer, dtype="<f4", count=frame_count * 2, offset=offset).reshape(2, frame_count)
+            self._clips[name] = clip
+        return clip
+
+
+def load_bundle(source_dir=ANIMATION_DIR, bundle_path=BUNDLE_PATH) -> AnimationBundle:
+    """Open the bundle, rebuilding it first when a source file is newer"""
+    if is_stale(source_dir, bundle_path):
+        try:
+            build_bundle(source_dir, bundle_path)
+        except OSError as e:
+            # Read-only install: keep the compiled clips in memory for this run
+            log.warning("animation_bundle_readonly", error=str(e))
+            return AnimationBundle(build_bundle_bytes(source_dir))
+    return AnimationBundle.open(bundle_path)
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_bundle()}")
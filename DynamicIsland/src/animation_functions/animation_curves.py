@@ -0,0 +1,74 @@
+import numpy as np
+
+
+def _simplify(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker on (frame, y, z) points, returns the indices of the kept knots"""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = points[first + 1:last]
+        # Error of the straight segment at every inner frame, in both channels
+        t = (inner[:, 0] - points[first, 0]) / (points[last, 0] - points[first, 0])
+        line = points[first, 1:] + t[:, None] * (points[last, 1:] - points[first, 1:])
+        error = np.abs(inner[:, 1:] - line).max(axis=1)
+        worst = int(error.argmax())
+        if error[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+class AnimationCurve:
+    """Piecewise-linear fit of a Blender clip that can be sampled at any fractional frame.
+
+    Values are in Blender units (Y = width, Z = height); multiply by the display scale.
+    """
+
+    def __init__(self, frames, widths, heights):
+        self.frames = np.asarray(frames, dtype=np.float32)
+        self.widths = np.asarray(widths, dtype=np.float32)
+        self.heights = np.asarray(heights, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, clip: np.ndarray, first_frame=1, tolerance=0.002):
+        """Fit a (2, frame count) clip, keeping only knots needed to stay within tolerance"""
+        frames = np.arange(first_frame, first_frame + clip.shape[1], dtype=np.float64)
+        points = np.column_stack([frames, clip[0], clip[1]]).astype(np.float64)
+        knots = _simplify(points, tolerance) if len(points) > 2 else np.arange(len(points))
+        return cls(frames[knots], clip[0][knots], clip[1][knots])
+
+    @property
+    def first_frame(self):
+        return float(self.frames[0])
+
+    @property
+    def last_frame(self):
+        return float(self.frames[-1])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def sample(self, position, scale=1.0):
+        """Width and height at a fractional frame position (scalar or array), clamped to the clip"""
+        width = np.interp(position, self.frames, self.widths) * scale
+        height = np.interp(position, self.frames, self.heights) * scale
+        return width, height
+
+    def render(self, fps, frame_duration=0.01, scale=1.0) -> np.ndarray:
+        """Pre-render the whole clip for a display refresh rate.
+
+        frame_duration is how long one Blender frame lasts, so it also sets the playback
+        speed. Returns a (display frames, 2) float32 array of width/height.
+        """
+        duration = (self.last_frame - self.first_frame) * frame_duration
+        count = int(np.ceil(duration * fps)) + 1
+        positions = self.first_frame + np.minimum(np.arange(count) / fps / frame_duration,
+                                                  self.last_frame - self.first_frame)
+        width, height = self.sample(positions, scale)
+        return np.column_stack([width, height]).astype(np.float32)
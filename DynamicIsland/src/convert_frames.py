@@ -1,30 +1,40 @@
 import os
 import re
-import json
+from functions.log import get_logger
+
+log = get_logger("convert_frames")
+
+FRAME_PATTERN = re.compile(r"Frame (\d+): Y:(\d+\.\d+) Z:(\d+\.\d+)")
+
+
+def parse_frames_file(frames_path: str) -> list:
+    """Parse a Blender dump into a list of (frame, y, z) tuples sorted by frame"""
+    frames = []
+    with open(frames_path, 'r') as file:
+        for line in file:
+            match = FRAME_PATTERN.match(line)
+            if match:
+                frames.append((int(match.group(1)), float(match.group(2)), float(match.group(3))))
+    frames.sort()
+    return frames
+
 
 def convert_frames_to_dict(path: str = "frames_open") -> dict:
     frames_path = f"assets/animation_data/{path}.txt"
     frames_path = os.path.abspath(frames_path)
-    print(f"Converting frames from {frames_path} to dictionary format...")
+    log.debug("converting_frames", path=frames_path)
 
     frames_dict = {}
     
     try:
-        with open(frames_path, 'r') as file:
-            for line in file:
-                match = re.match(r"Frame (\d+): Y:(\d+\.\d+) Z:(\d+\.\d+)", line)
-                if match:
-                    frame_num = int(match.group(1))
-                    y_scale = float(match.group(2))
-                    z_scale = float(match.group(3))
-                    
-                    # Store the values in the dictionary
-                    frames_dict[frame_num] = {
-                        'y': y_scale,
-                        'z': z_scale
-                    }
+        for frame_num, y_scale, z_scale in parse_frames_file(frames_path):
+            # Store the values in the dictionary
+            frames_dict[frame_num] = {
+                'y': y_scale,
+                'z': z_scale
+            }
     except FileNotFoundError:
-        print(f"Error: File {frames_path} not found.")
+        log.error("frames_file_missing", path=frames_path)
         return None
     return frames_dict
 
@@ -1,29 +1,43 @@
 import asyncio
-import time
+from typing import TYPE_CHECKING
 import flet as ft
 from animation_functions.AnimationManager import AnimationManager
+from animation_functions.AnimationScheduler import AnimationScheduler
 from layers.DynamicIslandIn import DynamicIislandIn
 from layers.music import SoundControl
-from functions.media_checker import MediaPlayerController
-import base64
-import io
-from PIL import Image
-import numpy as np
-from collections import Counter
+from functions.cover_cache import CoverArt
+from functions.update_coalescer import UpdateCoalescer
+from functions.track_transitions import TrackTransitionPipeline
+from functions.hit_region import HitRegion
+from functions.island_state import IslandStateMachine, HOVER_ENTER, HOVER_EXIT, CLICK, TRACK, SWITCH, CLEAR, MEDIA
+from functions.notification_queue import NotificationBatch
+from functions.instrumentation import tracer
+from functions.log import get_logger
+
+if TYPE_CHECKING:
+    from functions.media_checker import MediaPlayerController
+
+log = get_logger("island")
+
+# The open clip grows into a card until this frame, holds, and shrinks back from CARD_CLOSE
+CARD_OPEN = 46
+CARD_CLOSE = 80
 
 class DynamicIslandApp(ft.Container):
-    def __init__(self):
+    def __init__(self, live_blur=False):
         super().__init__()
+        self.live_blur = live_blur
         self.expand = True
         self.clip_behavior = ft.ClipBehavior.ANTI_ALIAS_WITH_SAVE_LAYER
         self.alignment = ft.alignment.top_center
         self.animation_manager = AnimationManager(scale_factor=70)
-        self.animation_manager.load_animation("open", "frames_open")
-        self.animation_manager.load_animation("callback", "callback")
-        self.animation_manager.load_animation("close", "callback_out")
-        self.animation_manager.load_animation("show_side", "show_side")
-        self.animation_manager.load_animation("side_hovered", "side_hovered")
-        self.animation_manager.load_animation("side_unhovered", "side_unhovered")
+        # Only the collapsed size is read up front, clips load the first time they play
+        self.animation_manager.defer_animation("open", "frames_open")
+        self.animation_manager.defer_animation("callback", "callback")
+        self.animation_manager.defer_animation("close", "callback_out")
+        self.animation_manager.defer_animation("show_side", "show_side")
+        self.animation_manager.defer_animation("side_hovered", "side_hovered")
+        self.animation_manager.defer_animation("side_unhovered", "side_unhovered")
         self.animation_manager.set_current_animation("open")
         
         initial_frame = self.animation_manager.get_frame_data("open", 1)
@@ -31,16 +45,26 @@ class DynamicIslandApp(ft.Container):
         self.base_width = initial_frame['width']
         self.height_dynamic = initial_frame['height']
         self.width_dynamic = initial_frame['width']
-        self.is_hovered = False
-        self.is_playing = False
+        # Rounding of the bottom corners, shared by the container and its hit-test region
+        self.corner_radius = self.base_height / 2
+        self.hit_region = HitRegion(self.corner_radius)
+        self.scheduler = AnimationScheduler(self.animation_manager, self.apply_frame, fps=60)
+        self.scheduler.set_size(self.width_dynamic, self.height_dynamic)
+        self.island_state = IslandStateMachine(self.state_actions(), on_interrupt=self.scheduler.cancel)
+        self.updates = UpdateCoalescer()
         self.content = self.__content()
         # self.init_container()
         
     def update_layout(self):
         """Update layout dimensions based on current width/height"""
-        self.container.height = self.height_dynamic
-        self.container.width = self.width_dynamic
-        self.container.update()
+        self.updates.set(self.container, height=self.height_dynamic, width=self.width_dynamic)
+        self.updates.flush()
+        self.hit_region.update(self.width_dynamic, self.height_dynamic)
+
+    def attach_window(self, window):
+        """Let the native window follow the island's size with its hit-test region"""
+        self.hit_region.attach(window)
+        self.hit_region.update(self.width_dynamic, self.height_dynamic)
 
     def layout(self):
         """Create the layout for the dynamic island"""
@@ -52,43 +76,50 @@ class DynamicIslandApp(ft.Container):
         self.middle = ft.Container(width=width-(height*2), animate=animate, padding=10)
         self.right = ft.Container(width=height, animate=animate, padding=10)
 
-    def __play_animation(self, name, speed=0.01, start_frame=1, end_frame=None):
-        """Play a specific animation by name asynchronously"""
-        anim_data = self.animation_manager.get_animation(name)
-        if not anim_data:
-            print(f"Animation '{name}' not found")
-            return False
-            
-        if end_frame is None:
-            end_frame = self.animation_manager.frame_count(name)
-        
-        for frame_number in range(start_frame, end_frame + 1):
-            frame_data = self.animation_manager.get_frame_data(name, frame_number)
-            if frame_data:
-                self.width_dynamic = frame_data['width']
-                self.height_dynamic = frame_data['height']
-                self.update_layout()
-                time.sleep(0.01)
-        return True
+    def apply_frame(self, width, height):
+        """Render one animation frame, called by the scheduler"""
+        self.width_dynamic = width
+        self.height_dynamic = height
+        self.update_layout()
 
     def play_animation(self, name, speed=0.01, start_frame=1, end_frame=None):
-            return self.page.run_thread(self.__play_animation,name, speed, start_frame, end_frame)
+        """Play a specific animation by name, replacing the one currently running.
 
+        speed is the duration of one Blender frame in seconds. Returns a future that
+        resolves to True when the clip completes and False when it is preempted.
+        """
+        self.hit_region.begin(name, self.animation_manager)
+        return self.scheduler.play(name, speed, start_frame, end_frame)
 
-    async def reset_animation(self):
-        """Reset the animation asynchronously"""
-        animate = ft.Animation(duration=300, curve=ft.AnimationCurve.LINEAR_TO_EASE_OUT)
-        self.container.animate = animate
-        self.container.update()
-        await asyncio.sleep(0.02)
+
+    def state_actions(self) -> dict:
+        """Action of every transition in the island state table, one animation each"""
+        actions = {
+            name: (lambda payload, name=name: self.play_animation(name))
+            for name in ("callback", "close", "side_hovered", "side_unhovered")
+        }
+        actions["reset"] = lambda payload: self.reset_animation()
+        return actions
+
+    async def reset_animation(self, settle=True):
+        """Collapse the island, settle animates it over 300 ms and waits for that to finish"""
+        self.scheduler.cancel()
+        if settle:
+            animate = ft.Animation(duration=300, curve=ft.AnimationCurve.LINEAR_TO_EASE_OUT)
+            self.updates.set(self.container, animate=animate)
+            self.updates.flush()
+            await asyncio.sleep(0.02)
+        self.hit_region.begin("reset")
         self.width_dynamic = self.base_width
         self.height_dynamic = self.base_height
+        self.scheduler.set_size(self.base_width, self.base_height)
         self.update_layout()
         await self.layer.animate_layer(False)  # Assumes animate_layer is async
-        await asyncio.sleep(0.3)
-        new_animate = ft.Animation(duration=2, curve=ft.AnimationCurve.EASE_IN)
-        self.container.animate = new_animate
-        self.container.update()
+        if settle:
+            await asyncio.sleep(0.3)
+            new_animate = ft.Animation(duration=2, curve=ft.AnimationCurve.EASE_IN)
+            self.updates.set(self.container, animate=new_animate)
+            self.updates.flush()
         return True
 
     async def show_sound_control(self):
@@ -104,7 +135,7 @@ class DynamicIslandApp(ft.Container):
 
     def __content(self):
         """Initialize the main UI"""
-        self.layer = DynamicIislandIn()  # Fixed typo: DynamicIislandIn -> DynamicIslandIn
+        self.layer = DynamicIislandIn(self.updates, live_blur=self.live_blur)  # Fixed typo: DynamicIislandIn -> DynamicIslandIn
         self.container = ft.Container(
             width=self.width_dynamic,
             height=self.height_dynamic,
@@ -115,8 +146,8 @@ class DynamicIslandApp(ft.Container):
             ),
             alignment=ft.alignment.center,
             border_radius=ft.border_radius.only(
-                bottom_left=self.height_dynamic/2,
-                bottom_right=self.height_dynamic/2
+                bottom_left=self.corner_radius,
+                bottom_right=self.corner_radius
             ), 
             content=self.layer,
             animate=ft.Animation(duration=2)
@@ -124,23 +155,12 @@ class DynamicIslandApp(ft.Container):
         return self.container
     
     async def __on_hover(self, e):
-        """Handle hover events asynchronously"""
-        self.is_hovered = not self.is_hovered
-        if self.is_hovered:
-            self.play_animation("side_hovered") if self.is_playing else self.play_animation("callback")
-        else:
-            self.play_animation("side_unhovered") if self.is_playing else self.play_animation("close")
+        """Queue the pointer entering or leaving, the state machine picks the animation"""
+        self.island_state.post(HOVER_ENTER if e.data == "true" else HOVER_EXIT)
 
     async def __on_click(self, e):
-        """Handle click events asynchronously"""
-        self.container.on_hover = None
-        self.is_hovered = False
-        self.update_layout()
-        await asyncio.sleep(0.02)
-        self.play_animation("close")
-        self.play_animation("open")
-        # self.container.on_hover = self.__on_hover
-        self.update_layout()
+        """Queue a click, it collapses a hovered island"""
+        self.island_state.post(CLICK)
     
     def reset_hover(self):
         """Reset hover state"""
@@ -162,40 +182,190 @@ class DynamicIslandApp(ft.Container):
             await self.layer.animate_layer()  # Assumes animate_layer is async
             await self.play_animation("show_side")
             await asyncio.sleep(0.5)
-        except Exception as e:
-            print(f"Error in init_sound: {e}")
+        except Exception:
+            log.exception("init_sound_failed")
 
 
 class ControlDynamicIsland(DynamicIslandApp):
-    def __init__(self,controller_media=None):
-        super().__init__()
-        self.controller_media: MediaPlayerController = controller_media
-        self.content_control: SoundControl = self.layer.content
+    def __init__(self,controller_media=None, live_blur=False, track_debounce=0.15):
+        super().__init__(live_blur=live_blur)
+        self.controller_media: "MediaPlayerController" = controller_media
+        self.content_control: SoundControl = self.layer.sound
+        self.restored_key = None
+        # Track that arrived while a notification covered the media controls
+        self.held_cover = None
+        # Media controls fully up, a session switch can swap the cover in place
+        self.track_shown = False
+        # Track on the island or on its way there, None while it is collapsed
+        self.shown_cover = None
+        self.island_state.actions.update({
+            "reset": self.__clear_island,
+            "show_track": self.__show_track,
+            "swap_track": self.__swap_track,
+            "show_notification": self.__show_notification,
+            "update_notification": self.__update_notification,
+            "hide_notification": self.__hide_notification,
+            "restore_media": self.__restore_media,
+            "hold_track": self.__hold_track,
+            "drop_track": self.__drop_track,
+        })
+        self.transitions = TrackTransitionPipeline(
+            self.__post_track, debounce=track_debounce, on_cancel=lambda: self.island_state.interrupt(TRACK)
+        )
     
+    def attach_controller(self, controller_media: "MediaPlayerController"):
+        """Wire the transport buttons once the media controller exists, it is created after first paint"""
+        self.controller_media = controller_media
+        if self.page:
+            self.init_control_audio()
+
     def init_control_audio(self):
+        if self.controller_media is None:
+            return
         self.content_control.setup_callbacks(
             on_play=self.controller_media.play,
             on_pause=self.controller_media.pause,
             on_next=self.controller_media.next_track,
-            on_prev=self.controller_media.previous_track
+            on_prev=self.controller_media.previous_track,
+            on_select_session=self.controller_media.select_session,
+            on_seek=self.controller_media.set_position
         )
 
     def playing_pause(self,state):
         self.content_control.toggle_functions_play_pause(state)
 
     
-    async def change_track(self, music_cover_base64):
+    async def change_track(self, cover: CoverArt, switched=False):
+        """Queue the transition to a new track, superseding one still in flight.
+
+        The track of another session (switched) skips the debounce and is swapped
+        into the media controls without collapsing them.
+        """
+        restored, self.restored_key = self.restored_key, None
+        if restored is not None and cover.key == restored:
+            # Still the track the snapshot painted, nothing to animate
+            return
+        if switched:
+            self.transitions.cancel()
+            self.island_state.post(SWITCH, cover)
+            return
+        self.transitions.submit(cover)
+
+    def restore_snapshot(self, snapshot) -> bool:
+        """Paint the state saved by the last run, before the media backend answers.
+
+        Call it before the island is added to the page so the first paint shows it.
+        """
+        cover = snapshot.cover
+        if snapshot.mode != MEDIA or cover is None:
+            return False
+        with self.updates.batch():
+            self.content_control.change_music_cover(cover)
+            self.content_control.toggle_functions_play_pause(snapshot.track.is_playing)
+            if cover.palette:
+                self.updates.set(self.layer, bgcolor=cover.palette[0])
+            self.updates.set(self.layer, opacity=1)
+            # Last frame of show_side, read from the bundle without loading the clip
+            size = self.animation_manager.get_frame_data("show_side", self.animation_manager.frame_count("show_side"))
+            if size:
+                self.scheduler.set_size(size['width'], size['height'])
+                self.apply_frame(size['width'], size['height'])
+        self.island_state.restore(MEDIA)
+        self.restored_key = cover.key
+        self.shown_cover = cover
+        self.track_shown = True
+        return True
+
+    async def update_sessions(self, states, active_id):
+        """Keep the session switcher in sync with the controller's session store"""
+        self.content_control.show_sessions(states, active_id)
+
+    async def update_timeline(self, timeline):
+        """Redraw the progress bar from the controller's extrapolated timeline"""
+        self.content_control.show_timeline(timeline)
+
+    async def clear_track(self):
+        """Nothing is playing: drop pending transitions and collapse the island"""
+        # The snapshot's track is no longer on screen, it has to animate in when it plays again
+        self.restored_key = None
+        self.transitions.cancel()
+        self.island_state.post(CLEAR)
+
+    async def __post_track(self, cover: CoverArt):
+        """Hand the debounced track to the state machine and wait until it is shown"""
+        await self.island_state.post(TRACK, cover)
+
+    async def __show_track(self, cover: CoverArt):
         layer: DynamicIislandIn = self.layer
-        print("ABOBA")
         if self.content_control:
             # self.reset_hover()
-            await self.reset_animation()
-            self.content_control.change_music_cover(music_cover_base64)
-            self.page.run_thread(self.play_animation,"show_side")
+            # Replacing a track that is up or still coming up needs no collapse to wait for
+            replacing = self.shown_cover is not None
+            self.shown_cover = cover
+            self.track_shown = False
+            await self.reset_animation(settle=not replacing)
+            with tracer.span("island.change_cover", "ui"), self.updates.batch():
+                self.content_control.change_music_cover(cover)
+                if cover.palette:
+                    await layer.change_bgcolor(cover.palette[0])
+            self.play_animation("show_side")
             await asyncio.sleep(0.2)
             await layer.animate_layer()
-            self.is_playing = True
+            self.track_shown = True
             # self.set_hover()
+
+    async def __swap_track(self, cover: CoverArt):
+        """Put another session's track on the media controls already up, in one update"""
+        if not self.track_shown:
+            # The transition that brings them up was cut short, run it again
+            await self.__show_track(cover)
+            return
+        with tracer.span("island.swap_cover", "ui"), self.updates.batch():
+            self.content_control.change_music_cover(cover)
+            if cover.palette:
+                await self.layer.change_bgcolor(cover.palette[0])
+
+    async def __clear_island(self, payload=None):
+        self.shown_cover = None
+        self.track_shown = False
+        await self.reset_animation()
+
+    async def __show_notification(self, batch: NotificationBatch):
+        """Open the island into a notification card over whatever it showed"""
+        self.layer.show_notification(batch)
+        await self.play_animation("open", end_frame=CARD_OPEN)
+
+    async def __update_notification(self, batch: NotificationBatch):
+        """Fold newer notifications into the card already open, nothing animates"""
+        self.layer.card.show(batch)
+
+    async def __hide_notification(self, payload=None):
+        self.layer.hide_notification()
+        await self.play_animation("open", start_frame=CARD_CLOSE)
+
+    async def __restore_media(self, payload=None):
+        """Close the card and bring back the media controls, with the track that arrived meanwhile"""
+        cover, self.held_cover = self.held_cover, None
+        if cover is not None:
+            self.shown_cover = cover
+        self.track_shown = False
+        with self.updates.batch():
+            if cover is not None:
+                self.content_control.change_music_cover(cover)
+            shown = self.content_control.cover
+            palette = shown.palette if shown is not None else None
+            self.layer.hide_notification(palette[0] if palette else "black")
+        await self.play_animation("open", start_frame=CARD_CLOSE)
+        await self.play_animation("show_side")
+        self.track_shown = True
+
+    async def __hold_track(self, cover: CoverArt):
+        self.held_cover = cover
+
+    async def __drop_track(self, payload=None):
+        self.held_cover = None
+        self.shown_cover = None
+
     def did_mount(self):
         self.init_control_audio()
         return super().did_mount()
\ No newline at end of file
@@ -0,0 +1,44 @@
+class AdaptiveInterval:
+    """Monitor loop sleep interval: fast while something happens, exponential backoff when idle.
+
+    ``activity()`` snaps back to the minimum (playback, media events, user input),
+    ``idle()`` multiplies the interval by ``factor`` up to the maximum.
+    """
+
+    def __init__(self, minimum=0.05, maximum=5.0, factor=2.0):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.factor = factor
+        self.interval = minimum
+        self.wakeups = 0
+        self.fast_wakeups = 0
+        self.idle_wakeups = 0
+        self.resets = 0
+
+    def activity(self) -> float:
+        if self.interval != self.minimum:
+            self.resets += 1
+        self.interval = self.minimum
+        return self.interval
+
+    def idle(self) -> float:
+        self.interval = min(self.interval * self.factor, self.maximum)
+        return self.interval
+
+    def next(self, active: bool) -> float:
+        """Interval to sleep after a wakeup that was active or idle"""
+        self.wakeups += 1
+        if active:
+            self.fast_wakeups += 1
+            return self.activity()
+        self.idle_wakeups += 1
+        return self.idle()
+
+    def stats(self) -> dict:
+        return {
+            'interval': self.interval,
+            'wakeups': self.wakeups,
+            'fast_wakeups': self.fast_wakeups,
+            'idle_wakeups': self.idle_wakeups,
+            'resets': self.resets,
+        }
@@ -0,0 +1,27 @@
+import os
+import sys
+
+APP_NAME = "DynamicIsland"
+
+
+def app_data_dir() -> str:
+    """Per-user directory for what the island keeps between runs.
+
+    %LOCALAPPDATA%\\DynamicIsland on Windows, $XDG_STATE_HOME/DynamicIsland
+    (~/.local/state by default) elsewhere. Unlike the temp directory it is neither
+    shared between accounts nor cleaned up behind the app's back.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, APP_NAME)
+
+
+def make_private_dir(path) -> str:
+    """Create path if needed, readable and writable by the current user only"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.name == "posix":
+        # makedirs leaves an existing directory's mode alone
+        os.chmod(path, 0o700)
+    return path
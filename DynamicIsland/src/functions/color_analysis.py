@@ -0,0 +1,73 @@
+import numpy as np
+from PIL import Image
+
+SAMPLE_SIZE = 32
+PALETTE_BITS = 3  # 8 levels per channel, 512 histogram bins
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class ColorAnalysis:
+    """Colors derived from a cover, all channels in 0..255"""
+    __slots__ = ("luminance", "palette", "button_color", "edge_color", "contrast_color")
+
+    def __init__(self, luminance, palette, button_color, edge_color, contrast_color):
+        self.luminance = luminance
+        self.palette = palette
+        self.button_color = button_color
+        self.edge_color = edge_color
+        self.contrast_color = contrast_color
+
+
+def to_hex(rgb) -> str:
+    r, g, b = (int(round(c)) for c in rgb)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def sample_pixels(image: Image.Image, size=SAMPLE_SIZE) -> np.ndarray:
+    """Downsample the cover to a size x size float32 RGB array"""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    factor = min(image.size) // (size * 2)
+    if factor > 1:
+        # Cheap box reduction first so the resampling filter only sees a small image
+        image = image.reduce(factor)
+    if image.size != (size, size):
+        image = image.resize((size, size), Image.BILINEAR)
+    return np.asarray(image, dtype=np.float32)
+
+
+def dominant_palette(pixels: np.ndarray, count=4, bits=PALETTE_BITS) -> list:
+    """Most frequent colors of a histogram over quantized RGB, most dominant first"""
+    flat = pixels.reshape(-1, 3)
+    quantized = flat.astype(np.uint8) >> (8 - bits)
+    codes = (quantized[:, 0].astype(np.intp) << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+    bins = 1 << (3 * bits)
+    counts = np.bincount(codes, minlength=bins)
+    top = np.argsort(counts)[::-1][:count]
+    top = top[counts[top] > 0]
+    # Report the mean of the pixels in each bin rather than the bin corner
+    means = np.stack([np.bincount(codes, weights=flat[:, channel], minlength=bins) for channel in range(3)], axis=1)
+    return [to_hex(means[b] / counts[b]) for b in top]
+
+
+def analyze_colors(image: Image.Image, palette_size=4) -> ColorAnalysis:
+    """Luminance, dominant palette and button contrast of a cover"""
+    pixels = sample_pixels(image)
+    luma = pixels @ LUMA
+    height, width = luma.shape
+
+    # The buttons sit on the middle of the scaled up cover, sample the whole band instead of a 30 px spot
+    band = (slice(height * 3 // 8, height * 5 // 8), slice(width // 4, width * 3 // 4))
+    button_color = pixels[band].reshape(-1, 3).mean(axis=0)
+    button_luma = float(luma[band].mean())
+
+    edge = np.concatenate([pixels[0], pixels[-1], pixels[1:-1, 0], pixels[1:-1, -1]])
+    edge_color = edge.mean(axis=0)
+
+    return ColorAnalysis(
+        luminance=float(luma.mean()),
+        palette=dominant_palette(pixels, palette_size),
+        button_color=to_hex(button_color),
+        edge_color=to_hex(edge_color),
+        contrast_color='black' if button_luma > 150 else 'white,0.8',
+    )
@@ -0,0 +1,104 @@
+import base64
+import hashlib
+from collections import OrderedDict
+
+
+def cover_key(data: bytes) -> str:
+    """Cheap content hash of the raw thumbnail bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CoverArt:
+    """Processed cover art for one unique thumbnail.
+
+    src and thumbnail_src are set once the JPEGs are in the cover store; the base64
+    strings are only built for callers that still need them.
+    """
+    __slots__ = ("key", "jpeg", "thumbnail_jpeg", "backdrop_jpeg", "contrast_color", "palette",
+                 "src", "thumbnail_src", "backdrop_src")
+
+    def __init__(self, key, jpeg, thumbnail_jpeg=None, contrast_color=None, palette=None, backdrop_jpeg=None):
+        self.key = key
+        self.jpeg = jpeg
+        self.thumbnail_jpeg = thumbnail_jpeg or jpeg
+        self.backdrop_jpeg = backdrop_jpeg
+        self.contrast_color = contrast_color
+        self.palette = palette or []
+        self.src = None
+        self.thumbnail_src = None
+        self.backdrop_src = None
+
+    @property
+    def base64(self) -> str:
+        return base64.b64encode(self.jpeg).decode('utf-8')
+
+    @property
+    def thumbnail_base64(self) -> str:
+        return base64.b64encode(self.thumbnail_jpeg).decode('utf-8')
+
+    @property
+    def backdrop_base64(self) -> str:
+        return base64.b64encode(self.backdrop_jpeg).decode('utf-8') if self.backdrop_jpeg else None
+
+    @property
+    def size(self):
+        """Approximate memory held by the entry in bytes"""
+        size = len(self.jpeg) + (len(self.thumbnail_jpeg) if self.thumbnail_jpeg is not self.jpeg else 0)
+        return size + len(self.backdrop_jpeg or b"")
+
+
+class CoverCache:
+    """Bounded LRU of processed covers with byte-size accounting"""
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, max_entries=64):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key) -> CoverArt:
+        """Return the cached cover and mark it recently used, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, entry: CoverArt) -> CoverArt:
+        """Store an entry, evicting the least recently used ones over budget"""
+        old = self._entries.pop(entry.key, None)
+        if old is not None:
+            self.total_bytes -= old.size
+        self._entries[entry.key] = entry
+        self.total_bytes += entry.size
+        while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            if next(iter(self._entries)) == entry.key:
+                break
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.evictions += 1
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
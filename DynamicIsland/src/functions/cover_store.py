@@ -0,0 +1,95 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from functions.app_paths import app_data_dir, make_private_dir
+
+COVER_DIR = os.path.join(app_data_dir(), "covers")
+# Names the image pipeline stores: the cover key, a blake2b hex digest, and the variant
+COVER_NAME = re.compile(r"[0-9a-f]{32}(?:_thumb|_backdrop)?\.jpg")
+
+
+class CoverStore:
+    """Content-addressed cover files on disk with a byte quota and LRU eviction.
+
+    Controls reference the files through ft.Image(src=path), so a cover crosses the
+    Flet channel as a short path instead of a base64 blob in every update.
+    """
+
+    def __init__(self, directory=COVER_DIR, max_bytes=32 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.bytes_written = 0
+        self.files_written = 0
+        self.evictions = 0
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        make_private_dir(directory)
+        self._load_index()
+
+    def _load_index(self):
+        """Adopt covers left by a previous run, oldest first, anything not named like one is ignored"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not COVER_NAME.fullmatch(name) or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self.total_bytes += size
+        self._evict()
+
+    def path_for(self, name) -> str:
+        return os.path.join(self.directory, name)
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def store(self, name, data: bytes) -> str:
+        """Write data under name unless it is already stored, return the file path.
+
+        Safe to call from the image pipeline worker threads.
+        """
+        path = self.path_for(name)
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+                return path
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if name not in self._files:
+                self._files[name] = len(data)
+                self.total_bytes += len(data)
+                self.bytes_written += len(data)
+                self.files_written += 1
+            self._evict(keep=name)
+        return path
+
+    def _evict(self, keep=None):
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            name, size = next(iter(self._files.items()))
+            if name == keep:
+                self._files.move_to_end(name)
+                continue
+            del self._files[name]
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(name))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            'files': len(self._files),
+            'bytes': self.total_bytes,
+            'bytes_written': self.bytes_written,
+            'files_written': self.files_written,
+            'evictions': self.evictions,
+        }
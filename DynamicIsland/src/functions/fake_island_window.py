@@ -0,0 +1,26 @@
+import time
+from functions.island_window import IslandWindow
+
+
+class RecordingIslandWindow(IslandWindow):
+    """IslandWindow that records every call instead of touching a window, for tests and benchmarks.
+
+    ``regions`` holds (time, bounding box, radius) for each set_region call.
+    """
+
+    name = "fake"
+
+    def __init__(self, screen_width=1920, clock=time.monotonic):
+        self.width = screen_width
+        self.clock = clock
+        self.overlay = False
+        self.regions = []
+
+    def screen_width(self):
+        return self.width
+
+    def apply_overlay_style(self):
+        self.overlay = True
+
+    def set_region(self, region):
+        self.regions.append((self.clock(), region.bbox, region.radius))
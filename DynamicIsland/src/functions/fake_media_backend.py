@@ -0,0 +1,171 @@
+import asyncio
+import json
+import time
+from typing import Optional, Tuple
+from functions.media_backend import MediaBackend, PLAYING, PAUSED
+from functions.media_events import (
+    FakeEventSource, SESSIONS_CHANGED,
+    MEDIA_PROPERTIES_CHANGED, PLAYBACK_INFO_CHANGED, TIMELINE_CHANGED
+)
+
+
+class FakeSession:
+    """In-memory media session"""
+
+    def __init__(self, session_id, title="Unknown", artist="Unknown", album="Unknown",
+                 status=PAUSED, thumbnail=None, position=0.0, duration=0.0, playlist=None):
+        self.session_id = session_id
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.status = status
+        self.thumbnail = thumbnail
+        self.position = position
+        self.position_at = time.monotonic()
+        self.duration = duration
+        self.rate = 1.0
+        self.playlist = list(playlist or [])
+        self.track_index = 0
+
+
+class FakeMediaBackend(MediaBackend):
+    """Scriptable backend that replays recorded session timelines, for tests and benchmarks off Windows.
+
+    A timeline is a list of steps ``{"at": seconds, "session": id, ...fields}``. A step
+    with ``"closed": true`` removes the session; any other step creates or updates it.
+    Transport commands are recorded in ``commands`` and take ``latency`` seconds, or
+    ``latency(name)`` seconds when it is a callable, to inject per-command delays.
+    """
+
+    name = "fake"
+
+    def __init__(self, sessions=None, latency=0.0):
+        self._events = FakeEventSource()
+        self.sessions = {}
+        self.latency = latency
+        self.commands = []
+        self.timeline_steps = []
+        self.calls = 0
+        for session in sessions or []:
+            self.sessions[session.session_id] = session
+
+    @classmethod
+    def from_json(cls, path, **kwargs):
+        backend = cls(**kwargs)
+        with open(path, "r") as file:
+            backend.timeline_steps = json.load(file)
+        return backend
+
+    def events(self) -> FakeEventSource:
+        return self._events
+
+    def add_session(self, session: FakeSession):
+        self.sessions[session.session_id] = session
+        self._events.emit(SESSIONS_CHANGED)
+        return session
+
+    def remove_session(self, session_id):
+        if self.sessions.pop(session_id, None) is not None:
+            self._events.emit(SESSIONS_CHANGED)
+
+    def update(self, session_id, **fields):
+        """Change session fields and emit the events a real player would"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return self.add_session(FakeSession(session_id, **fields))
+        if "status" in fields and "position" not in fields:
+            # Like a real player the reported position only moves on timeline updates
+            now = time.monotonic()
+            if session.status == PLAYING:
+                session.position += (now - session.position_at) * session.rate
+            session.position_at = now
+        if "position" in fields:
+            session.position_at = time.monotonic()
+        for name, value in fields.items():
+            setattr(session, name, value)
+        if fields.keys() & {"title", "artist", "album", "thumbnail"}:
+            self._events.emit(MEDIA_PROPERTIES_CHANGED, session_id)
+        if "status" in fields:
+            self._events.emit(PLAYBACK_INFO_CHANGED, session_id)
+        if fields.keys() & {"position", "duration"}:
+            self._events.emit(TIMELINE_CHANGED, session_id)
+        return session
+
+    def apply_step(self, step: dict):
+        step = dict(step)
+        step.pop("at", None)
+        session_id = step.pop("session")
+        if step.pop("closed", False):
+            self.remove_session(session_id)
+        else:
+            self.update(session_id, **step)
+
+    async def replay(self, steps=None, speed=1.0):
+        """Apply timeline steps at their recorded times, speed > 1 replays faster"""
+        steps = steps if steps is not None else self.timeline_steps
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for step in sorted(steps, key=lambda s: s.get("at", 0)):
+            delay = start + step.get("at", 0) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.apply_step(step)
+
+    async def get_sessions(self) -> list:
+        self.calls += 1
+        return list(self.sessions.values())
+
+    def session_id(self, session) -> str:
+        return session.session_id
+
+    def playback_status(self, session) -> str:
+        return session.status
+
+    async def media_properties(self, session) -> Optional[dict]:
+        self.calls += 1
+        return {'title': session.title, 'artist': session.artist, 'album': session.album}
+
+    async def thumbnail_bytes(self, session) -> Optional[bytes]:
+        self.calls += 1
+        return session.thumbnail
+
+    def timeline(self, session) -> Optional[Tuple[float, float]]:
+        return session.position, session.duration
+
+    def timeline_age(self, session) -> float:
+        return time.monotonic() - session.position_at
+
+    def playback_rate(self, session) -> float:
+        return session.rate
+
+    async def _command(self, session, name, *args):
+        self.commands.append((session.session_id, name) + args)
+        latency = self.latency(name) if callable(self.latency) else self.latency
+        if latency:
+            await asyncio.sleep(latency)
+
+    async def play(self, session):
+        await self._command(session, "play")
+        self.update(session.session_id, status=PLAYING)
+
+    async def pause(self, session):
+        await self._command(session, "pause")
+        self.update(session.session_id, status=PAUSED)
+
+    async def next_track(self, session):
+        await self._command(session, "next")
+        self._skip(session, 1)
+
+    async def previous_track(self, session):
+        await self._command(session, "previous")
+        self._skip(session, -1)
+
+    async def seek(self, session, seconds: float):
+        await self._command(session, "seek", seconds)
+        self.update(session.session_id, position=seconds)
+
+    def _skip(self, session, step):
+        if not session.playlist:
+            return
+        session.track_index = (session.track_index + step) % len(session.playlist)
+        self.update(session.session_id, position=0.0, **session.playlist[session.track_index])
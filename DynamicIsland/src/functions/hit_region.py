@@ -0,0 +1,155 @@
+"""Hit-test region of the island window, following the size the animation gives it.
+
+The window is a fixed 500 px overlay, the region decides which part of it takes the
+mouse (and gets drawn). It is the island's rectangle with its rounded bottom corners,
+grown by a margin for the shadow and snapped outwards to a pixel step, so a clip only
+moves it a handful of times instead of on every frame.
+"""
+import math
+from functions.log import get_logger
+
+log = get_logger("hit_region")
+
+WINDOW_WIDTH = 500
+# Snap of the region edges in pixels, bigger means fewer region updates per clip
+STEP = 8
+# Room around the island for part of its shadow, the window draws nothing outside the region
+MARGIN = 6
+# Extra updates a play may issue over the precomputed clip, for the frames blending into it
+BLEND_SLACK = 6
+
+
+class IslandRegion:
+    """Window-relative rectangle whose bottom corners are rounded by radius"""
+    __slots__ = ("left", "top", "right", "bottom", "radius")
+
+    def __init__(self, left, top, right, bottom, radius):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.radius = radius
+
+    @property
+    def bbox(self):
+        return self.left, self.top, self.right, self.bottom
+
+    @property
+    def width(self):
+        return self.right - self.left
+
+    @property
+    def height(self):
+        return self.bottom - self.top
+
+    def __repr__(self):
+        return f"IslandRegion({self.left}, {self.top}, {self.right}, {self.bottom}, radius={self.radius:.1f})"
+
+
+def snap(size, step=STEP, margin=MARGIN):
+    """Snapped (width, height) of the region around an island of size (width, height)"""
+    width, height = size
+    return (math.ceil((width + 2 * margin) / step) * step,
+            math.ceil((height + margin) / step) * step)
+
+
+def island_region(width, height, radius, window_width=WINDOW_WIDTH, step=STEP, margin=MARGIN) -> IslandRegion:
+    """Region of an island of this size, centered at the top of the window like the container"""
+    region_width, region_height = snap((width, height), step, margin)
+    region_width = min(region_width, window_width)
+    left = (window_width - region_width) // 2
+    return IslandRegion(left, 0, left + region_width, region_height,
+                        min(radius + margin, region_width / 2, region_height))
+
+
+class HitRegion:
+    """Pushes the island's region to the native window when its bounding box changes.
+
+    The regions of a clip are precomputed from its rendered frames the first time it
+    plays and cached by snapped size, a frame then costs one lookup. Updates are counted
+    per clip and a play issuing more than its frames predict is logged.
+    """
+
+    def __init__(self, radius, window=None, window_width=WINDOW_WIDTH, step=STEP, margin=MARGIN,
+                 fps=60, frame_duration=0.01):
+        self.radius = radius
+        self.window = window
+        self.window_width = window_width
+        self.step = step
+        self.margin = margin
+        self.fps = fps
+        self.frame_duration = frame_duration
+        self.current = None
+        self.regions = {}
+        self.expected = {}
+        self.frames = 0
+        self.updates = 0
+        self.over_budget = 0
+        self.plays = {}
+        self.calls = {}
+        self._clip = None
+        self._play_calls = 0
+
+    def region(self, width, height) -> IslandRegion:
+        key = snap((width, height), self.step, self.margin)
+        region = self.regions.get(key)
+        if region is None:
+            region = island_region(width, height, self.radius, self.window_width, self.step, self.margin)
+            self.regions[key] = region
+        return region
+
+    def precompute(self, animation_manager, name) -> int:
+        """Cache the regions of every rendered frame of a clip, return how many updates it needs"""
+        if name in self.expected:
+            return self.expected[name]
+        frames = animation_manager.render(name, self.fps, self.frame_duration)
+        changes, previous = 0, None
+        for width, height in frames if frames is not None else ():
+            bbox = self.region(float(width), float(height)).bbox
+            if bbox != previous:
+                changes, previous = changes + 1, bbox
+        self.expected[name] = changes
+        return changes
+
+    def begin(self, clip, animation_manager=None):
+        """Count the following updates against clip, precomputing its regions when new"""
+        if animation_manager is not None:
+            self.precompute(animation_manager, clip)
+        self._clip = clip
+        self._play_calls = 0
+        self.plays[clip] = self.plays.get(clip, 0) + 1
+
+    def attach(self, window):
+        """Hand over the native window and give it the current region right away"""
+        self.window = window
+        if window is not None and self.current is not None:
+            window.set_region(self.current)
+
+    def update(self, width, height) -> bool:
+        """Follow one frame, True when the window got a new region"""
+        self.frames += 1
+        region = self.region(width, height)
+        if self.current is not None and region.bbox == self.current.bbox:
+            return False
+        self.current = region
+        self.updates += 1
+        clip = self._clip or "idle"
+        self.calls[clip] = self.calls.get(clip, 0) + 1
+        self._play_calls += 1
+        budget = self.expected.get(clip)
+        if budget is not None and self._play_calls == budget + BLEND_SLACK + 1:
+            self.over_budget += 1
+            log.warning("region_churn", clip=clip, calls=self._play_calls, expected=budget)
+        if self.window is not None:
+            self.window.set_region(region)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'region_updates': self.updates,
+            'over_budget': self.over_budget,
+            'regions_cached': len(self.regions),
+            'calls_per_clip': dict(self.calls),
+            'plays_per_clip': dict(self.plays),
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageFilter
+from functions.color_analysis import analyze_colors
+from functions.cover_cache import CoverArt, CoverCache, cover_key
+from functions.cover_store import CoverStore
+from functions.instrumentation import tracer
+
+DISPLAY_MAX_SIZE = 640
+THUMBNAIL_SIZE = 80  # 40 px island cover at 2x
+BACKDROP_SIZE = 32
+BACKDROP_CROP = 0.3
+
+
+def _encode_jpeg(image: Image.Image) -> bytes:
+    byte_array = io.BytesIO()
+    image.save(byte_array, format="JPEG")
+    return byte_array.getvalue()
+
+
+def make_backdrop(image: Image.Image, size=BACKDROP_SIZE, crop=BACKDROP_CROP) -> Image.Image:
+    """Blurred center of the cover, what the live 10x scale + 50 sigma blur used to show.
+
+    Kept tiny on purpose: the client upscales it smoothly for free.
+    """
+    width, height = image.size
+    box = (width * (1 - crop) / 2, height * (1 - crop) / 2, width * (1 + crop) / 2, height * (1 + crop) / 2)
+    backdrop = image.resize((size, size), Image.BILINEAR, box=box)
+    return backdrop.filter(ImageFilter.GaussianBlur(size / 10))
+
+
+def store_cover(cover: CoverArt, store: CoverStore) -> CoverArt:
+    """Write the cover JPEGs to the store and point src/thumbnail_src at them"""
+    cover.src = store.store(f"{cover.key}.jpg", cover.jpeg)
+    cover.thumbnail_src = store.store(f"{cover.key}_thumb.jpg", cover.thumbnail_jpeg)
+    if cover.backdrop_jpeg:
+        cover.backdrop_src = store.store(f"{cover.key}_backdrop.jpg", cover.backdrop_jpeg)
+    return cover
+
+
+@tracer.traced("image.process_cover", "image")
+def process_cover(data: bytes, key: str = None, thumbnail_size=THUMBNAIL_SIZE, store: CoverStore = None) -> CoverArt:
+    """Decode a thumbnail and build every derived image; runs on a worker thread"""
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (DISPLAY_MAX_SIZE, DISPLAY_MAX_SIZE))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    if max(image.size) > DISPLAY_MAX_SIZE:
+        image.thumbnail((DISPLAY_MAX_SIZE, DISPLAY_MAX_SIZE))
+    jpeg = _encode_jpeg(image)
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_size, thumbnail_size))
+    colors = analyze_colors(thumbnail)
+
+    cover = CoverArt(
+        key or cover_key(data),
+        jpeg,
+        thumbnail_jpeg=_encode_jpeg(thumbnail),
+        contrast_color=colors.contrast_color,
+        palette=colors.palette,
+        backdrop_jpeg=_encode_jpeg(make_backdrop(image)),
+    )
+    return store_cover(cover, store) if store is not None else cover
+
+
+class ImagePipeline:
+    """Processes cover art on a bounded thread pool so PIL never blocks the UI loop"""
+
+    def __init__(self, cache: CoverCache = None, max_workers=2, thumbnail_size=THUMBNAIL_SIZE,
+                 store: CoverStore = None):
+        self.cache = cache if cache is not None else CoverCache()
+        self.store = store
+        self.thumbnail_size = thumbnail_size
+        self.processed = 0
+        self.stale = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cover")
+        self._generation = 0
+        self._pending = None
+
+    async def process(self, data: bytes):
+        """Return the CoverArt for raw thumbnail bytes.
+
+        Returns None when a newer cover was submitted before this one finished.
+        """
+        key = cover_key(data)
+        entry = self.cache.get(key)
+        loop = asyncio.get_running_loop()
+        if entry is not None:
+            if self.store is not None and f"{key}.jpg" not in self.store:
+                # The file was evicted from disk while the cover stayed in memory
+                await loop.run_in_executor(self._executor, store_cover, entry, self.store)
+            return entry
+
+        self._generation += 1
+        generation = self._generation
+        if self._pending is not None and not self._pending.done():
+            # Drops the older job if it has not started yet, a running one still finishes
+            # into the cache and only its result is discarded below
+            self._pending.cancel()
+
+        job = self._executor.submit(process_cover, data, key, self.thumbnail_size, self.store)
+        self._pending = job
+        future = asyncio.wrap_future(job, loop=loop)
+        try:
+            with tracer.span("image.pipeline_wait", "image"):
+                entry = await future
+        except asyncio.CancelledError:
+            if future.cancelled() and generation != self._generation:
+                self.stale += 1
+                return None
+            raise
+
+        self.processed += 1
+        self.cache.put(entry)
+        if generation != self._generation:
+            self.stale += 1
+            return None
+        return entry
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,206 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Upper bounds in milliseconds, 16.7 is one frame at 60 fps
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 16.7, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, float("inf"))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def percentile(self, q) -> float:
+        """Upper bound of the bucket holding the q-th percentile, capped at the max seen"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'min_ms': self.min if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max,
+        }
+
+
+class _NullSpan:
+    """What span() returns while tracing is off: entering and leaving it does nothing"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.category, self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Spans, histograms and a rolling Chrome trace of the island runtime.
+
+    Disabled by default: span() then hands back a shared no-op object. Entering
+    even that costs a few hundred nanoseconds, so per-frame paths time themselves
+    only when ``enabled`` and hand the start to complete(). Enabled, every span
+    feeds a histogram and the last ``capacity`` spans are kept for
+    export_chrome_trace(), which chrome://tracing and Perfetto open.
+    """
+
+    def __init__(self, enabled=False, capacity=50_000):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+        self.histograms = {}
+        self.path = None
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def enable(self, path=None, capacity=None):
+        """Start recording; with a path the trace is written there when the process exits"""
+        if capacity:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+        if path and self.path is None:
+            atexit.register(self.dump)
+        self.path = path or self.path
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, category="island", args=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def traced(self, name=None, category="island"):
+        """Decorator putting a span around every call of a function or coroutine"""
+        def decorate(func):
+            span_name = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, category):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, ms, category="island"):
+        """Add a measured value such as a frame interval to a histogram and the trace as a counter"""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        with self._lock:
+            self._histogram(name).add(ms)
+            self.events.append({
+                'name': name, 'cat': category, 'ph': "C", 'ts': (now - self._origin) / 1000,
+                'pid': self._pid, 'tid': threading.get_ident(), 'args': {'ms': round(ms, 3)},
+            })
+
+    def complete(self, name, category, start, args=None):
+        """Record a span that began at start, a time.perf_counter_ns() value, and ends now"""
+        end = time.perf_counter_ns()
+        duration = end - start
+        event = {
+            'name': name, 'cat': category, 'ph': "X",
+            'ts': (start - self._origin) / 1000, 'dur': duration / 1000,
+            'pid': self._pid, 'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._histogram(name).add(duration / 1_000_000)
+            self.events.append(event)
+
+    def _histogram(self, name) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export_chrome_trace(self, path) -> str:
+        """Write the recorded spans as Chrome trace JSON, atomically"""
+        with self._lock:
+            events = list(self.events)
+            summary = {name: histogram.summary() for name, histogram in self.histograms.items()}
+        trace = {'traceEvents': events, 'displayTimeUnit': "ms", 'otherData': {'histograms': summary}}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(trace, file)
+        os.replace(tmp_path, path)
+        return path
+
+    def dump(self):
+        """Write the rolling trace to the configured path, if any"""
+        if self.path:
+            self.export_chrome_trace(self.path)
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.histograms = {}
+
+
+# Set DYNAMIC_ISLAND_TRACE to a file path to record a trace of the whole run
+tracer = Tracer()
+if os.environ.get("DYNAMIC_ISLAND_TRACE"):
+    tracer.enable(os.environ["DYNAMIC_ISLAND_TRACE"])
@@ -0,0 +1,274 @@
+import asyncio
+from collections import deque
+from functions.log import get_logger
+
+log = get_logger("island_state")
+
+# Island modes
+COLLAPSED = "collapsed"
+HOVERED = "hovered"
+MEDIA = "media"
+MEDIA_HOVERED = "media_hovered"
+TRANSITIONING = "transitioning"
+# A notification over the collapsed island, or over the media controls it returns to
+NOTIFICATION = "notification"
+MEDIA_NOTIFICATION = "media_notification"
+NOTIFICATION_MODES = (NOTIFICATION, MEDIA_NOTIFICATION)
+
+# Events
+HOVER_ENTER = "hover_enter"
+HOVER_EXIT = "hover_exit"
+CLICK = "click"
+TRACK = "track"
+# The track of another session, swapped in place when the media controls are up
+SWITCH = "switch"
+CLEAR = "clear"
+NOTIFY = "notify"
+DISMISS = "dismiss"
+
+# Events about what is playing, only the latest one of a burst matters
+MEDIA_EVENTS = (TRACK, SWITCH, CLEAR)
+# Events from the notification center, likewise only the latest one matters
+NOTIFICATION_EVENTS = (NOTIFY, DISMISS)
+# Events from the pointer, likewise only the latest one matters
+POINTER_EVENTS = (HOVER_ENTER, HOVER_EXIT, CLICK)
+
+
+class Transition:
+    """Target mode of a (mode, event) pair and the action that animates it.
+
+    An interruptible action is cancelled as soon as a queued event has a transition
+    from its target mode, the others only give way to media events, and not even to
+    those when they lead to a notification.
+    """
+    __slots__ = ("target", "action", "interruptible")
+
+    def __init__(self, target, action, interruptible=False):
+        self.target = target
+        self.action = action
+        self.interruptible = interruptible
+
+
+TRANSITIONS = {
+    (COLLAPSED, HOVER_ENTER): Transition(HOVERED, "callback", interruptible=True),
+    (HOVERED, HOVER_EXIT): Transition(COLLAPSED, "close", interruptible=True),
+    (HOVERED, CLICK): Transition(COLLAPSED, "close", interruptible=True),
+    (MEDIA, HOVER_ENTER): Transition(MEDIA_HOVERED, "side_hovered", interruptible=True),
+    (MEDIA_HOVERED, HOVER_EXIT): Transition(MEDIA, "side_unhovered", interruptible=True),
+    (MEDIA_HOVERED, CLICK): Transition(MEDIA, "side_unhovered", interruptible=True),
+    **{(mode, TRACK): Transition(MEDIA, "show_track") for mode in (COLLAPSED, HOVERED, MEDIA, MEDIA_HOVERED)},
+    **{(mode, SWITCH): Transition(MEDIA, "show_track") for mode in (COLLAPSED, HOVERED)},
+    **{(mode, SWITCH): Transition(mode, "swap_track") for mode in (MEDIA, MEDIA_HOVERED)},
+    **{(mode, CLEAR): Transition(COLLAPSED, "reset") for mode in (HOVERED, MEDIA, MEDIA_HOVERED)},
+    # Notifications cover the media controls, a track arriving meanwhile waits under them
+    **{(mode, NOTIFY): Transition(NOTIFICATION, "show_notification") for mode in (COLLAPSED, HOVERED)},
+    **{(mode, NOTIFY): Transition(MEDIA_NOTIFICATION, "show_notification") for mode in (MEDIA, MEDIA_HOVERED)},
+    **{(mode, NOTIFY): Transition(mode, "update_notification") for mode in NOTIFICATION_MODES},
+    **{(mode, event): Transition(MEDIA_NOTIFICATION, "hold_track")
+       for mode in NOTIFICATION_MODES for event in (TRACK, SWITCH)},
+    (MEDIA_NOTIFICATION, CLEAR): Transition(NOTIFICATION, "drop_track"),
+    **{(NOTIFICATION, event): Transition(COLLAPSED, "hide_notification") for event in (DISMISS, CLICK)},
+    **{(MEDIA_NOTIFICATION, event): Transition(MEDIA, "restore_media") for event in (DISMISS, CLICK)},
+}
+
+
+def coalesce(events: list) -> list:
+    """Reduce a burst of queued (event, payload, future) entries to the ones worth running.
+
+    Keeps the latest media event, the latest notification event and then the latest
+    pointer event, each applies to the mode the one before leads to. Futures of dropped
+    entries resolve False.
+    """
+    media = notification = pointer = None
+    for entry in events:
+        if entry[0] in MEDIA_EVENTS:
+            dropped, media = media, entry
+        elif entry[0] in NOTIFICATION_EVENTS:
+            dropped, notification = notification, entry
+        else:
+            dropped, pointer = pointer, entry
+        if dropped is not None:
+            _resolve(dropped[2], False)
+    return [entry for entry in (media, notification, pointer) if entry is not None]
+
+
+def _resolve(future, applied):
+    if future is not None and not future.done():
+        future.set_result(applied)
+
+
+class IslandStateMachine:
+    """Mode of the island, driven by one consumer task reading an event queue.
+
+    post() only queues, the consumer drains the queue after coalesce_window, coalesces
+    redundant events and looks each one up in the transition table. A transition runs exactly one action,
+    an awaitable from actions keyed by Transition.action, while the mode reads
+    TRANSITIONING. Events without a transition from the current mode are ignored.
+    Nothing here touches Flet, the actions are the only link to the UI.
+    """
+
+    def __init__(self, actions: dict, table=None, initial=COLLAPSED, on_interrupt=None,
+                 coalesce_window=1 / 60, history=64):
+        self.actions = actions
+        self.coalesce_window = coalesce_window
+        self.table = TRANSITIONS if table is None else table
+        self.mode = initial
+        self.target = initial
+        self.on_interrupt = on_interrupt
+        self.history = deque(maxlen=history)
+        self.posted = 0
+        self.coalesced = 0
+        self.ignored = 0
+        self.applied = 0
+        self.interrupted = 0
+        self.failed = 0
+        self._queue = []
+        self._wake = None
+        self._consumer = None
+        self._action = None
+        self._action_event = None
+
+    @property
+    def settled(self):
+        return not self._queue and (self._consumer is None or self._consumer.done())
+
+    @property
+    def hovered(self):
+        return self.target in (HOVERED, MEDIA_HOVERED)
+
+    @property
+    def showing_media(self):
+        return self.target in (MEDIA, MEDIA_HOVERED)
+
+    @property
+    def showing_notification(self):
+        return self.target in NOTIFICATION_MODES
+
+    def post(self, event, payload=None) -> asyncio.Future:
+        """Queue an event, the future resolves True once it ran and False when it was dropped.
+
+        Cancelling the future withdraws the event if it has not started yet.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.posted += 1
+        self._queue.append((event, payload, future))
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        self._wake.set()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = loop.create_task(self._consume())
+        return future
+
+    def restore(self, mode):
+        """Start from a mode shown without a transition, e.g. restored from a snapshot"""
+        if self.settled and mode != TRANSITIONING:
+            self.mode = self.target = mode
+
+    def interrupt(self, event=None):
+        """Cancel the running action, only when it was started by event if one is given"""
+        if self._action is not None and not self._action.done() and event in (None, self._action_event):
+            self._action.cancel()
+            self.interrupted += 1
+            if self.on_interrupt:
+                self.on_interrupt()
+
+    def stop(self):
+        """Cancel the consumer and the running action, queued events are dropped"""
+        for _, _, future in self._queue:
+            _resolve(future, False)
+        self._queue.clear()
+        if self._consumer is not None:
+            self._consumer.cancel()
+
+    async def settle(self):
+        """Wait until the queue is empty and no action runs"""
+        while not self.settled:
+            await asyncio.sleep(0.005)
+
+    async def _consume(self):
+        try:
+            while self._queue:
+                if self.coalesce_window:
+                    # Let a burst (pointer jitter on the island edge, skips) land in one batch
+                    await asyncio.sleep(self.coalesce_window)
+                self._wake.clear()
+                batch, self._queue = self._queue, []
+                entries = coalesce(batch)
+                self.coalesced += len(batch) - len(entries)
+                for index, entry in enumerate(entries):
+                    if self._queue and any(kind in MEDIA_EVENTS for kind, _, _ in self._queue):
+                        # Newer media events arrived while this batch ran, regroup with them
+                        self._queue[:0] = entries[index:]
+                        break
+                    await self._apply(*entry)
+        finally:
+            if self._action is not None and not self._action.done():
+                self._action.cancel()
+
+    async def _apply(self, event, payload, future):
+        if future is not None and future.cancelled():
+            # The poster stopped waiting for it, e.g. a superseded track
+            self.ignored += 1
+            return
+        transition = self.table.get((self.mode, event))
+        if transition is None:
+            self.ignored += 1
+            _resolve(future, False)
+            return
+        source = self.mode
+        self.mode, self.target = TRANSITIONING, transition.target
+        action = self.actions.get(transition.action)
+        completed = True
+        if action is not None:
+            self._action_event = event
+            completed = await self._run(action(payload), transition)
+        self.mode = transition.target
+        self.applied += 1
+        self.history.append((source, event, transition.target))
+        _resolve(future, completed)
+
+    async def _run(self, awaitable, transition) -> bool:
+        """Await an action, cancelling it when a queued event supersedes it"""
+        self._action = asyncio.ensure_future(awaitable)
+        try:
+            while not self._action.done():
+                woken = asyncio.ensure_future(self._wake.wait())
+                try:
+                    await asyncio.wait([self._action, woken], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    woken.cancel()
+                self._wake.clear()
+                if self._supersedes(transition):
+                    self.interrupt()
+            await self._action
+            return True
+        except asyncio.CancelledError:
+            if not self._action.cancelled():
+                raise
+            return False
+        except Exception:
+            self.failed += 1
+            log.exception("island_action_failed", action=transition.action)
+            return False
+        finally:
+            self._action = self._action_event = None
+
+    def _supersedes(self, transition) -> bool:
+        for event, _, _ in self._queue:
+            if event in MEDIA_EVENTS and transition.target not in NOTIFICATION_MODES:
+                return True
+            if transition.interruptible and (transition.target, event) in self.table:
+                return True
+        return False
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'posted': self.posted,
+            'coalesced': self.coalesced,
+            'ignored': self.ignored,
+            'applied': self.applied,
+            'interrupted': self.interrupted,
+            'failed': self.failed,
+        }
@@ -0,0 +1,35 @@
+import sys
+from functions.log import get_logger
+
+log = get_logger("island_window")
+
+
+class IslandWindow:
+    """Native window of the island, used for what Flet cannot do itself.
+
+    This base class is also the adapter for platforms without a native implementation,
+    where every call does nothing.
+    """
+
+    name = "none"
+
+    def screen_width(self):
+        """Width of the primary screen in pixels, None when unknown"""
+        return None
+
+    def apply_overlay_style(self):
+        """Make the window a topmost overlay that never takes focus or shows in the taskbar"""
+
+    def set_region(self, region):
+        """Restrict input and drawing to an IslandRegion"""
+
+
+def native_window(hwnd) -> IslandWindow:
+    """Pick the window adapter for the running platform"""
+    try:
+        if sys.platform == "win32" and hwnd:
+            from functions.win32_window import Win32IslandWindow
+            return Win32IslandWindow(hwnd)
+    except ImportError as e:
+        log.warning("island_window_unavailable", error=str(e))
+    return IslandWindow()
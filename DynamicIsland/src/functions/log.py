@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+import time
+
+LOGGER_ROOT = "dynamic_island"
+
+
+class StructuredFormatter(logging.Formatter):
+    """``time level logger event key=value ...`` lines, or JSON lines with json=True"""
+
+    def __init__(self, json_lines=False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record) -> str:
+        fields = getattr(record, "fields", {})
+        if self.json_lines:
+            entry = {'ts': record.created, 'level': record.levelname, 'logger': record.name,
+                     'event': record.getMessage(), **fields}
+            if record.exc_info:
+                entry['exc'] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+        stamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        line = f"{stamp}.{int(record.msecs):03d} {record.levelname:7} {record.name} {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class StructuredLogger:
+    """Logger taking an event name plus keyword fields: ``log.info("session_changed", previous=a, current=b)``"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def _log(self, level, event, fields, exc_info=False):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, event, exc_info=exc_info, extra={'fields': fields})
+
+    def debug(self, event, **fields):
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event, **fields):
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event, **fields):
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event, **fields):
+        self._log(logging.ERROR, event, fields)
+
+    def exception(self, event, **fields):
+        self._log(logging.ERROR, event, fields, exc_info=True)
+
+
+def get_logger(name) -> StructuredLogger:
+    return StructuredLogger(logging.getLogger(f"{LOGGER_ROOT}.{name}"))
+
+
+def configure_logging(level=None, json_lines=None):
+    """Attach the structured handler to the app's root logger.
+
+    DYNAMIC_ISLAND_LOG_LEVEL and DYNAMIC_ISLAND_LOG_JSON=1 override the defaults.
+    """
+    level = level or os.environ.get("DYNAMIC_ISLAND_LOG_LEVEL", "INFO")
+    if json_lines is None:
+        json_lines = os.environ.get("DYNAMIC_ISLAND_LOG_JSON") == "1"
+    root = logging.getLogger(LOGGER_ROOT)
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter(json_lines))
+    root.handlers = [handler]
+    root.setLevel(level)
+    root.propagate = False
+    return root
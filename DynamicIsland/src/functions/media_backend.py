@@ -0,0 +1,140 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+from functions.media_events import MediaEventSource
+from functions.log import get_logger
+
+log = get_logger("media_backend")
+
+# Playback status names shared by every backend, same spelling as the WinRT enum
+CLOSED = "CLOSED"
+OPENED = "OPENED"
+CHANGING = "CHANGING"
+STOPPED = "STOPPED"
+PLAYING = "PLAYING"
+PAUSED = "PAUSED"
+
+
+class MediaBackend(ABC):
+    """Platform media API used by MediaPlayerController.
+
+    Sessions are opaque handles owned by the backend. Accessors that the monitor
+    loop calls for every session are synchronous, anything that may hit IPC is async.
+    """
+
+    name = "base"
+
+    def events(self) -> MediaEventSource:
+        """Push event source for this backend"""
+        if not hasattr(self, "_events"):
+            self._events = MediaEventSource()
+        return self._events
+
+    @abstractmethod
+    async def get_sessions(self) -> list:
+        """All sessions currently exposed by the platform"""
+
+    def is_disconnect(self, error: Exception) -> bool:
+        """True when error means the connection to the platform media service is gone"""
+        return False
+
+    async def reconnect(self):
+        """Drop cached platform handles so the next call acquires them again"""
+
+    @abstractmethod
+    def session_id(self, session) -> str:
+        """Stable identifier of the app that owns the session"""
+
+    @abstractmethod
+    def playback_status(self, session) -> str:
+        """One of the status names above"""
+
+    @abstractmethod
+    async def media_properties(self, session) -> Optional[dict]:
+        """Dict with 'title', 'artist' and 'album', or None while the player has none"""
+
+    async def thumbnail_bytes(self, session) -> Optional[bytes]:
+        """Raw encoded cover image as provided by the player"""
+        return None
+
+    def timeline(self, session) -> Optional[Tuple[float, float]]:
+        """Position and duration in seconds"""
+        return None
+
+    def timeline_age(self, session) -> float:
+        """Seconds since the player measured the position timeline() reports"""
+        return 0.0
+
+    def playback_rate(self, session) -> float:
+        """Playback speed, 1.0 at normal speed"""
+        return 1.0
+
+    def session_volume(self, session) -> Optional[float]:
+        return None
+
+    @abstractmethod
+    async def play(self, session):
+        """Send the transport command to the session's player"""
+
+    @abstractmethod
+    async def pause(self, session):
+        """Send the transport command to the session's player"""
+
+    @abstractmethod
+    async def next_track(self, session):
+        """Send the transport command to the session's player"""
+
+    @abstractmethod
+    async def previous_track(self, session):
+        """Send the transport command to the session's player"""
+
+    @abstractmethod
+    async def seek(self, session, seconds: float):
+        """Send the transport command to the session's player"""
+
+
+class NullMediaBackend(MediaBackend):
+    """Backend of platforms without media support: no sessions, commands do nothing"""
+
+    name = "none"
+
+    async def get_sessions(self) -> list:
+        return []
+
+    def session_id(self, session) -> Optional[str]:
+        return None
+
+    def playback_status(self, session) -> Optional[str]:
+        return None
+
+    async def media_properties(self, session) -> Optional[dict]:
+        return None
+
+    async def play(self, session):
+        pass
+
+    async def pause(self, session):
+        pass
+
+    async def next_track(self, session):
+        pass
+
+    async def previous_track(self, session):
+        pass
+
+    async def seek(self, session, seconds: float):
+        pass
+
+
+def default_backend() -> MediaBackend:
+    """Pick the media backend for the running platform"""
+    try:
+        if sys.platform == "win32":
+            from functions.winrt_backend import WinRTMediaBackend
+            return WinRTMediaBackend()
+        if sys.platform.startswith("linux"):
+            from functions.mpris_backend import MprisMediaBackend
+            return MprisMediaBackend()
+    except ImportError as e:
+        log.warning("media_backend_unavailable", error=str(e))
+    return NullMediaBackend()
@@ -1,219 +1,324 @@
-import base64
-import json
-import os
-from winrt.windows.media.control import (
-    GlobalSystemMediaTransportControlsSessionManager as SessionManager,
-    GlobalSystemMediaTransportControlsSessionPlaybackStatus
-)
-from winrt.windows.storage.streams import Buffer, InputStreamOptions
-import asyncio
-from PIL import Image
-import io
-from datetime import timedelta
+import time
 from typing import Optional, Tuple
+from functions.cover_cache import CoverArt, CoverCache
+from functions.cover_store import CoverStore
+from functions.image_pipeline import ImagePipeline
+from functions.media_backend import MediaBackend, PLAYING, default_backend
+from functions.media_events import (
+    MediaEventSource, MediaChangeWatcher, SESSIONS_CHANGED, MEDIA_PROPERTIES_CHANGED, TIMELINE_CHANGED
+)
+from functions.track_state import TrackState, TrackChanges, IDENTITY, PLAYBACK, POSITION
+from functions.adaptive_interval import AdaptiveInterval
+from functions.session_registry import SessionRegistry
+from functions.session_store import SessionStore
+from functions.playback_timeline import PlaybackTimeline
+from functions.transport_queue import TransportQueue, PLAY, PAUSE, NEXT, PREVIOUS, SEEK
+from functions.instrumentation import tracer
+from functions.log import get_logger
+
+log = get_logger("media")
 
 
 class MediaPlayerController:
-    def __init__(self):
+    def __init__(self, backend: MediaBackend = None, event_source: MediaEventSource = None):
+        self.backend = backend or default_backend()
         self.session = None
-        self.all_sessions = []
+        self.sessions = SessionRegistry(self.backend)
+        self.store = SessionStore()
+        self.event_source = event_source or self.backend.events()
+        self.cover_cache = CoverCache()
+        self.cover_store = CoverStore()
+        self.image_pipeline = ImagePipeline(self.cover_cache, store=self.cover_store)
+        self.watcher = None
+        self.poll_interval = None
+        self.changes = TrackChanges()
+        self.timeline = PlaybackTimeline()
+        self.transport = TransportQueue(self.send_command)
+        self.empty = False
+        self._user_activity = False
     
-    async def initialize(self):
-        try:
-            manager = await SessionManager.request_async()
-            self.all_sessions = manager.get_sessions()
-            if self.all_sessions and self.all_sessions.size > 0:
-                self.session = await self.get_best_session()
-                return True
-            return False
-        except:
-            return False
+    @property
+    def all_sessions(self) -> list:
+        return self.sessions.sessions
+
+    async def initialize(self, kinds=(), full=True, session_ids=()):
+        """Refresh the session table and pick the active session, False when there is none"""
+        await self.sessions.refresh(kinds, full, session_ids)
+        self.session = self.sessions.best_session
+        return self.session is not None
     
     async def get_best_session(self):
-        if not self.all_sessions:
-            return None
-            
-        playing_sessions = []
-        paused_sessions = []
-        
-        for session in self.all_sessions:
-            try:
-                status = session.get_playback_info().playback_status
-                if status == GlobalSystemMediaTransportControlsSessionPlaybackStatus.PLAYING:
-                    playing_sessions.append(session)
-                else:
-                    paused_sessions.append(session)
-            except:
-                continue
-        
-        # Prioritize playing sessions
-        if playing_sessions:
-            return playing_sessions[0]
-            
-        # Keep current if exists
-        if self.session:
-            current_id = self.session.source_app_user_model_id
-            for session in self.all_sessions:
-                if session.source_app_user_model_id == current_id:
-                    return self.session
-        
-        return paused_sessions[0] if paused_sessions else self.all_sessions[0]
+        return self.sessions.best_session
 
-    async def get_current_track_info(self) -> Optional[dict]:
-        if not self.session:
+    async def get_track_state(self, refresh_cover=True, session=None) -> Optional[TrackState]:
+        """Snapshot of a session, the active one by default.
+
+        With refresh_cover False the cover of the stored state is reused while the
+        session, title, artist and album stay the same.
+        """
+        session = session or self.session
+        if not session:
             return None
         try:
-            info = await self.session.try_get_media_properties_async()
+            with tracer.span("backend.media_properties", "backend"):
+                info = await self.backend.media_properties(session)
             if not info:
                 return None
-            timeline = self.session.get_timeline_properties()
-            return {
-                'title': info.title or "Unknown",
-                'artist': info.artist or "Unknown",
-                'album': info.album_title or "Unknown",
-                'position': self._format_timedelta(timeline.position),
-                'duration': self._format_timedelta(timeline.end_time),
-                'playback_status': self.session.get_playback_info().playback_status.name,
-                'session_id': self.session.source_app_user_model_id
-            }
+            position, duration = self.backend.timeline(session) or (0.0, 0.0)
+            position_at = time.monotonic() - self.backend.timeline_age(session)
+            session_id = self.backend.session_id(session)
+            last = self.store.get(session_id)
+            if (not refresh_cover and last is not None and
+                    last.media_key == (session_id, info['title'], info['artist'], info['album'])):
+                cover = last.cover
+            else:
+                cover = await self.get_current_cover(session)
+            return TrackState(
+                session_id, info['title'], info['artist'], info['album'], cover,
+                self.backend.playback_status(session), position, duration,
+                self.backend.playback_rate(session), position_at
+            )
         except:
             return None
 
-    async def get_current_cover_base64(self) -> Optional[str]:
-        if not self.session:
+    async def refresh_sessions(self, session_ids, refresh_cover_ids=()):
+        """Re-read the given sessions into the session store, other sessions are left alone"""
+        for session_id in session_ids:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                continue
+            state = await self.get_track_state(session_id in refresh_cover_ids, entry.session)
+            if state is None:
+                self.store.discard(session_id)
+            else:
+                self.store.update(state)
+
+    def select_session(self, session_id) -> bool:
+        """Show another session on the island, None goes back to following the playing one"""
+        if not self.sessions.pin(session_id):
+            return False
+        self.poke()
+        return True
+
+    async def get_current_track_info(self) -> Optional[dict]:
+        state = await self.get_track_state(refresh_cover=False)
+        return state.as_dict() if state else None
+
+    async def read_thumbnail_bytes(self, session=None) -> Optional[bytes]:
+        session = session or self.session
+        if not session:
             return None
         try:
-            media_info = await self.session.try_get_media_properties_async()
-            if not media_info or not media_info.thumbnail:
-                return None
-            stream = await media_info.thumbnail.open_read_async()
-            buffer = Buffer(stream.size)
-            await stream.read_async(buffer, stream.size, InputStreamOptions.READ_AHEAD)
-            data = bytes(buffer)
-            stream.close()
-            image = Image.open(io.BytesIO(data))
-            if image.mode == "RGBA":
-                image = image.convert("RGB")
-            byte_array = io.BytesIO()
-            image.save(byte_array, format="JPEG")
-            return base64.b64encode(byte_array.getvalue()).decode('utf-8')
+            with tracer.span("backend.thumbnail_bytes", "backend"):
+                return await self.backend.thumbnail_bytes(session)
         except:
             return None
-    
-    def _format_timedelta(self, td: timedelta) -> str:
-        total_seconds = int(td.total_seconds())
-        minutes, seconds = divmod(total_seconds, 60)
-        return f"{minutes:02d}:{seconds:02d}"
+
+    async def get_current_cover(self, session=None) -> Optional[CoverArt]:
+        data = await self.read_thumbnail_bytes(session)
+        if not data:
+            return None
+        try:
+            return await self.image_pipeline.process(data)
+        except Exception:
+            log.exception("cover_processing_failed")
+            return None
+
+    def poke(self):
+        """User interaction: poll fast again and re-read the session right away"""
+        self._user_activity = True
+        if self.poll_interval is not None:
+            self.poll_interval.activity()
+        if self.watcher is not None:
+            self.watcher.wake()
+
+    async def send_command(self, command, *args):
+        """Run one transport command on the active session, called by the transport queue"""
+        if not self.session:
+            return
+        if command == PLAY:
+            await self.backend.play(self.session)
+        elif command == PAUSE:
+            await self.backend.pause(self.session)
+        elif command == NEXT:
+            await self.backend.next_track(self.session)
+        elif command == PREVIOUS:
+            await self.backend.previous_track(self.session)
+        elif command == SEEK:
+            await self.backend.seek(self.session, *args)
+        self.poke()
 
     async def play(self):
-        if self.session:
-            await self.session.try_play_async()
+        await self.transport.play()
 
     async def pause(self):
-        if self.session:
-            await self.session.try_pause_async()
+        await self.transport.pause()
 
     async def toggle_play_pause(self):
-        if self.session:
-            status = self.session.get_playback_info().playback_status
-            if status == GlobalSystemMediaTransportControlsSessionPlaybackStatus.PLAYING:
-                await self.pause()
-            else:
-                await self.play()
+        playing = self.transport.playing
+        if playing is None:
+            playing = self.session is not None and self.backend.playback_status(self.session) == PLAYING
+        if playing:
+            await self.pause()
+        else:
+            await self.play()
 
     async def next_track(self):
-        if self.session:
-            await self.session.try_skip_next_async()
+        await self.transport.next()
 
     async def previous_track(self):
-        if self.session:
-            await self.session.try_skip_previous_async()
+        await self.transport.previous()
 
     async def get_timeline(self) -> Optional[Tuple[float, float]]:
         if not self.session:
             return None
-        timeline = self.session.get_timeline_properties()
-        return timeline.position.total_seconds(), timeline.end_time.total_seconds()
+        return self.backend.timeline(self.session)
 
     async def set_position(self, seconds: float):
         if self.session:
-            await self.session.try_change_playback_position_async(int(seconds * 10_000_000))
-            
+            self.timeline.seek(seconds)
+            await self.transport.seek(seconds)
+
+    def subscribe(self, channel, callback):
+        """Wake callback(state, previous) only on changes of one channel: IDENTITY, PLAYBACK or POSITION"""
+        return self.changes.subscribe(channel, callback)
+
     async def monitor_track_changes(self, change_callback=None, position_callback=None, 
-                               playback_state_callback=None, on_nothing=None, interval=0.1):
-        if not await self.initialize():
-            if on_nothing:
-                await on_nothing()
-        else:
-            if self.session:
-                current_track = await self.get_current_track_info()
-                current_cover = await self.get_current_cover_base64()
-                if current_track and change_callback:
-                    await change_callback(current_track, current_cover)
-                if current_track and playback_state_callback:
-                    await playback_state_callback(current_track['playback_status'] == 'PLAYING')
-        
-        last_track = None
-        last_session_id = None
-        last_playback_state = None
-        last_cover = None
+                               playback_state_callback=None, on_nothing=None, interval=0.1,
+                               fallback_interval=2.0, max_interval=8.0, sessions_callback=None,
+                               timeline_callback=None):
+        """Watch the media sessions and dispatch callbacks on real transitions.
+
+        Wakes on session events pushed by ``event_source``; ``fallback_interval`` is the
+        safety poll while events are live, ``interval`` is used when they are not.
+        While paused, idle or without a session the sleep backs off up to ``max_interval``.
+        ``on_nothing`` fires once per transition into the empty state.
+
+        Every session is kept in ``store`` and only sessions named by events are
+        re-read, so switching the active session needs no fetch and no reset. The
+        info passed to ``change_callback(info, cover)`` has ``switched`` set when the
+        track comes from another session than the one shown before.
+        ``sessions_callback(states, active_id)`` fires when the session list changes.
+
+        The playback position is extrapolated by ``timeline``, ``timeline_callback(timeline)``
+        fires only when it had to resync: timeline events, a new track or playback state,
+        or drift past its threshold.
+
+        Play states reach ``playback_state_callback`` through ``transport``, which keeps
+        showing a clicked state until the player confirms it and reverts it otherwise.
+        """
+        async def on_identity(state, previous):
+            self.transport.track_changed()
+            if change_callback:
+                info = state.as_dict()
+                info['switched'] = previous is not None and previous.session_id != state.session_id
+                await change_callback(info, state.cover)
+        self.subscribe(IDENTITY, on_identity)
+
+        async def on_playback(state, previous):
+            playing = self.transport.confirm(state.is_playing)
+            if playback_state_callback:
+                await playback_state_callback(playing)
+        self.subscribe(PLAYBACK, on_playback)
+        self.transport.on_state = playback_state_callback
+        if position_callback:
+            async def on_position(state, previous):
+                await position_callback(state.position, state.duration)
+            self.subscribe(POSITION, on_position)
+
+        watcher = self.watcher = MediaChangeWatcher(self.event_source)
+        minimum = fallback_interval if await watcher.start() else interval
+        poll = self.poll_interval = AdaptiveInterval(minimum, max(minimum, max_interval))
+
+        async def enter_empty():
+            if not self.empty:
+                self.empty = True
+                # Whatever plays next, even the same track again, is a new track for the island
+                self.changes.reset()
+                self.timeline.clear()
+                if timeline_callback:
+                    await timeline_callback(self.timeline)
+                if on_nothing:
+                    await on_nothing()
+
+        await self.initialize()
+        bound_version = None
+        shown = None
+        kinds = set()
         
         while True:
+            poked, self._user_activity = self._user_activity, False
+            active = bool(kinds) or poked
+            started = time.perf_counter_ns() if tracer.enabled else 0
             try:
-                
-                prev_session_id = self.session.source_app_user_model_id if self.session else None
-                await self.initialize()
-                new_session_id = self.session.source_app_user_model_id if self.session else None
+                prev_session_id = self.backend.session_id(self.session) if self.session else None
+                # Events tell what changed; a timeout is the safety poll and rescans everything
+                full = not watcher.active or not (kinds or poked)
+                await self.initialize(kinds, full, watcher.sessions)
+                new_session_id = self.sessions.best.session_id if self.sessions.best else None
+                session_ids = self.sessions.session_ids
+
+                if self.sessions.version != bound_version:
+                    bound_version = self.sessions.version
+                    self.store.retain(session_ids)
+                    # Active session first for event sources that can only follow one
+                    others = [session for session in self.all_sessions if session is not self.session]
+                    self.event_source.bind_sessions(([self.session] if self.session else []) + others)
+
+                if full:
+                    dirty = session_ids
+                else:
+                    events_from = watcher.sessions or {new_session_id}
+                    dirty = [i for i in session_ids if i in events_from or self.store.get(i) is None]
+                if not watcher.active:
+                    # Without push events a late thumbnail can only be noticed by reading it again
+                    refresh_cover = {new_session_id}
+                elif SESSIONS_CHANGED in kinds or MEDIA_PROPERTIES_CHANGED in kinds:
+                    refresh_cover = set(dirty)
+                else:
+                    refresh_cover = set()
+                await self.refresh_sessions(dirty, refresh_cover)
 
                 if prev_session_id != new_session_id:
-                    if on_nothing:
-                        await on_nothing()
-                    print(f"Session changed: {prev_session_id} -> {new_session_id}")
-                    last_track = None
-                    last_session_id = None
-                    last_playback_state = None
-                    last_cover = None
-                
-                if not self.session:
-                    if on_nothing:
-                        await on_nothing()
-                    await asyncio.sleep(interval)
-                    continue
-                sound = await self.get_session_volume()
-
-                current_track = await self.get_current_track_info()
-                if not current_track:
-                    if on_nothing:
-                        await on_nothing()
-                    await asyncio.sleep(interval)
-                    continue
-                
-                current_cover = await self.get_current_cover_base64()
-
-                if (not last_track or 
-                    last_session_id != current_track['session_id'] or
-                    current_track['title'] != last_track['title'] or
-                    current_track['artist'] != last_track['artist'] or
-                    current_cover != last_cover):
-                    if change_callback:
-                        await change_callback(current_track, current_cover)
-                    last_track = current_track
-                    last_session_id = current_track['session_id']
-                    last_cover = current_cover
-
-                if (last_playback_state != current_track['playback_status'] and 
-                    playback_state_callback):
-                    await playback_state_callback(current_track['playback_status'] == 'PLAYING')
-                    last_playback_state = current_track['playback_status']
+                    active = True
+                    log.info("session_changed", previous=prev_session_id, current=new_session_id)
+
+                state = self.store.get(new_session_id) if new_session_id else None
+                if not state:
+                    await enter_empty()
+                else:
+                    self.empty = False
+                    changed = await self.changes.update(state)
+                    active = active or state.is_playing or IDENTITY in changed
+                    timeline_event = TIMELINE_CHANGED in kinds and (
+                        not watcher.sessions or new_session_id in watcher.sessions)
+                    resynced = self.timeline.observe(
+                        state.position, state.duration, state.is_playing, state.rate, state.position_at,
+                        state.session_id, event=timeline_event or IDENTITY in changed
+                    )
+                    if resynced and timeline_callback:
+                        await timeline_callback(self.timeline)
+
+                if sessions_callback and shown != (self.store.version, new_session_id):
+                    shown = (self.store.version, new_session_id)
+                    await sessions_callback(self.store.ordered(session_ids), new_session_id)
                     
-            except Exception as e:
-                print(f"Error in monitor_track_changes: {e}")
-                if "RPC server" in str(e):
-                    self.session = None
-                    if on_nothing:
-                        await on_nothing()
-                
-            await asyncio.sleep(interval)
+            except Exception:
+                # Lost connections to the media service are handled by the session registry
+                log.exception("monitor_tick_failed")
+            if started:
+                tracer.complete("monitor.tick", "monitor", started)
+
+            kinds = await watcher.wait(poll.next(active))
+
+    def monitor_stats(self) -> dict:
+        """Current poll interval and wakeup counts of the monitor loop"""
+        stats = self.poll_interval.stats() if self.poll_interval else {}
+        stats.update(self.sessions.stats())
+        if self.watcher is not None:
+            stats['events_received'] = self.watcher.events_received
+            stats['events_active'] = self.watcher.active
+        return stats
 
     async def get_session_volume(self) -> Optional[float]:
         """
@@ -223,15 +328,7 @@ class MediaPlayerController:
         if not self.session:
             return None
         try:
-            playback_info = self.session.get_playback_info()
-            # Some sessions may expose volume info via playback_info
-            if hasattr(playback_info, 'playback_volume'):
-                # Not standard, but check if available
-                return float(playback_info.playback_volume)
-            # Windows GlobalSystemMediaTransportControlsSession does not expose per-session volume directly
-            # so this may not be available for all apps
-            return None
+            return self.backend.session_volume(self.session)
         except Exception as e:
-            print(f"Error getting session volume: {e}")
+            log.error("session_volume_failed", error=str(e))
             return None
-
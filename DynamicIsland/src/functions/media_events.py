@@ -0,0 +1,134 @@
+import asyncio
+
+SESSIONS_CHANGED = "sessions"
+MEDIA_PROPERTIES_CHANGED = "media_properties"
+PLAYBACK_INFO_CHANGED = "playback_info"
+TIMELINE_CHANGED = "timeline"
+
+
+class MediaEventSource:
+    """Base class for backends that push media session change notifications"""
+
+    def __init__(self):
+        self._listener = None
+
+    def set_listener(self, listener):
+        """Set the callable invoked as listener(kind, session_id) for every event"""
+        self._listener = listener
+
+    def notify(self, kind, session_id=None):
+        """Forward an event to the listener; safe to call from any thread"""
+        if self._listener:
+            self._listener(kind, session_id)
+
+    async def start(self) -> bool:
+        """Subscribe to the platform events, return False if push is unavailable"""
+        return False
+
+    def bind_session(self, session):
+        """Follow property, playback and timeline events of the given session"""
+
+    def bind_sessions(self, sessions):
+        """Follow the events of every session; sources limited to one follow the first"""
+        self.bind_session(sessions[0] if sessions else None)
+
+    async def stop(self):
+        """Drop every subscription"""
+
+
+class FakeEventSource(MediaEventSource):
+    """In-process event source driven by hand, used off Windows"""
+
+    def __init__(self, available=True):
+        super().__init__()
+        self.available = available
+        self.session = None
+        self.sessions = []
+        self.started = False
+
+    async def start(self) -> bool:
+        self.started = self.available
+        return self.started
+
+    def bind_session(self, session):
+        self.bind_sessions([session] if session is not None else [])
+
+    def bind_sessions(self, sessions):
+        self.sessions = list(sessions)
+        self.session = self.sessions[0] if self.sessions else None
+
+    async def stop(self):
+        self.started = False
+
+    def emit(self, kind, session_id=None):
+        """Simulate a platform event"""
+        self.notify(kind, session_id)
+
+
+class MediaChangeWatcher:
+    """Wakes the monitor loop on media events, coalescing bursts into one wakeup"""
+
+    def __init__(self, source: MediaEventSource = None, coalesce=0.05):
+        self.source = source
+        self.coalesce = coalesce
+        self.active = False
+        self.wakeups = 0
+        self.events_received = 0
+        self._pending = set()
+        self._pending_sessions = set()
+        self.sessions = set()
+        self._event = None
+        self._loop = None
+
+    async def start(self) -> bool:
+        """Attach to the event source, return True when push events are live"""
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        if self.source is None:
+            return False
+        self.source.set_listener(self._on_event)
+        self.active = await self.source.start()
+        return self.active
+
+    async def stop(self):
+        if self.source is not None:
+            self.source.set_listener(None)
+            await self.source.stop()
+        self.active = False
+
+    def wake(self):
+        """End the current wait early without an event, e.g. after user input"""
+        if self._event is not None:
+            self._event.set()
+
+    def _on_event(self, kind, session_id=None):
+        # WinRT delivers events on its own threads
+        try:
+            self._loop.call_soon_threadsafe(self._push, kind, session_id)
+        except RuntimeError:
+            pass
+
+    def _push(self, kind, session_id=None):
+        self.events_received += 1
+        self._pending.add(kind)
+        if session_id is not None:
+            self._pending_sessions.add(session_id)
+        self._event.set()
+
+    async def wait(self, timeout) -> set:
+        """Sleep until an event arrives or timeout expires, return the pending event kinds.
+
+        The ids of the sessions those events came from are left in ``sessions``.
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self._event.is_set() and self.coalesce and self._pending:
+            # Players fire several events per track change, let the burst settle
+            await asyncio.sleep(self.coalesce)
+        self._event.clear()
+        kinds, self._pending = self._pending, set()
+        self.sessions, self._pending_sessions = self._pending_sessions, set()
+        self.wakeups += 1
+        return kinds
@@ -0,0 +1,259 @@
+import asyncio
+import time
+import urllib.parse
+import urllib.request
+from typing import Optional, Tuple
+from dbus_next import BusType
+from dbus_next.aio import MessageBus
+from functions.media_backend import MediaBackend, PLAYING, STOPPED
+from functions.media_events import (
+    MediaEventSource, SESSIONS_CHANGED,
+    MEDIA_PROPERTIES_CHANGED, PLAYBACK_INFO_CHANGED, TIMELINE_CHANGED
+)
+from functions.log import get_logger
+
+log = get_logger("mpris")
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+
+def _unwrap(metadata: dict) -> dict:
+    return {key: getattr(value, "value", value) for key, value in metadata.items()}
+
+
+class MprisSession:
+    """One MPRIS player on the session bus with its last known properties"""
+
+    def __init__(self, bus_name, player, properties):
+        self.bus_name = bus_name
+        self.player = player
+        self.properties = properties
+        self.status = STOPPED
+        self.metadata = {}
+        self.position = 0.0
+        self.position_at = time.monotonic()
+        self.rate = 1.0
+
+    async def refresh(self):
+        self.status = (await self.player.get_playback_status()).upper()
+        self.metadata = _unwrap(await self.player.get_metadata())
+        try:
+            self.position = await self.player.get_position() / 1_000_000
+        except Exception:
+            # Position is optional in the spec and some players raise instead
+            self.position = 0.0
+        self.position_at = time.monotonic()
+        try:
+            self.rate = await self.player.get_rate()
+        except Exception:
+            self.rate = 1.0
+
+    def apply_changes(self, changed: dict):
+        changed = _unwrap(changed)
+        if "PlaybackStatus" in changed:
+            # The position is only pushed on Seeked, carry it across the status change
+            now = time.monotonic()
+            if self.status == PLAYING:
+                self.position += (now - self.position_at) * self.rate
+            self.position_at = now
+            self.status = changed["PlaybackStatus"].upper()
+        if "Metadata" in changed:
+            self.metadata = _unwrap(changed["Metadata"])
+        if "Position" in changed:
+            self.position = changed["Position"] / 1_000_000
+            self.position_at = time.monotonic()
+        if "Rate" in changed:
+            self.rate = changed["Rate"]
+
+
+class MprisEventSource(MediaEventSource):
+    """NameOwnerChanged, PropertiesChanged and Seeked signals of MPRIS players"""
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self.session = None
+        self._handlers = {}
+        self._dbus = None
+
+    async def start(self) -> bool:
+        try:
+            self._dbus = await self.backend.dbus_interface()
+            self._dbus.on_name_owner_changed(self._on_name_owner_changed)
+            return True
+        except Exception as e:
+            log.warning("media_events_unavailable", error=str(e))
+            return False
+
+    def _on_name_owner_changed(self, name, old_owner, new_owner):
+        if name.startswith(MPRIS_PREFIX):
+            self.notify(SESSIONS_CHANGED)
+
+    def _on_properties_changed(self, session, interface, changed, invalidated):
+        if interface != PLAYER_INTERFACE:
+            return
+        session.apply_changes(changed)
+        if "Metadata" in changed:
+            self.notify(MEDIA_PROPERTIES_CHANGED, session.bus_name)
+        if "PlaybackStatus" in changed:
+            self.notify(PLAYBACK_INFO_CHANGED, session.bus_name)
+
+    def _on_seeked(self, session, position):
+        session.position = position / 1_000_000
+        session.position_at = time.monotonic()
+        self.notify(TIMELINE_CHANGED, session.bus_name)
+
+    def bind_session(self, session):
+        self.bind_sessions([session] if session is not None else [])
+
+    def bind_sessions(self, sessions):
+        """Follow signals of every player in the list, dropping players that left it"""
+        wanted = {session.bus_name: session for session in sessions}
+        for name in [name for name in self._handlers if name not in wanted]:
+            self._unbind(name)
+        for name, session in wanted.items():
+            if name not in self._handlers:
+                on_properties = lambda interface, changed, invalidated, session=session: \
+                    self._on_properties_changed(session, interface, changed, invalidated)
+                on_seeked = lambda position, session=session: self._on_seeked(session, position)
+                session.properties.on_properties_changed(on_properties)
+                session.player.on_seeked(on_seeked)
+                self._handlers[name] = (session, on_properties, on_seeked)
+        self.session = sessions[0] if sessions else None
+
+    def _unbind(self, name):
+        session, on_properties, on_seeked = self._handlers.pop(name)
+        session.properties.off_properties_changed(on_properties)
+        session.player.off_seeked(on_seeked)
+
+    def _unbind_session(self):
+        for name in list(self._handlers):
+            self._unbind(name)
+        self.session = None
+
+    async def stop(self):
+        self._unbind_session()
+        if self._dbus is not None:
+            self._dbus.off_name_owner_changed(self._on_name_owner_changed)
+            self._dbus = None
+
+
+class MprisMediaBackend(MediaBackend):
+    """MPRIS players on the D-Bus session bus, for Linux desktops"""
+
+    name = "mpris"
+
+    def __init__(self):
+        self.bus = None
+        self._sessions = {}
+        self._dbus = None
+        self._events = MprisEventSource(self)
+
+    def events(self) -> MediaEventSource:
+        return self._events
+
+    async def connect(self):
+        if self.bus is None:
+            self.bus = await MessageBus(bus_type=BusType.SESSION).connect()
+        return self.bus
+
+    async def dbus_interface(self):
+        if self._dbus is None:
+            bus = await self.connect()
+            introspection = await bus.introspect("org.freedesktop.DBus", "/org/freedesktop/DBus")
+            proxy = bus.get_proxy_object("org.freedesktop.DBus", "/org/freedesktop/DBus", introspection)
+            self._dbus = proxy.get_interface("org.freedesktop.DBus")
+        return self._dbus
+
+    async def reconnect(self):
+        if self.bus is not None:
+            self.bus.disconnect()
+        self.bus = None
+        self._dbus = None
+        self._sessions = {}
+
+    async def _open_session(self, bus_name) -> MprisSession:
+        introspection = await self.bus.introspect(bus_name, MPRIS_PATH)
+        proxy = self.bus.get_proxy_object(bus_name, MPRIS_PATH, introspection)
+        return MprisSession(bus_name, proxy.get_interface(PLAYER_INTERFACE), proxy.get_interface(PROPERTIES_INTERFACE))
+
+    async def get_sessions(self) -> list:
+        dbus = await self.dbus_interface()
+        names = [name for name in await dbus.call_list_names() if name.startswith(MPRIS_PREFIX)]
+        sessions = {}
+        for name in names:
+            session = self._sessions.get(name)
+            try:
+                if session is None:
+                    session = await self._open_session(name)
+                await session.refresh()
+                sessions[name] = session
+            except Exception as e:
+                log.warning("mpris_player_skipped", player=name, error=str(e))
+        self._sessions = sessions
+        return list(sessions.values())
+
+    def session_id(self, session) -> str:
+        return session.bus_name
+
+    def playback_status(self, session) -> str:
+        return session.status
+
+    async def media_properties(self, session) -> Optional[dict]:
+        metadata = session.metadata
+        if not metadata:
+            return None
+        artists = metadata.get("xesam:artist") or []
+        return {
+            'title': metadata.get("xesam:title"),
+            'artist': ", ".join(artists) if isinstance(artists, list) else artists,
+            'album': metadata.get("xesam:album"),
+        }
+
+    async def thumbnail_bytes(self, session) -> Optional[bytes]:
+        url = session.metadata.get("mpris:artUrl")
+        if not url:
+            return None
+        return await asyncio.to_thread(self._read_art, url)
+
+    @staticmethod
+    def _read_art(url) -> Optional[bytes]:
+        parsed = urllib.parse.urlparse(url)
+        if parsed.scheme == "file":
+            with open(urllib.parse.unquote(parsed.path), "rb") as file:
+                return file.read()
+        if parsed.scheme in ("http", "https"):
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.read()
+        return None
+
+    def timeline(self, session) -> Optional[Tuple[float, float]]:
+        length = session.metadata.get("mpris:length") or 0
+        return session.position, length / 1_000_000
+
+    def timeline_age(self, session) -> float:
+        # Position is only pushed on Seeked, between signals it is as old as the last read
+        return time.monotonic() - session.position_at
+
+    def playback_rate(self, session) -> float:
+        return session.rate or 1.0
+
+    async def play(self, session):
+        await session.player.call_play()
+
+    async def pause(self, session):
+        await session.player.call_pause()
+
+    async def next_track(self, session):
+        await session.player.call_next()
+
+    async def previous_track(self, session):
+        await session.player.call_previous()
+
+    async def seek(self, session, seconds: float):
+        track_id = session.metadata.get("mpris:trackid")
+        if track_id:
+            await session.player.call_set_position(track_id, int(seconds * 1_000_000))
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from functions.island_state import IslandStateMachine, NOTIFY, DISMISS
+from functions.notification_queue import NotificationQueue
+from functions.notification_sources import Notification, NotificationSource
+from functions.log import get_logger
+
+log = get_logger("notifications")
+
+
+class NotificationCenter:
+    """Puts queued notifications on the island through its state machine.
+
+    A burst is collected for coalesce_window and goes up as one NOTIFY, "N new" when
+    several arrived. While it is up, newer arrivals only refresh it, at most once per
+    refresh_interval, and it is dismissed display_time after the last refresh or
+    max_display after it went up. However many arrive, the island plays one clip to
+    open and one to close.
+    """
+
+    def __init__(self, island_state: IslandStateMachine, queue: NotificationQueue = None,
+                 coalesce_window=0.25, display_time=4.0, refresh_interval=0.5, max_display=12.0,
+                 clock=time.monotonic):
+        self.island_state = island_state
+        self.queue = queue or NotificationQueue()
+        self.coalesce_window = coalesce_window
+        self.display_time = display_time
+        self.refresh_interval = refresh_interval
+        self.max_display = max_display
+        self.clock = clock
+        self.sources = []
+        self.shown = None
+        self.shows = 0
+        self.refreshes = 0
+        self.dismissals = 0
+        self._wake = None
+        self._task = None
+
+    async def attach(self, source: NotificationSource) -> bool:
+        """Listen to a source, False when it could not start"""
+        source.set_listener(self.receive)
+        started = await source.start()
+        if started:
+            self.sources.append(source)
+        else:
+            log.info("notification_source_unavailable", source=type(source).__name__)
+        return started
+
+    def receive(self, notification: Notification):
+        """Queue a notification, only the presenter task ever touches the island"""
+        self.queue.push(notification)
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._present())
+
+    async def _present(self):
+        while len(self.queue):
+            # Let the rest of a burst land in the same batch
+            await asyncio.sleep(self.coalesce_window)
+            batch = self.queue.take()
+            if batch is None:
+                continue
+            self.shown = batch
+            self.shows += 1
+            await self.island_state.post(NOTIFY, batch)
+            await self._hold()
+            if self.island_state.showing_notification:
+                self.dismissals += 1
+                await self.island_state.post(DISMISS)
+            self.shown = None
+
+    async def _hold(self):
+        """Keep the notification up, folding in arrivals, until it times out or is clicked away"""
+        started = refreshed = self.clock()
+        while self.island_state.showing_notification:
+            remaining = min(refreshed + self.display_time, started + self.max_display) - self.clock()
+            if remaining <= 0:
+                return
+            self._wake.clear()
+            if not len(self.queue):
+                try:
+                    await asyncio.wait_for(self._wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return
+            await asyncio.sleep(self.refresh_interval)
+            if not self.island_state.showing_notification:
+                # Clicked away, what arrived goes up again as a new batch
+                return
+            batch = self.queue.take()
+            if batch is None:
+                continue
+            self.shown = self.shown.merge(batch)
+            self.refreshes += 1
+            refreshed = self.clock()
+            self.island_state.post(NOTIFY, self.shown)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        for source in self.sources:
+            await source.stop()
+
+    def stats(self) -> dict:
+        stats = self.queue.stats()
+        stats.update({
+            'shows': self.shows,
+            'refreshes': self.refreshes,
+            'dismissals': self.dismissals,
+        })
+        return stats
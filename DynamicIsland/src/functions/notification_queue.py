@@ -0,0 +1,122 @@
+import heapq
+import time
+from itertools import count
+from typing import Optional
+from functions.notification_sources import Notification
+
+QUEUED = "queued"
+LIMITED = "limited"
+DROPPED = "dropped"
+
+# Notifications a batch keeps for display, the rest only count towards "N new"
+MAX_SHOWN = 3
+
+
+class NotificationBatch:
+    """What the island shows: the most important notifications and how many arrived with them"""
+    __slots__ = ("notifications", "count", "apps")
+
+    def __init__(self, notifications: list, count: int, apps: frozenset):
+        self.notifications = notifications
+        self.count = count
+        self.apps = apps
+
+    @property
+    def top(self) -> Optional[Notification]:
+        return self.notifications[0] if self.notifications else None
+
+    @property
+    def title(self) -> str:
+        if self.count == 1 and self.top is not None:
+            return self.top.title
+        return f"{self.count} new"
+
+    def merge(self, newer: "NotificationBatch") -> "NotificationBatch":
+        """This batch with newer arrivals folded in, as one island state"""
+        notifications = sorted(newer.notifications + self.notifications,
+                               key=lambda n: (-n.priority, -n.received_at))[:MAX_SHOWN]
+        return NotificationBatch(notifications, self.count + newer.count, self.apps | newer.apps)
+
+
+class NotificationQueue:
+    """Bounded priority queue of notifications with a token bucket per app.
+
+    An app gets burst notifications at once and rate more per second after that, the
+    rest of its burst is only counted. When the queue is full a notification replaces
+    the lowest priority, oldest one, or is itself counted when it ranks lower. Counted
+    notifications are never shown on their own but are part of the next batch's count.
+    """
+
+    def __init__(self, capacity=32, rate=0.5, burst=3, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.received = 0
+        self.limited = 0
+        self.dropped = 0
+        self.taken = 0
+        self._heap = []
+        self._counted = 0
+        self._counted_apps = set()
+        self._buckets = {}
+        self._order = count()
+
+    def __len__(self):
+        return len(self._heap) + self._counted
+
+    def push(self, notification: Notification) -> str:
+        """Queue a notification, return QUEUED, LIMITED or DROPPED"""
+        self.received += 1
+        if not self._allow(notification.app_id):
+            self.limited += 1
+            self._count(notification)
+            return LIMITED
+        entry = (-notification.priority, -next(self._order), notification)
+        if len(self._heap) >= self.capacity:
+            lowest = max(self._heap)
+            if entry >= lowest:
+                self.dropped += 1
+                self._count(notification)
+                return DROPPED
+            self._heap.remove(lowest)
+            heapq.heapify(self._heap)
+            self.dropped += 1
+            self._count(lowest[2])
+        heapq.heappush(self._heap, entry)
+        return QUEUED
+
+    def take(self) -> Optional[NotificationBatch]:
+        """Everything waiting as one batch, None when nothing is"""
+        total = len(self)
+        if not total:
+            return None
+        apps = self._counted_apps | {entry[2].app_id for entry in self._heap}
+        notifications = [heapq.heappop(self._heap)[2] for _ in range(min(MAX_SHOWN, len(self._heap)))]
+        batch = NotificationBatch(notifications, total, frozenset(apps))
+        self.taken += batch.count
+        self._heap.clear()
+        self._counted = 0
+        self._counted_apps = set()
+        return batch
+
+    def _allow(self, app_id) -> bool:
+        now = self.clock()
+        tokens, updated = self._buckets.get(app_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        self._buckets[app_id] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+    def _count(self, notification: Notification):
+        self._counted += 1
+        self._counted_apps.add(notification.app_id)
+
+    def stats(self) -> dict:
+        return {
+            'received': self.received,
+            'waiting': len(self),
+            'limited': self.limited,
+            'dropped': self.dropped,
+            'taken': self.taken,
+        }
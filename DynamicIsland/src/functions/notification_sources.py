@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+import time
+from functions.log import get_logger
+
+log = get_logger("notification_sources")
+
+LOW = 0
+NORMAL = 1
+HIGH = 2
+PRIORITIES = {"low": LOW, "normal": NORMAL, "high": HIGH}
+
+
+class Notification:
+    """One notification as a source reports it"""
+    __slots__ = ("app_id", "title", "body", "priority", "received_at")
+
+    def __init__(self, app_id, title, body="", priority=NORMAL, received_at=None):
+        self.app_id = app_id
+        self.title = title
+        self.body = body
+        self.priority = priority
+        self.received_at = time.monotonic() if received_at is None else received_at
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Notification":
+        priority = data.get("priority", NORMAL)
+        return cls(str(data["app"]), str(data.get("title", "")), str(data.get("body", "")),
+                   PRIORITIES.get(priority, NORMAL) if isinstance(priority, str) else int(priority))
+
+    def __repr__(self):
+        return f"Notification({self.app_id!r}, {self.title!r}, priority={self.priority})"
+
+
+class NotificationSource:
+    """Base class for whatever pushes notifications, the base itself never reports any"""
+
+    def __init__(self):
+        self._listener = None
+
+    def set_listener(self, listener):
+        """Set the callable invoked as listener(notification) for every notification"""
+        self._listener = listener
+
+    def notify(self, notification: Notification):
+        if self._listener:
+            self._listener(notification)
+
+    async def start(self) -> bool:
+        """Start listening, return False when the source is unavailable"""
+        return False
+
+    async def stop(self):
+        """Stop listening"""
+
+
+class FakeNotificationSource(NotificationSource):
+    """In-process source driven by hand, for tests and benchmarks"""
+
+    def __init__(self, available=True):
+        super().__init__()
+        self.available = available
+        self.started = False
+        self.emitted = 0
+
+    async def start(self) -> bool:
+        self.started = self.available
+        return self.started
+
+    async def stop(self):
+        self.started = False
+
+    def emit(self, app_id, title, body="", priority=NORMAL) -> Notification:
+        """Simulate a notification"""
+        notification = Notification(app_id, title, body, priority)
+        self.emitted += 1
+        self.notify(notification)
+        return notification
+
+
+class FileNotificationSource(NotificationSource):
+    """Follows a file of JSON lines, {"app": ..., "title": ..., "body": ..., "priority": "high"}.
+
+    Lines appended after start() become notifications, so any script or test can raise
+    one with a shell redirect. Malformed lines are logged and skipped.
+    """
+
+    def __init__(self, path, interval=0.25):
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self.lines_read = 0
+        self.lines_skipped = 0
+        self._offset = 0
+        self._partial = b""
+        self._task = None
+
+    async def start(self) -> bool:
+        try:
+            self._offset = os.path.getsize(self.path)
+        except OSError:
+            self._offset = 0
+        self._task = asyncio.ensure_future(self._follow())
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _follow(self):
+        while True:
+            self.read_new()
+            await asyncio.sleep(self.interval)
+
+    def read_new(self) -> int:
+        """Report the complete lines appended since the last read, return how many"""
+        try:
+            with open(self.path, "rb") as file:
+                if os.fstat(file.fileno()).st_size < self._offset:
+                    # Truncated or replaced, start over
+                    self._offset, self._partial = 0, b""
+                file.seek(self._offset)
+                data = file.read()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            log.warning("notification_file_unreadable", path=self.path, error=str(e))
+            return 0
+        self._offset += len(data)
+        *lines, self._partial = (self._partial + data).split(b"\n")
+        reported = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                notification = Notification.from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                self.lines_skipped += 1
+                log.warning("notification_line_skipped", error=str(e))
+                continue
+            self.lines_read += 1
+            reported += 1
+            self.notify(notification)
+        return reported
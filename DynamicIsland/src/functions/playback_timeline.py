@@ -0,0 +1,89 @@
+import time
+from typing import Optional
+
+
+class PlaybackTimeline:
+    """Playback position extrapolated locally from the last report of the player.
+
+    Keeps an anchor (position, monotonic time, rate) and predicts the position from
+    the clock, so the progress bar never has to ask the backend. Reports only move the
+    anchor on a timeline event, a change of track or playback state, or when the
+    prediction is off by more than drift_threshold seconds.
+    """
+
+    def __init__(self, drift_threshold=1.0, clock=time.monotonic):
+        self.drift_threshold = drift_threshold
+        self.clock = clock
+        self.session_id = None
+        self.anchor_position = 0.0
+        self.anchor_time = clock()
+        self.duration = 0.0
+        self.playing = False
+        self.rate = 1.0
+        self.version = 0
+        self.observations = 0
+        self.resyncs = 0
+        self.drift_corrections = 0
+        self.last_drift = 0.0
+        self.max_drift = 0.0
+
+    def sync(self, position, duration, playing, rate=1.0, at=None, session_id=None):
+        """Move the anchor to a reported position, at is the monotonic time it was measured"""
+        self.session_id = session_id
+        self.anchor_position = position
+        self.anchor_time = self.clock() if at is None else at
+        self.duration = duration
+        self.playing = playing
+        self.rate = rate or 1.0
+        self.version += 1
+        self.resyncs += 1
+
+    def observe(self, position, duration, playing, rate=1.0, at=None, session_id=None, event=False) -> bool:
+        """Take a report from the player, return True when the anchor moved"""
+        self.observations += 1
+        rate = rate or 1.0
+        if (event or session_id != self.session_id or playing != self.playing
+                or rate != self.rate or duration != self.duration):
+            self.sync(position, duration, playing, rate, at, session_id)
+            return True
+        drift = position - self.position(at)
+        self.last_drift = drift
+        self.max_drift = max(self.max_drift, abs(drift))
+        if abs(drift) > self.drift_threshold:
+            self.drift_corrections += 1
+            self.sync(position, duration, playing, rate, at, session_id)
+            return True
+        return False
+
+    def seek(self, seconds):
+        """Jump locally right away, the player's own report follows as a timeline event"""
+        self.sync(seconds, self.duration, self.playing, self.rate, session_id=self.session_id)
+
+    def clear(self):
+        self.sync(0.0, 0.0, False)
+        self.session_id = None
+
+    def position(self, now: Optional[float] = None) -> float:
+        """Predicted position in seconds at monotonic time now"""
+        position = self.anchor_position
+        if self.playing:
+            now = self.clock() if now is None else now
+            position += (now - self.anchor_time) * self.rate
+        if self.duration > 0:
+            return min(max(position, 0.0), self.duration)
+        return max(position, 0.0)
+
+    def fraction(self, now: Optional[float] = None) -> float:
+        """Share of the track played, 0 when the duration is unknown"""
+        if self.duration <= 0:
+            return 0.0
+        return self.position(now) / self.duration
+
+    def stats(self) -> dict:
+        return {
+            'observations': self.observations,
+            'resyncs': self.resyncs,
+            'drift_corrections': self.drift_corrections,
+            'last_drift_s': self.last_drift,
+            'max_drift_s': self.max_drift,
+        }
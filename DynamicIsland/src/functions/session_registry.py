@@ -0,0 +1,162 @@
+from typing import Optional
+from functions.media_backend import MediaBackend, PLAYING
+from functions.media_events import SESSIONS_CHANGED, PLAYBACK_INFO_CHANGED
+from functions.instrumentation import tracer
+from functions.log import get_logger
+
+log = get_logger("sessions")
+
+
+class SessionEntry:
+    """A platform session and its last read playback status"""
+    __slots__ = ("session_id", "session", "status")
+
+    def __init__(self, session_id, session, status=None):
+        self.session_id = session_id
+        self.session = session
+        self.status = status
+
+
+class SessionRegistry:
+    """Cached table of media sessions, updated incrementally from media events.
+
+    The session list is only re-read on a full refresh (session events, the safety
+    poll, polling mode), playback events re-read the status of the sessions they
+    came from only, and the best session is recomputed only when the table changed. A lost
+    connection to the platform service is reconnected once per refresh.
+    """
+
+    def __init__(self, backend: MediaBackend):
+        self.backend = backend
+        self.entries = {}
+        self.best: Optional[SessionEntry] = None
+        self.pinned = None
+        self.version = 0
+        self.scans = 0
+        self.status_reads = 0
+        self.selections = 0
+        self.reconnects = 0
+
+    @property
+    def sessions(self) -> list:
+        return [entry.session for entry in self.entries.values()]
+
+    @property
+    def best_session(self):
+        return self.best.session if self.best else None
+
+    async def refresh(self, kinds=(), full=False, session_ids=()) -> bool:
+        """Apply a batch of event kinds from the given sessions, return True when the table changed"""
+        if full or SESSIONS_CHANGED in kinds or not self.entries:
+            changed = await self._scan()
+        elif PLAYBACK_INFO_CHANGED in kinds:
+            entries = [self.entries[i] for i in session_ids if i in self.entries]
+            if not entries and self.best is not None:
+                entries = [self.best]
+            changed = False
+            for entry in entries:
+                changed = self._read_status(entry) or changed
+        else:
+            changed = False
+        if changed:
+            self.version += 1
+            self._select_best()
+        return changed
+
+    async def _scan(self) -> bool:
+        try:
+            sessions = await self._get_sessions()
+        except Exception as e:
+            log.error("session_scan_failed", error=str(e))
+            sessions = []
+        self.scans += 1
+        entries = {}
+        changed = False
+        for session in sessions:
+            try:
+                session_id = self.backend.session_id(session)
+            except Exception:
+                continue
+            entry = self.entries.get(session_id)
+            if entry is None:
+                entry = SessionEntry(session_id, session)
+                changed = True
+            else:
+                # Backends may hand out a new wrapper for the same session on every call
+                entry.session = session
+            changed = self._read_status(entry) or changed
+            entries[session_id] = entry
+        changed = changed or list(entries) != list(self.entries)
+        self.entries = entries
+        return changed
+
+    async def _get_sessions(self) -> list:
+        try:
+            with tracer.span("backend.get_sessions", "backend"):
+                return await self.backend.get_sessions()
+        except Exception as e:
+            if not self.backend.is_disconnect(e):
+                raise
+            log.warning("media_service_reconnect", error=str(e))
+            self.reconnects += 1
+            # Fresh entries make the controller re-bind event handlers to the new session objects
+            self.entries = {}
+            await self.backend.reconnect()
+            with tracer.span("backend.get_sessions", "backend", {"reconnect": True}):
+                return await self.backend.get_sessions()
+
+    def _read_status(self, entry: SessionEntry) -> bool:
+        self.status_reads += 1
+        try:
+            status = self.backend.playback_status(entry.session)
+        except Exception:
+            status = None
+        changed, entry.status = status != entry.status, status
+        return changed
+
+    @property
+    def session_ids(self) -> list:
+        return list(self.entries)
+
+    def get(self, session_id) -> Optional[SessionEntry]:
+        return self.entries.get(session_id)
+
+    def pin(self, session_id) -> bool:
+        """Make a session the active one until it goes away, None returns to automatic choice"""
+        if session_id is not None and session_id not in self.entries:
+            return False
+        self.pinned = session_id
+        self.version += 1
+        self._select_best()
+        return True
+
+    def _select_best(self):
+        """Prefer the pinned session, then a playing one, then the current one, then the first paused one"""
+        self.selections += 1
+        if self.pinned is not None and self.pinned not in self.entries:
+            self.pinned = None
+        entries = list(self.entries.values())
+        best = self.entries.get(self.pinned) if self.pinned is not None else None
+        if best is None:
+            best = next((entry for entry in entries if entry.status == PLAYING), None)
+        if best is None and self.best is not None:
+            best = self.entries.get(self.best.session_id)
+        if best is None:
+            best = next((entry for entry in entries if entry.status is not None), entries[0] if entries else None)
+        self.best = best
+
+    def clear(self):
+        self.entries = {}
+        self.best = None
+        self.pinned = None
+        self.version += 1
+
+    def stats(self) -> dict:
+        return {
+            'sessions': len(self.entries),
+            'version': self.version,
+            'scans': self.scans,
+            'status_reads': self.status_reads,
+            'selections': self.selections,
+            'reconnects': self.reconnects,
+        }
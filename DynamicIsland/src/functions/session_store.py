@@ -0,0 +1,47 @@
+from typing import Optional
+from functions.track_state import TrackState, IDENTITY, PLAYBACK
+
+
+class SessionStore:
+    """Last known track state of every media session, updated one session at a time.
+
+    Switching the island to another session reads its state from here instead of
+    fetching metadata and cover again. ``version`` changes whenever something a
+    session switcher shows (the set of sessions, their tracks or play state) changes.
+    """
+
+    def __init__(self):
+        self.states = {}
+        self.version = 0
+        self.updates = 0
+
+    def __len__(self):
+        return len(self.states)
+
+    def get(self, session_id) -> Optional[TrackState]:
+        return self.states.get(session_id)
+
+    def update(self, state: TrackState) -> list:
+        """Store the state of one session, return the channels that changed for it"""
+        self.updates += 1
+        previous = self.states.get(state.session_id)
+        self.states[state.session_id] = state
+        changed = state.changed_channels(previous)
+        if IDENTITY in changed or PLAYBACK in changed:
+            self.version += 1
+        return changed
+
+    def discard(self, session_id):
+        if self.states.pop(session_id, None) is not None:
+            self.version += 1
+
+    def retain(self, session_ids) -> list:
+        """Forget sessions that are gone, return their ids"""
+        gone = [session_id for session_id in self.states if session_id not in session_ids]
+        for session_id in gone:
+            self.discard(session_id)
+        return gone
+
+    def ordered(self, session_ids) -> list:
+        """States in the given session order, sessions without a state yet are skipped"""
+        return [self.states[session_id] for session_id in session_ids if session_id in self.states]
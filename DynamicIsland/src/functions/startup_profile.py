@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from functions.log import get_logger
+
+log = get_logger("startup")
+
+# Module import time of the entry point, the closest cheap stand-in for process start
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfile:
+    """Wall time and newly imported modules per startup phase, logged as one breakdown.
+
+    Enabled with DYNAMIC_ISLAND_STARTUP_PROFILE=1, otherwise phase() and mark() cost a
+    flag check.
+    """
+
+    def __init__(self, enabled=None, start=None):
+        if enabled is None:
+            enabled = os.environ.get("DYNAMIC_ISLAND_STARTUP_PROFILE") == "1"
+        self.enabled = enabled
+        self.start = PROCESS_START if start is None else start
+        self.phases = []
+        self.marks = []
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        modules = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000, len(sys.modules) - modules))
+
+    def mark(self, name):
+        """Milestone measured from process start, e.g. the first paint"""
+        if self.enabled and not self.reported:
+            self.marks.append((name, (time.perf_counter() - self.start) * 1000))
+
+    def loaded(self, *modules) -> dict:
+        """Which of the given heavy modules are imported at this point"""
+        return {module: module in sys.modules for module in modules}
+
+    def report(self):
+        """Log the breakdown once, the slowest phase first"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        for name, ms, modules in sorted(self.phases, key=lambda phase: -phase[1]):
+            log.info("startup_phase", phase=name, ms=round(ms, 1), modules=modules)
+        for name, ms in self.marks:
+            log.info("startup_mark", mark=name, since_start_ms=round(ms, 1))
+        log.info("startup_done", total_ms=round((time.perf_counter() - self.start) * 1000, 1),
+                 **self.loaded("numpy", "PIL", "winrt", "dbus_next"))
+
+
+startup = StartupProfile()
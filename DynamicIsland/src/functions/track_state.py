@@ -0,0 +1,98 @@
+from typing import Optional
+from functions.media_backend import PLAYING
+
+# Change channels, subscribers only wake for the ones they asked for
+IDENTITY = "identity"
+PLAYBACK = "playback"
+POSITION = "position"
+CHANNELS = (IDENTITY, PLAYBACK, POSITION)
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class TrackState:
+    """What the active session is playing, with a precomputed identity fingerprint.
+
+    The fingerprint covers session, title, artist, album and the cover key, so
+    identity checks never compare covers byte for byte.
+    """
+    __slots__ = ("session_id", "title", "artist", "album", "cover", "status",
+                 "position", "duration", "rate", "position_at", "media_key", "fingerprint")
+
+    def __init__(self, session_id, title, artist, album, cover=None, status=None, position=0.0, duration=0.0,
+                 rate=1.0, position_at=None):
+        self.session_id = session_id
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.cover = cover
+        self.status = status
+        self.position = position
+        self.duration = duration
+        self.rate = rate
+        # Monotonic time the player measured position at, None for now
+        self.position_at = position_at
+        self.media_key = (session_id, title, artist, album)
+        self.fingerprint = hash((self.media_key, cover.key if cover is not None else None))
+
+    @property
+    def cover_key(self):
+        return self.cover.key if self.cover is not None else None
+
+    @property
+    def is_playing(self):
+        return self.status == PLAYING
+
+    def changed_channels(self, previous) -> list:
+        """Channels that differ from the previous state, all of them when there is none"""
+        if previous is None:
+            return list(CHANNELS)
+        changed = []
+        if self.fingerprint != previous.fingerprint:
+            changed.append(IDENTITY)
+        if self.status != previous.status:
+            changed.append(PLAYBACK)
+        if self.position != previous.position or self.duration != previous.duration:
+            changed.append(POSITION)
+        return changed
+
+    def as_dict(self) -> dict:
+        """The track info dict passed to change callbacks"""
+        return {
+            'title': self.title or "Unknown",
+            'artist': self.artist or "Unknown",
+            'album': self.album or "Unknown",
+            'position': format_seconds(self.position),
+            'duration': format_seconds(self.duration),
+            'playback_status': self.status,
+            'session_id': self.session_id
+        }
+
+
+class TrackChanges:
+    """Publishes track state transitions on separate identity, playback and position channels"""
+
+    def __init__(self):
+        self.state: Optional[TrackState] = None
+        self._subscribers = {channel: [] for channel in CHANNELS}
+
+    def subscribe(self, channel, callback):
+        """Call ``await callback(state, previous)`` on every change of channel, returns an unsubscribe function"""
+        self._subscribers[channel].append(callback)
+        return lambda: self._subscribers[channel].remove(callback)
+
+    def reset(self):
+        """Forget the last state so the next update is published on every channel"""
+        self.state = None
+
+    async def update(self, state: TrackState) -> list:
+        """Store the new state and notify the channels that changed"""
+        previous, self.state = self.state, state
+        changed = state.changed_channels(previous)
+        for channel in changed:
+            for callback in list(self._subscribers[channel]):
+                await callback(state, previous)
+        return changed
@@ -0,0 +1,80 @@
+import asyncio
+from functions.log import get_logger
+
+log = get_logger("transitions")
+
+
+class TrackTransitionPipeline:
+    """Runs the island transition for the latest track only.
+
+    Every submit restarts a short debounce window, and a transition still running for
+    an older track is cancelled, so a burst of skips ends in one transition to the
+    last track instead of a queue of overlapping ones.
+    """
+
+    def __init__(self, transition, debounce=0.15, on_cancel=None):
+        self.transition = transition
+        self.debounce = debounce
+        self.on_cancel = on_cancel
+        self.target = None
+        self.applied = None
+        self.submitted = 0
+        self.superseded = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.last_latency = None
+        self._submitted_at = None
+        self._task = None
+
+    @property
+    def pending(self):
+        return self._task is not None and not self._task.done()
+
+    def submit(self, target) -> asyncio.Task:
+        """Make target the track to show, replacing whatever is debouncing or running"""
+        self.submitted += 1
+        self.target = target
+        self._submitted_at = asyncio.get_running_loop().time()
+        self.cancel()
+        self._task = asyncio.ensure_future(self._run(target))
+        return self._task
+
+    def cancel(self):
+        """Drop the pending or running transition"""
+        if self.pending:
+            self._task.cancel()
+
+    async def _run(self, target):
+        try:
+            if self.debounce:
+                await asyncio.sleep(self.debounce)
+        except asyncio.CancelledError:
+            self.superseded += 1
+            raise
+        try:
+            await self.transition(target)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if self.on_cancel:
+                self.on_cancel()
+            raise
+        except Exception:
+            log.exception("track_transition_failed")
+            return
+        self.applied = target
+        self.completed += 1
+        self.last_latency = asyncio.get_running_loop().time() - self._submitted_at
+
+    async def settle(self):
+        """Wait until no transition is pending"""
+        while self.pending:
+            await asyncio.wait([self._task])
+
+    def stats(self) -> dict:
+        return {
+            'submitted': self.submitted,
+            'superseded': self.superseded,
+            'cancelled': self.cancelled,
+            'completed': self.completed,
+            'last_latency_ms': (self.last_latency or 0.0) * 1000,
+        }
@@ -0,0 +1,241 @@
+import asyncio
+import inspect
+import time
+from typing import Optional
+from functions.instrumentation import Histogram, tracer
+from functions.log import get_logger
+
+log = get_logger("transport")
+
+PLAY = "play"
+PAUSE = "pause"
+NEXT = "next"
+PREVIOUS = "previous"
+SEEK = "seek"
+COMMANDS = (PLAY, PAUSE, NEXT, PREVIOUS, SEEK)
+
+
+class TransportQueue:
+    """Sends transport commands to the player one at a time, merging the ones still waiting.
+
+    While a command is in flight new ones wait, and before the next send they collapse
+    into at most one skip, one seek and one play state:
+
+        play/pause  only the last click counts, and nothing is sent when it matches the
+                    state the player is already in or heading to (a play/pause pair cancels)
+        next/prev   fold into a net skip, sent back to back as one batch
+        seek        the last one counts, a skip clicked after it drops it
+
+    The wanted play state is what ``playing`` reports right away. Confirmations from
+    the player that disagree while the command is on its way are ignored, one still
+    disagreeing ``grace`` seconds after the send reverts it through ``on_state``.
+    """
+
+    def __init__(self, send, on_state=None, grace=1.0, clock=time.monotonic):
+        self.send = send
+        self.on_state = on_state
+        self.grace = grace
+        self.clock = clock
+        self.confirmed = None
+        self.wanted = None
+        self.enqueued = 0
+        self.calls = 0
+        self.merged = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.reverted = 0
+        self.stale_confirmations = 0
+        self.sent_latency = {command: Histogram() for command in COMMANDS}
+        self.confirm_latency = {command: Histogram() for command in COMMANDS}
+        self._play = None
+        self._skip = 0
+        self._seek = None
+        self._queued_at = {}
+        self._futures = []
+        self._heading = None
+        self._awaiting_play = None
+        self._awaiting_track = None
+        self._worker = None
+        self._revert = None
+
+    @property
+    def playing(self) -> Optional[bool]:
+        """Play state to show: the wanted one while a command is pending, else the confirmed one"""
+        return self.wanted if self.wanted is not None else self.confirmed
+
+    @property
+    def pending(self):
+        return self._play is not None or self._skip != 0 or self._seek is not None
+
+    @property
+    def busy(self):
+        return self._worker is not None and not self._worker.done()
+
+    def play(self) -> asyncio.Future:
+        return self._set_play(True)
+
+    def pause(self) -> asyncio.Future:
+        return self._set_play(False)
+
+    def next(self) -> asyncio.Future:
+        return self._add_skip(1)
+
+    def previous(self) -> asyncio.Future:
+        return self._add_skip(-1)
+
+    def seek(self, seconds) -> asyncio.Future:
+        if self._seek is not None:
+            self.merged += 1
+        self._seek = seconds
+        return self._enqueue(SEEK)
+
+    def _set_play(self, playing) -> asyncio.Future:
+        if self._play is not None:
+            self.merged += 1
+        self._play = playing
+        self.wanted = playing
+        self._cancel_revert()
+        return self._enqueue(PLAY if playing else PAUSE)
+
+    def _add_skip(self, step) -> asyncio.Future:
+        if self._skip:
+            self.merged += 1
+        self._skip += step
+        if self._seek is not None:
+            # A seek into the track being skipped away from
+            self._seek = None
+            self.merged += 1
+        return self._enqueue(NEXT if step > 0 else PREVIOUS)
+
+    def _enqueue(self, command) -> asyncio.Future:
+        """Time the command and start the worker, the future resolves once its batch went out"""
+        self.enqueued += 1
+        self._queued_at[command] = self.clock()
+        future = asyncio.get_running_loop().create_future()
+        self._futures.append(future)
+        if not self.busy:
+            self._worker = asyncio.ensure_future(self._drain())
+        return future
+
+    async def _drain(self):
+        # Every enqueue adds a future, a batch that merged to nothing still resolves its clicks
+        while self._futures:
+            play, skip, seek = self._play, self._skip, self._seek
+            queued_at, futures = self._queued_at, self._futures
+            self._play, self._skip, self._seek = None, 0, None
+            self._queued_at, self._futures = {}, []
+            ok = True
+            if skip:
+                command = NEXT if skip > 0 else PREVIOUS
+                for _ in range(abs(skip)):
+                    ok = await self._send(command, queued_at[command]) and ok
+                self._awaiting_track = (command, queued_at[command])
+            if seek is not None:
+                ok = await self._send(SEEK, queued_at[SEEK], seek) and ok
+            if play is not None:
+                ok = await self._send_play(play, queued_at[PLAY if play else PAUSE]) and ok
+            for future in futures:
+                if not future.done():
+                    future.set_result(ok)
+
+    async def _send_play(self, playing, queued_at) -> bool:
+        heading = self._heading if self._heading is not None else self.confirmed
+        command = PLAY if playing else PAUSE
+        if playing == heading:
+            # The player is already there or on its way
+            self.cancelled += 1
+            if playing == self.confirmed and self._play is None:
+                self.wanted = None
+            return True
+        if not await self._send(command, queued_at):
+            if self._play is None:
+                self._settle()
+            return False
+        self._heading = playing
+        self._awaiting_play = (playing, queued_at)
+        self._cancel_revert()
+        self._revert = asyncio.get_running_loop().call_later(self.grace, self._check_confirmed)
+        return True
+
+    async def _send(self, command, queued_at, *args) -> bool:
+        try:
+            with tracer.span(f"transport.{command}", "transport"):
+                await self.send(command, *args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            log.warning("transport_failed", command=command, error=str(e))
+            return False
+        self.calls += 1
+        self.sent_latency[command].add((self.clock() - queued_at) * 1000)
+        return True
+
+    def confirm(self, playing) -> bool:
+        """Take the play state the player reports, return the state to show"""
+        self.confirmed = playing
+        if self.wanted is None:
+            self._heading = None
+            return playing
+        if playing != self.wanted:
+            self.stale_confirmations += 1
+            return self.wanted
+        if self._awaiting_play is not None and self._awaiting_play[0] == playing:
+            command = PLAY if playing else PAUSE
+            self.confirm_latency[command].add((self.clock() - self._awaiting_play[1]) * 1000)
+            self._awaiting_play = None
+        if self._play is None:
+            self._heading = None
+            self.wanted = None
+            self._cancel_revert()
+        return playing
+
+    def track_changed(self):
+        """The player reports a new track, which confirms a skip sent before it"""
+        if self._awaiting_track is not None:
+            command, queued_at = self._awaiting_track
+            self.confirm_latency[command].add((self.clock() - queued_at) * 1000)
+            self._awaiting_track = None
+
+    def _check_confirmed(self):
+        self._revert = None
+        if self.wanted is None or self._play is not None or self.wanted == self.confirmed:
+            return
+        self.reverted += 1
+        log.info("transport_reverted", wanted=self.wanted, confirmed=self.confirmed)
+        self._settle()
+
+    def _settle(self):
+        """Drop the wanted state and show the confirmed one again"""
+        self.wanted = None
+        self._heading = None
+        self._awaiting_play = None
+        if self.on_state is not None and self.confirmed is not None:
+            result = self.on_state(self.confirmed)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+
+    def _cancel_revert(self):
+        if self._revert is not None:
+            self._revert.cancel()
+            self._revert = None
+
+    async def flush(self):
+        """Wait until every queued command went out"""
+        while self.busy:
+            await asyncio.wait([self._worker])
+
+    def stats(self) -> dict:
+        return {
+            'enqueued': self.enqueued,
+            'calls': self.calls,
+            'merged': self.merged,
+            'cancelled': self.cancelled,
+            'failed': self.failed,
+            'reverted': self.reverted,
+            'stale_confirmations': self.stale_confirmations,
+            'sent_latency': {command: histogram.summary()
+                             for command, histogram in self.sent_latency.items() if histogram.count},
+            'confirm_latency': {command: histogram.summary()
+                                for command, histogram in self.confirm_latency.items() if histogram.count},
+        }
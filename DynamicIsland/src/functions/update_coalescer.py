@@ -0,0 +1,95 @@
+import time
+from contextlib import contextmanager
+from functions.instrumentation import tracer
+
+
+class UpdateCoalescer:
+    """Collects Flet control property changes and sends them in one page update per flush.
+
+    Assignments that do not change a value are dropped, so a frame where nothing moved
+    costs no message at all.
+    """
+
+    def __init__(self, page=None, clock=time.monotonic):
+        self.page = page
+        self.clock = clock
+        self.messages_sent = 0
+        self.controls_sent = 0
+        self.changes_applied = 0
+        self.changes_dropped = 0
+        self.messages_per_second = 0
+        self._dirty = {}
+        self._batch_depth = 0
+        self._window_start = clock()
+        self._window_messages = 0
+
+    def set(self, control, **props) -> bool:
+        """Assign properties on a control, return True if any of them changed"""
+        changed = False
+        for name, value in props.items():
+            if getattr(control, name, None) == value:
+                self.changes_dropped += 1
+                continue
+            setattr(control, name, value)
+            self.changes_applied += 1
+            changed = True
+        if changed:
+            self._dirty[id(control)] = control
+        return changed
+
+    def mark(self, control):
+        """Queue a control whose content was replaced rather than assigned through set()"""
+        self.changes_applied += 1
+        self._dirty[id(control)] = control
+
+    @property
+    def pending(self):
+        return len(self._dirty)
+
+    @contextmanager
+    def batch(self):
+        """Defer every flush() inside the block to a single one when it exits"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> int:
+        """Send every queued control in a single update, return how many were sent"""
+        if not self._dirty or self._batch_depth:
+            return 0
+        controls = list(self._dirty.values())
+        page = self.page or next((c.page for c in controls if c.page is not None), None)
+        if page is None:
+            # Not mounted yet, the first page.add() will render the current values
+            self._dirty.clear()
+            return 0
+        self._dirty.clear()
+        started = time.perf_counter_ns() if tracer.enabled else 0
+        page.update(*controls)
+        if started:
+            tracer.complete("flet.update", "ui", started)
+        self._count_message(len(controls))
+        return len(controls)
+
+    def _count_message(self, controls):
+        self.messages_sent += 1
+        self.controls_sent += controls
+        now = self.clock()
+        if now - self._window_start >= 1.0:
+            self.messages_per_second = self._window_messages / (now - self._window_start)
+            self._window_start = now
+            self._window_messages = 0
+        self._window_messages += 1
+
+    def stats(self) -> dict:
+        return {
+            'messages_sent': self.messages_sent,
+            'controls_sent': self.controls_sent,
+            'changes_applied': self.changes_applied,
+            'changes_dropped': self.changes_dropped,
+            'messages_per_second': self.messages_per_second,
+        }
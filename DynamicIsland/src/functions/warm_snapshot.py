@@ -0,0 +1,196 @@
+"""Last shown island state on disk, so the next launch can paint it before any media API is up.
+
+Layout (little endian):
+    header  magic b"DISS", version u16, metadata length u32
+    meta    UTF-8 JSON: track identity, playback status, colors, island mode, blob sizes
+    blobs   cover thumbnail JPEG then backdrop JPEG
+
+Only the small processed images are kept, the full-size cover is picked up from the
+cover store when its file is still there.
+"""
+import asyncio
+import json
+import os
+import struct
+import time
+from typing import Optional
+from functions.app_paths import app_data_dir, make_private_dir
+from functions.cover_cache import CoverArt
+from functions.cover_store import COVER_DIR
+from functions.track_state import TrackState
+from functions.log import get_logger
+
+log = get_logger("snapshot")
+
+MAGIC = b"DISS"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+SNAPSHOT_PATH = os.path.join(app_data_dir(), "snapshot.bin")
+MAX_BYTES = 64 * 1024
+
+
+class Snapshot:
+    """What a snapshot restores: the track with its cover, and the island mode"""
+    __slots__ = ("track", "mode", "saved_at", "size")
+
+    def __init__(self, track: Optional[TrackState], mode, saved_at=None, size=0):
+        self.track = track
+        self.mode = mode
+        self.saved_at = saved_at
+        self.size = size
+
+    @property
+    def cover(self) -> Optional[CoverArt]:
+        return self.track.cover if self.track is not None else None
+
+
+def encode(track: Optional[TrackState], mode, max_bytes=MAX_BYTES) -> bytes:
+    """Serialize a snapshot, dropping the backdrop and then the whole cover to stay under max_bytes"""
+    cover = track.cover if track is not None else None
+    blobs = [cover.thumbnail_jpeg, cover.backdrop_jpeg or b""] if cover is not None else []
+    while True:
+        meta = {'mode': mode, 'saved_at': time.time()}
+        if track is not None:
+            meta['track'] = {
+                'session_id': track.session_id, 'title': track.title, 'artist': track.artist,
+                'album': track.album, 'status': track.status, 'duration': track.duration,
+            }
+        if blobs:
+            meta['cover'] = {'key': cover.key, 'contrast_color': cover.contrast_color,
+                             'palette': cover.palette, 'blobs': [len(blob) for blob in blobs]}
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        data = HEADER.pack(MAGIC, VERSION, len(meta_bytes)) + meta_bytes + b"".join(blobs)
+        if len(data) <= max_bytes or not blobs:
+            return data
+        blobs = blobs[:-1]
+
+
+def decode(data: bytes, cover_dir=COVER_DIR) -> Optional[Snapshot]:
+    """Parse a snapshot, None when it is from another version or damaged"""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, meta_size = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        log.info("snapshot_skipped", version=version, expected=VERSION)
+        return None
+    offset = HEADER.size + meta_size
+    meta = json.loads(data[HEADER.size:offset].decode("utf-8"))
+    track = None
+    if 'track' in meta:
+        info = meta['track']
+        track = TrackState(info['session_id'], info['title'], info['artist'], info['album'],
+                           _decode_cover(meta.get('cover'), data, offset, cover_dir),
+                           info['status'], 0.0, info['duration'])
+    return Snapshot(track, meta['mode'], meta.get('saved_at'), len(data))
+
+
+def _decode_cover(meta, data, offset, cover_dir) -> Optional[CoverArt]:
+    if meta is None:
+        return None
+    sizes = meta.get('blobs') or []
+    blobs = []
+    for size in sizes:
+        blobs.append(data[offset:offset + size])
+        offset += size
+    if offset > len(data):
+        raise ValueError("truncated snapshot")
+    thumbnail = blobs[0] if blobs else None
+    if not thumbnail:
+        return None
+    cover = CoverArt(meta['key'], thumbnail, thumbnail, meta['contrast_color'], meta['palette'],
+                     backdrop_jpeg=blobs[1] if len(blobs) > 1 and blobs[1] else None)
+    # Files the cover store kept from the last run, served by path like fresh covers
+    for attribute, name in (("src", f"{cover.key}.jpg"), ("thumbnail_src", f"{cover.key}_thumb.jpg"),
+                            ("backdrop_src", f"{cover.key}_backdrop.jpg")):
+        path = os.path.join(cover_dir, name)
+        if os.path.exists(path):
+            setattr(cover, attribute, path)
+    return cover
+
+
+class WarmSnapshot:
+    """Loads the snapshot at startup and rewrites it, debounced and atomically, on changes"""
+
+    def __init__(self, path=SNAPSHOT_PATH, max_bytes=MAX_BYTES, delay=1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.delay = delay
+        self.writes = 0
+        self.skipped = 0
+        self.bytes_written = 0
+        self._saved = None
+        self._task = None
+
+    def load(self) -> Optional[Snapshot]:
+        """Read the snapshot, cheap enough to run before the first paint"""
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read(self.max_bytes + 1)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            log.warning("snapshot_unreadable", error=str(e))
+            return None
+        if len(data) > self.max_bytes:
+            log.warning("snapshot_too_large", path=self.path, max_bytes=self.max_bytes)
+            return None
+        try:
+            snapshot = decode(data)
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            log.warning("snapshot_damaged", error=str(e))
+            return None
+        if snapshot is not None:
+            self._saved = self._identity(snapshot.track, snapshot.mode)
+        return snapshot
+
+    @staticmethod
+    def _identity(track: Optional[TrackState], mode):
+        if track is None:
+            return None, mode
+        return (track.media_key, track.cover_key, track.status, track.duration), mode
+
+    def schedule(self, track: Optional[TrackState], mode) -> Optional[asyncio.Task]:
+        """Save after delay unless a newer state replaces it, unchanged states are skipped"""
+        if self._identity(track, mode) == self._saved:
+            self.skipped += 1
+            return None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = asyncio.ensure_future(self._save_later(track, mode))
+        return self._task
+
+    async def _save_later(self, track, mode):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        identity = self._identity(track, mode)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.write, track, mode)
+        except OSError as e:
+            log.warning("snapshot_write_failed", error=str(e))
+            return
+        self._saved = identity
+
+    def write(self, track: Optional[TrackState], mode) -> int:
+        """Encode and replace the snapshot file atomically, return its size"""
+        data = encode(track, mode, self.max_bytes)
+        make_private_dir(os.path.dirname(self.path))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, self.path)
+        self.writes += 1
+        self.bytes_written += len(data)
+        return len(data)
+
+    async def flush(self):
+        """Wait for a scheduled save"""
+        if self._task is not None and not self._task.done():
+            await asyncio.wait([self._task])
+
+    def stats(self) -> dict:
+        return {
+            'writes': self.writes,
+            'skipped': self.skipped,
+            'bytes_written': self.bytes_written,
+        }
@@ -0,0 +1,60 @@
+import win32con
+import win32gui
+from ctypes import windll
+from functions.island_window import IslandWindow
+from functions.log import get_logger
+
+log = get_logger("win32_window")
+
+# Extended styles of each window before the overlay style replaced them
+original_styles = {}
+
+
+class Win32IslandWindow(IslandWindow):
+    """IslandWindow on a Win32 HWND, regions are set with SetWindowRgn"""
+
+    name = "win32"
+
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+        self.user32 = windll.user32
+        self.gdi32 = windll.gdi32
+        # Flet sizes are logical pixels, window regions are physical ones
+        try:
+            self.scale = self.user32.GetDpiForWindow(hwnd) / 96 or 1.0
+        except AttributeError:
+            self.scale = 1.0
+
+    def screen_width(self):
+        return self.user32.GetSystemMetrics(0)
+
+    def apply_overlay_style(self):
+        if self.hwnd not in original_styles:
+            original_styles[self.hwnd] = win32gui.GetWindowLong(self.hwnd, win32con.GWL_EXSTYLE)
+
+        styles = original_styles[self.hwnd]
+        styles |= win32con.WS_EX_LAYERED | win32con.WS_EX_NOACTIVATE | win32con.WS_EX_TOOLWINDOW
+        styles &= ~win32con.WS_EX_APPWINDOW
+
+        win32gui.SetWindowLong(self.hwnd, win32con.GWL_EXSTYLE, styles)
+        win32gui.SetLayeredWindowAttributes(self.hwnd, 0, 255, win32con.LWA_ALPHA)
+        self.user32.SetWindowPos(
+            self.hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0,
+            win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
+        )
+
+    def set_region(self, region):
+        scale = self.scale
+        diameter = round(2 * region.radius * scale)
+        # A round rect reaching one diameter above the window, so only its bottom corners show
+        handle = self.gdi32.CreateRoundRectRgn(
+            round(region.left * scale), round(region.top * scale) - diameter,
+            round(region.right * scale), round(region.bottom * scale),
+            diameter, diameter
+        )
+        try:
+            win32gui.SetWindowRgn(self.hwnd, handle, True)
+        except Exception as e:
+            # The window owns the region only once SetWindowRgn succeeded
+            self.gdi32.DeleteObject(handle)
+            log.error("set_region_failed", error=str(e))
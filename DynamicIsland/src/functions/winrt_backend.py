@@ -0,0 +1,196 @@
+from winrt.windows.media.control import (
+    GlobalSystemMediaTransportControlsSessionManager as SessionManager,
+)
+from winrt.windows.storage.streams import Buffer, InputStreamOptions
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from functions.media_backend import MediaBackend
+from functions.media_events import (
+    MediaEventSource, SESSIONS_CHANGED,
+    MEDIA_PROPERTIES_CHANGED, PLAYBACK_INFO_CHANGED, TIMELINE_CHANGED
+)
+from functions.log import get_logger
+
+log = get_logger("winrt")
+
+
+class WinRTEventSource(MediaEventSource):
+    """Push notifications from the Windows global media transport controls"""
+
+    def __init__(self, backend=None):
+        super().__init__()
+        self.backend = backend
+        self.manager = None
+        self.session = None
+        self._manager_token = None
+        self._session_tokens = {}
+
+    async def start(self) -> bool:
+        try:
+            self.manager = await (self.backend.get_manager() if self.backend else SessionManager.request_async())
+            self._manager_token = self.manager.add_sessions_changed(
+                lambda sender, args: self.notify(SESSIONS_CHANGED)
+            )
+            return True
+        except Exception as e:
+            log.warning("media_events_unavailable", error=str(e))
+            self.manager = None
+            return False
+
+    def bind_session(self, session):
+        self.bind_sessions([session] if session else [])
+
+    def bind_sessions(self, sessions):
+        """Subscribe to sessions that are new in the list, drop the ones that left it"""
+        wanted = {}
+        for session in sessions:
+            try:
+                wanted[session.source_app_user_model_id] = session
+            except Exception:
+                continue
+        for session_id in [i for i in self._session_tokens if i not in wanted]:
+            self._unsubscribe(self._session_tokens.pop(session_id))
+        for session_id, session in wanted.items():
+            if session_id not in self._session_tokens:
+                self._session_tokens[session_id] = self._subscribe(session_id, session)
+        self.session = sessions[0] if sessions else None
+
+    def _subscribe(self, session_id, session) -> list:
+        try:
+            return [
+                (session.remove_media_properties_changed, session.add_media_properties_changed(
+                    lambda sender, args: self.notify(MEDIA_PROPERTIES_CHANGED, session_id))),
+                (session.remove_playback_info_changed, session.add_playback_info_changed(
+                    lambda sender, args: self.notify(PLAYBACK_INFO_CHANGED, session_id))),
+                (session.remove_timeline_properties_changed, session.add_timeline_properties_changed(
+                    lambda sender, args: self.notify(TIMELINE_CHANGED, session_id))),
+            ]
+        except Exception as e:
+            log.error("session_subscribe_failed", session=session_id, error=str(e))
+            return []
+
+    @staticmethod
+    def _unsubscribe(tokens):
+        for remove, token in tokens:
+            try:
+                remove(token)
+            except Exception:
+                pass
+
+    def _unbind_session(self):
+        for tokens in self._session_tokens.values():
+            self._unsubscribe(tokens)
+        self._session_tokens = {}
+        self.session = None
+
+    async def stop(self):
+        self._unbind_session()
+        if self.manager and self._manager_token is not None:
+            try:
+                self.manager.remove_sessions_changed(self._manager_token)
+            except Exception:
+                pass
+        self._manager_token = None
+        self.manager = None
+
+
+class WinRTMediaBackend(MediaBackend):
+    """Windows global system media transport controls"""
+
+    name = "winrt"
+
+    def __init__(self):
+        self.manager = None
+        self._events = WinRTEventSource(self)
+
+    def events(self) -> MediaEventSource:
+        return self._events
+
+    async def get_manager(self) -> SessionManager:
+        """The session manager, requested once and shared with the event source"""
+        if self.manager is None:
+            self.manager = await SessionManager.request_async()
+        return self.manager
+
+    async def get_sessions(self) -> list:
+        manager = await self.get_manager()
+        sessions = manager.get_sessions()
+        return list(sessions) if sessions else []
+
+    def is_disconnect(self, error: Exception) -> bool:
+        # "The RPC server is unavailable" after the media service restarts
+        return "RPC server" in str(error)
+
+    async def reconnect(self):
+        self.manager = None
+        if self._events.manager is not None:
+            # Subscriptions died with the old manager
+            await self._events.stop()
+            await self._events.start()
+
+    def session_id(self, session) -> str:
+        return session.source_app_user_model_id
+
+    def playback_status(self, session) -> str:
+        return session.get_playback_info().playback_status.name
+
+    async def media_properties(self, session) -> Optional[dict]:
+        info = await session.try_get_media_properties_async()
+        if not info:
+            return None
+        return {
+            'title': info.title,
+            'artist': info.artist,
+            'album': info.album_title,
+        }
+
+    async def thumbnail_bytes(self, session) -> Optional[bytes]:
+        media_info = await session.try_get_media_properties_async()
+        if not media_info or not media_info.thumbnail:
+            return None
+        stream = await media_info.thumbnail.open_read_async()
+        buffer = Buffer(stream.size)
+        await stream.read_async(buffer, stream.size, InputStreamOptions.READ_AHEAD)
+        data = bytes(buffer)
+        stream.close()
+        return data
+
+    def timeline(self, session) -> Optional[Tuple[float, float]]:
+        timeline = session.get_timeline_properties()
+        return timeline.position.total_seconds(), timeline.end_time.total_seconds()
+
+    def timeline_age(self, session) -> float:
+        # Players update the timeline every few seconds at most, position is as of last_updated_time
+        try:
+            updated = session.get_timeline_properties().last_updated_time
+            return max(0.0, (datetime.now(timezone.utc) - updated).total_seconds())
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+
+    def playback_rate(self, session) -> float:
+        return session.get_playback_info().playback_rate or 1.0
+
+    def session_volume(self, session) -> Optional[float]:
+        playback_info = session.get_playback_info()
+        # Some sessions may expose volume info via playback_info
+        if hasattr(playback_info, 'playback_volume'):
+            # Not standard, but check if available
+            return float(playback_info.playback_volume)
+        # Windows GlobalSystemMediaTransportControlsSession does not expose per-session volume directly
+        # so this may not be available for all apps
+        return None
+
+    async def play(self, session):
+        await session.try_play_async()
+
+    async def pause(self, session):
+        await session.try_pause_async()
+
+    async def next_track(self, session):
+        await session.try_skip_next_async()
+
+    async def previous_track(self, session):
+        await session.try_skip_previous_async()
+
+    async def seek(self, session, seconds: float):
+        await session.try_change_playback_position_async(int(seconds * 10_000_000))
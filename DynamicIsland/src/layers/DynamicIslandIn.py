@@ -1,27 +1,47 @@
 from layers.music import SoundControl
+from layers.notification_card import NotificationCard
+from functions.notification_queue import NotificationBatch
+from functions.update_coalescer import UpdateCoalescer
 import flet as ft
 
 
 class DynamicIislandIn(ft.Container):
     """Container for the dynamic island with animations"""
-    def __init__(self):
+    def __init__(self, updates: UpdateCoalescer = None, live_blur=False):
         super().__init__()
+        self.updates = updates or UpdateCoalescer()
         self.opacity = 0
         self.bgcolor = "black"
         self.animate_param = ft.Animation(duration=300, curve=ft.AnimationCurve.LINEAR_TO_EASE_OUT)
         self.animate_opacity = self.animate_param
         self.animate = self.animate_param
-        self.content = SoundControl()
+        self.sound = SoundControl(updates=self.updates, live_blur=live_blur)
+        self.card = NotificationCard(updates=self.updates)
+        self.content = ft.Stack([self.sound, self.card])
         self.alignment = ft.alignment.center 
     
 
     async def animate_layer(self, show: bool = True):
-        if show:
-            self.opacity = 1
-        else:
-            self.opacity = 0
-        self.update()
+        self.updates.set(self, opacity=1 if show else 0)
+        self.updates.flush()
     
     async def change_bgcolor(self, bgcolor: str):
-        self.bgcolor = bgcolor
-        self.update()
\ No newline at end of file
+        self.updates.set(self, bgcolor=bgcolor)
+        self.updates.flush()
+
+    def show_notification(self, batch: NotificationBatch):
+        """Cover the media controls with a notification"""
+        with self.updates.batch():
+            self.updates.set(self.sound, visible=False)
+            self.updates.set(self, bgcolor="black", opacity=1)
+            self.card.show(batch)
+
+    def hide_notification(self, media_bgcolor=None):
+        """Put the media controls back, or fade out when there is no media to show"""
+        with self.updates.batch():
+            self.card.hide()
+            self.updates.set(self.sound, visible=True)
+            if media_bgcolor is None:
+                self.updates.set(self, opacity=0)
+            else:
+                self.updates.set(self, bgcolor=media_bgcolor)
@@ -0,0 +1,16 @@
+from functions.cover_cache import CoverArt
+
+
+def cover_image_props(cover: CoverArt, thumbnail=False) -> dict:
+    """ft.Image source arguments for a cover: the stored file when there is one, base64 otherwise"""
+    if cover.src:
+        # Only the path goes over the Flet channel
+        return {'src': cover.thumbnail_src if thumbnail else cover.src, 'src_base64': None}
+    return {'src': None, 'src_base64': cover.thumbnail_base64 if thumbnail else cover.base64}
+
+
+def backdrop_image_props(cover: CoverArt) -> dict:
+    """ft.Image source arguments for the pre-blurred backdrop of a cover"""
+    if cover.backdrop_src:
+        return {'src': cover.backdrop_src, 'src_base64': None}
+    return {'src': None, 'src_base64': cover.backdrop_base64}
@@ -1,120 +1,146 @@
-import base64
-import io
 import flet as ft
-from PIL import Image
+from functions.cover_cache import CoverArt
+from functions.update_coalescer import UpdateCoalescer
+from layers.cover_image import cover_image_props, backdrop_image_props
+from layers.session_switcher import SessionSwitcher
+from layers.progress_bar import ProgressBar
 
 class SoundControl(ft.Container):
     """Container for sound control buttons"""
 
-    def __init__(self, music_cover_base64 = None,on_pause=None,on_play=None, on_next=None, on_prev=None):
+    def __init__(self, music_cover_base64 = None,on_pause=None,on_play=None, on_next=None, on_prev=None,
+                 updates: UpdateCoalescer = None, live_blur=False):
         super().__init__()
+        self.updates = updates or UpdateCoalescer()
+        # Live blur runs a 50 sigma blur on every frame, the default shows the backdrop made by the image pipeline
+        self.live_blur = live_blur
         self.music_cover_base64 = music_cover_base64
+        self.cover = None
         self.clip_behavior = ft.ClipBehavior.ANTI_ALIAS_WITH_SAVE_LAYER
         self.is_playing = False
         self.on_pause = on_pause
         self.on_play = on_play
         self.on_next = on_next
         self.on_prev = on_prev
+        self.on_select_session = None
+        self.on_seek = None
+        # Created once, its ticker keeps running across content rebuilds
+        self.progress = ProgressBar(on_seek=self.__on_seek, updates=self.updates)
         self.content = self.__content()
        
     
-    def setup_callbacks(self, on_play=None, on_next=None, on_prev=None, on_pause=None):
-        print(on_play)
+    def setup_callbacks(self, on_play=None, on_next=None, on_prev=None, on_pause=None, on_select_session=None,
+                        on_seek=None):
         self.on_play = on_play
         self.on_pause = on_pause
         self.on_next = on_next
         self.on_prev = on_prev
+        self.on_select_session = on_select_session
+        self.on_seek = on_seek
         self.content = self.__content()
         self.update()
     
     def toggle_functions_play_pause(self, is_playing):
         if is_playing:
-            self.play_pause.content.name = ft.Icons.PAUSE
-            self.play_pause.on_click = self.__on_pause
+            self.updates.set(self.play_pause.content, name=ft.Icons.PAUSE)
+            self.updates.set(self.play_pause, on_click=self.__on_pause)
             self.is_playing = False
         else:
-            self.play_pause.content.name = ft.Icons.PLAY_ARROW
-            self.play_pause.on_click = self.__on_play
+            self.updates.set(self.play_pause.content, name=ft.Icons.PLAY_ARROW)
+            self.updates.set(self.play_pause, on_click=self.__on_play)
             self.is_playing = True
-        self.play_pause.update()
+        self.updates.flush()
     
     
     def __on_play(self, e):
+        """Show the pause button at once, the controller queues the command"""
         if self.on_play:
             self.is_playing = True
             self.toggle_functions_play_pause(self.is_playing)
-            async def on_play():
-                await self.on_play()
-            self.page.run_task(on_play)
+            self.page.run_task(self.on_play)
     def __on_pause(self, e):
         """Callback for pause button click."""
-        if self.on_play:
+        if self.on_pause:
             self.is_playing = False
             self.toggle_functions_play_pause(self.is_playing)
-            async def on_pause():
-                await self.on_pause()
-            self.page.run_task(on_pause)
+            self.page.run_task(self.on_pause)
     def __on_next(self, e):
         """Callback for next button click."""
         if self.on_next:
-            async def on_next():
-                await self.on_next()
-            self.page.run_task(on_next)
+            self.page.run_task(self.on_next)
     def __on_prev(self, e):
         """Callback for previous button click."""
         if self.on_prev:
-            async def on_prev():
-                await self.on_prev()
-            self.page.run_task(on_prev)
-
+            self.page.run_task(self.on_prev)
 
-    @staticmethod
-    def get_contrast_color(base64_image: str) -> str:
-        image_data = base64.b64decode(base64_image)
-        image = Image.open(io.BytesIO(image_data))
-        
-        image = image.convert("RGB")
-        width, height = image.size
-        
-        center_x, center_y = width // 2, height // 2
-        
-        square_size = 30
-        left = max(center_x - square_size // 2, 0)
-        top = max(center_y - square_size // 2, 0)
-        right = min(center_x + square_size // 2, width)
-        bottom = min(center_y + square_size // 2, height)
-        
-        cropped_image = image.crop((left, top, right, bottom))
-        pixels = list(cropped_image.getdata())
-        
-        avg_pixel = tuple(sum(channel) // len(pixels) for channel in zip(*pixels))
-        
-        brightness = (avg_pixel[0] * 0.299 + avg_pixel[1] * 0.587 + avg_pixel[2] * 0.114)
-        
-        color = 'black' if brightness > 150 else 'white,0.8'  # Порог можно настроить
-        return color
 
-    
     def change_color_buttons(self, color):
         """Change the color of the control buttons."""
-        self.play_pause.content.color = color
-        self.next_track.content.color = color
-        self.prev_track.content.color = color
-        self.next_track.content.update()
-        self.prev_track.content.update()
-        self.play_pause.content.update()
+        for button in (self.play_pause, self.next_track, self.prev_track):
+            self.updates.set(button.content, color=color)
+        self.progress.set_color(color)
+        self.updates.flush()
 
-    def change_music_cover(self, music_cover_base64):
-        self.music_cover_base64 = music_cover_base64
-        self.music_cover.content = ft.Image(src_base64=self.music_cover_base64)
-        self.image_bg_cover.src_base64 = self.music_cover_base64
-        self.image_bg_cover.update()
-        self.change_color_buttons(self.get_contrast_color(self.music_cover_base64))
-        self.music_cover.update()
+    def change_music_cover(self, cover: CoverArt):
+        """Show a cover processed by the image pipeline, no image work happens here"""
+        self.cover = cover
+        with self.updates.batch():
+            thumbnail = cover_image_props(cover, thumbnail=True)
+            current = self.music_cover.content
+            if (current.src, current.src_base64) != (thumbnail['src'], thumbnail['src_base64']):
+                self.music_cover.content = ft.Image(**thumbnail)
+                self.updates.mark(self.music_cover)
+            self.updates.set(self.image_bg_cover, **self.__background_props(cover))
+            self.change_color_buttons(cover.contrast_color)
     
+    def show_sessions(self, states: list, active_id):
+        """Refresh the session switcher chips"""
+        self.switcher.show_sessions(states, active_id)
+
+    def show_timeline(self, timeline):
+        """Follow the playback timeline of the active session after it resynced"""
+        self.progress.show(timeline)
+
+    async def __on_seek(self, seconds):
+        if self.on_seek:
+            await self.on_seek(seconds)
+
+    def __on_select_session(self, session_id):
+        if self.on_select_session:
+            self.on_select_session(session_id)
+
+    def __background_props(self, cover: CoverArt) -> dict:
+        if self.live_blur or not cover.backdrop_jpeg:
+            return cover_image_props(cover)
+        return backdrop_image_props(cover)
+
+    def __background(self):
+        background = self.__background_props(self.cover) if self.cover else {}
+        if not self.live_blur:
+            # Static pre-blurred image, nothing to blur at render time
+            self.image_bg_cover = ft.Image(width=500, height=500, fit=ft.ImageFit.FILL, gapless_playback=True, **background)
+            return ft.Stack([self.image_bg_cover], alignment=ft.alignment.center)
+        self.image_bg_cover = ft.Image(scale=10, **background)
+        return ft.Stack([
+            self.image_bg_cover,
+            ft.Container(
+                width=500,
+                height=500,
+                blur=ft.Blur(
+                    sigma_x=50,
+                    sigma_y=50,
+                    tile_mode=ft.BlurTileMode.REPEATED
+                ),
+            )
+        ],alignment=ft.alignment.center)
+
     def __content(self):
+        if self.cover:
+            cover_image = ft.Image(**cover_image_props(self.cover, thumbnail=True))
+        else:
+            cover_image = ft.Image(src_base64=self.music_cover_base64)
         self.music_cover = ft.Container(
-            ft.Image(src_base64=self.music_cover_base64),
+            cover_image,
             alignment=ft.alignment.center_left,
             border_radius=ft.border_radius.only(bottom_left=10)
         )
@@ -135,19 +161,8 @@ class SoundControl(ft.Container):
             on_click=self.__on_prev,
         )
 
-        self.image_bg_cover = ft.Image(scale=10)
-        self.stack_bg = ft.Stack([
-            self.image_bg_cover,
-            ft.Container(
-                width=500,
-                height=500,
-                blur=ft.Blur(
-                    sigma_x=50,
-                    sigma_y=50,
-                    tile_mode=ft.BlurTileMode.REPEATED
-                ),
-            )
-        ],alignment=ft.alignment.center)
+        self.stack_bg = self.__background()
+        self.switcher = SessionSwitcher(on_select=self.__on_select_session, updates=self.updates)
 
         self.whole_stack = ft.Stack([
             self.stack_bg,
@@ -158,7 +173,8 @@ class SoundControl(ft.Container):
                 self.play_pause,
                 self.next_track,    
             ],alignment=ft.MainAxisAlignment.CENTER),
-
+            ft.Container(self.switcher, right=6, top=4),
+            ft.Container(self.progress, left=56, bottom=2),
         ])
 
         return self.whole_stack
@@ -0,0 +1,33 @@
+import flet as ft
+from functions.notification_queue import NotificationBatch
+from functions.update_coalescer import UpdateCoalescer
+
+
+class NotificationCard(ft.Container):
+    """Notification view of the open island: the top notification, or "N new" and the apps for a burst"""
+
+    def __init__(self, updates: UpdateCoalescer = None):
+        # Positioned to fill the layer's stack, which keeps the media controls' size
+        super().__init__(left=0, top=0, right=0, bottom=0, visible=False,
+                         padding=ft.padding.only(left=24, right=24, top=18), alignment=ft.alignment.top_left)
+        self.updates = updates or UpdateCoalescer()
+        self.app = ft.Text("", size=11, color="white,0.6", max_lines=1)
+        self.title = ft.Text("", size=15, weight=ft.FontWeight.W_600, color="white", max_lines=1)
+        self.body = ft.Text("", size=12, color="white,0.8", max_lines=2, overflow=ft.TextOverflow.ELLIPSIS)
+        self.content = ft.Column([self.app, self.title, self.body], spacing=2, tight=True)
+
+    def show(self, batch: NotificationBatch):
+        """Show a batch, only texts that changed are sent"""
+        top = batch.top
+        with self.updates.batch():
+            if batch.count == 1 and top is not None:
+                self.updates.set(self.app, value=top.app_id)
+                self.updates.set(self.body, value=top.body)
+            else:
+                self.updates.set(self.app, value=", ".join(sorted(batch.apps)))
+                self.updates.set(self.body, value=top.title if top is not None else "")
+            self.updates.set(self.title, value=batch.title)
+            self.updates.set(self, visible=True)
+
+    def hide(self):
+        self.updates.set(self, visible=False)
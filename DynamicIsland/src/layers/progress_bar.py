@@ -0,0 +1,69 @@
+import asyncio
+import flet as ft
+from functions.playback_timeline import PlaybackTimeline
+from functions.update_coalescer import UpdateCoalescer
+
+BAR_WIDTH = 240
+# Redraws per second at most, and only when the thumb moved by a pixel or more
+MAX_FPS = 10
+
+
+class ProgressBar(ft.Container):
+    """Scrubbable track progress drawn from the local PlaybackTimeline, never from the backend"""
+
+    def __init__(self, on_seek=None, updates: UpdateCoalescer = None, width=BAR_WIDTH, max_fps=MAX_FPS):
+        super().__init__(width=width, height=16, visible=False)
+        self.slider = ft.Slider(
+            min=0, max=1, value=0,
+            active_color="white,0.8", inactive_color="white,0.2", thumb_color="white",
+            on_change_start=self.__on_change_start,
+            on_change_end=self.__on_change_end,
+        )
+        self.content = self.slider
+        self.updates = updates or UpdateCoalescer()
+        self.on_seek = on_seek
+        self.max_fps = max_fps
+        self.timeline = None
+        self.scrubbing = False
+        self.redraws = 0
+        self._ticker = None
+
+    def show(self, timeline: PlaybackTimeline):
+        """Follow a timeline after it resynced, drawing at once and ticking while it plays"""
+        self.timeline = timeline
+        self.updates.set(self, visible=timeline.duration > 0)
+        self.redraw()
+        if timeline.playing and (self._ticker is None or self._ticker.done()):
+            self._ticker = asyncio.get_running_loop().create_task(self.__tick())
+
+    def set_color(self, color):
+        self.updates.set(self.slider, active_color=color, thumb_color=color)
+
+    def redraw(self):
+        """Move the thumb to the predicted position when it moved by at least a pixel"""
+        if self.timeline is None or self.scrubbing:
+            return
+        value = self.timeline.fraction()
+        if abs(value - (self.slider.value or 0)) * self.width >= 1:
+            self.updates.set(self.slider, value=value)
+            self.redraws += 1
+        self.updates.flush()
+
+    async def __tick(self):
+        while self.timeline is not None and self.timeline.playing:
+            await asyncio.sleep(1 / self.max_fps)
+            self.redraw()
+
+    def __on_change_start(self, e):
+        self.scrubbing = True
+
+    def __on_change_end(self, e):
+        self.scrubbing = False
+        if self.timeline is None or self.timeline.duration <= 0:
+            return
+        seconds = e.control.value * self.timeline.duration
+        self.timeline.seek(seconds)
+        if self.on_seek:
+            async def on_seek():
+                await self.on_seek(seconds)
+            self.page.run_task(on_seek)
@@ -0,0 +1,57 @@
+import flet as ft
+from functions.track_state import TrackState
+from functions.update_coalescer import UpdateCoalescer
+from layers.cover_image import cover_image_props
+
+CHIP_SIZE = 14
+
+
+class SessionSwitcher(ft.Row):
+    """Row of small cover chips, one per media session, to pick what the island shows"""
+
+    def __init__(self, on_select=None, updates: UpdateCoalescer = None):
+        super().__init__(spacing=4, tight=True, visible=False)
+        self.updates = updates or UpdateCoalescer()
+        self.on_select = on_select
+        self.active_id = None
+        self.chips = {}
+        self.chip_keys = {}
+
+    def __chip(self, session_id):
+        return ft.Container(
+            width=CHIP_SIZE,
+            height=CHIP_SIZE,
+            border_radius=CHIP_SIZE / 2,
+            clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
+            bgcolor="white,0.3",
+            on_click=lambda e: self.__on_click(session_id),
+        )
+
+    def __on_click(self, session_id):
+        if self.on_select:
+            # Clicking the session already shown goes back to following the playing one
+            self.on_select(None if session_id == self.active_id else session_id)
+
+    def show_sessions(self, states: list, active_id):
+        """Sync chips with the session list, only chips whose session changed are touched"""
+        self.active_id = active_id
+        with self.updates.batch():
+            ids = [state.session_id for state in states]
+            if ids != list(self.chips):
+                self.chips = {session_id: self.chips.get(session_id) or self.__chip(session_id) for session_id in ids}
+                self.chip_keys = {i: key for i, key in self.chip_keys.items() if i in self.chips}
+                self.controls = list(self.chips.values())
+                self.updates.mark(self)
+            self.updates.set(self, visible=len(states) > 1)
+            for state in states:
+                self.__sync_chip(state, state.session_id == active_id)
+
+    def __sync_chip(self, state: TrackState, active: bool):
+        chip = self.chips[state.session_id]
+        if self.chip_keys.get(state.session_id) != state.cover_key:
+            self.chip_keys[state.session_id] = state.cover_key
+            chip.content = ft.Image(fit=ft.ImageFit.COVER, **cover_image_props(state.cover, thumbnail=True)) if state.cover else None
+            self.updates.mark(chip)
+        self.updates.set(chip, tooltip=f"{state.title} - {state.artist}",
+                         border=ft.border.all(1.5, "white") if active else None,
+                         opacity=1 if state.is_playing or active else 0.6)
@@ -1,109 +1,142 @@
 import asyncio
-import time
-import flet as ft
-import win32gui
-import win32con
-import ctypes
-from ctypes import windll
-from functions.media_checker import MediaPlayerController
-from dynamic_island.DynamicIslandClass import ControlDynamicIsland
+import os
+from functions.startup_profile import startup
+from functions.log import configure_logging, get_logger
+from functions.warm_snapshot import WarmSnapshot
+from functions.island_state import MEDIA, COLLAPSED
+from functions.hit_region import WINDOW_WIDTH
+from functions.notification_center import NotificationCenter
+from functions.notification_sources import FileNotificationSource
+
+# Only what the collapsed island needs is imported here, the media stack (PIL, NumPy,
+# WinRT) and the Win32 bindings load once the window is up
+with startup.phase("import_ui"):
+    import flet as ft
+    from dynamic_island.DynamicIslandClass import ControlDynamicIsland
+
+log = get_logger("main")
 
 def find_window_by_name(window_name):
+    import win32gui
     return win32gui.FindWindow(None, window_name)
 
-original_styles = {}
+# Set to 1 to blur the cover at render time instead of showing the pre-blurred backdrop
+LIVE_BLUR = os.environ.get("DYNAMIC_ISLAND_LIVE_BLUR") == "1"
+# Set to 0 to start empty instead of painting the snapshot of the last run
+WARM_START = os.environ.get("DYNAMIC_ISLAND_WARM_START", "1") == "1"
+# JSON lines file to follow for notifications, one {"app", "title", "body", "priority"} per line
+NOTIFICATION_FILE = os.environ.get("DYNAMIC_ISLAND_NOTIFICATIONS")
 
 class MainApp:
     def __init__(self, page: ft.Page):
         self.page = page
-        self.init_page()
+        self.hwnd = None
+        self.controller = None
+        self.notifications = None
+        self.snapshot = WarmSnapshot()
+        with startup.phase("init_page"):
+            self.init_page()
         self.page.run_task(self.main)
     
     def init_page(self):
         self.page.window.frameless = True
         self.page.window.skip_task_bar = True
         self.page.window.height = 500
-        self.page.window.width = 500
+        self.page.window.width = WINDOW_WIDTH
         self.page.window.resizable = False
-        self.page.title = "Dynamic Island"
-
-        self.page.update()
-        time.sleep(1)
-        
         self.page.window.always_on_top = True
+        self.page.title = "Dynamic Island"
         self.page.bgcolor = 'transparent'
         self.page.window.bgcolor = 'transparent'
         self.page.padding = 0
         self.page.update()
 
-        self.hwnd = find_window_by_name(self.page.title)
-        self.setClickthrough()
+    async def wait_for_window(self, timeout=5.0, step=0.01):
+        """Poll for the native window instead of sleeping a fixed second, None on timeout"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            hwnd = find_window_by_name(self.page.title)
+            if hwnd:
+                return hwnd
+            await asyncio.sleep(step)
+        log.warning("window_not_found", title=self.page.title, timeout=timeout)
+        return None
 
     def setClickthrough(self):
-        user32 = windll.user32
-        gdi32 = windll.gdi32
-        screen_width = user32.GetSystemMetrics(0)
-        
-        win_width = 500
-        center_win_x = screen_width // 2
-        win_rect_left = center_win_x - win_width // 2
-
-        self.page.window.left = win_rect_left
-        self.page.window.top = 0
-        self.page.update()
+        from functions.island_window import native_window
 
-        rect_width, rect_height = 300, 40
-        center_x = screen_width // 2
-        rect_left = center_x - rect_width // 2
-        
-        region_left = rect_left - win_rect_left
-        region_right = region_left + rect_width
-        region = gdi32.CreateRectRgn(region_left, 0, region_right, rect_height)
+        window = native_window(self.hwnd)
+        screen_width = window.screen_width()
+        if screen_width:
+            self.page.window.left = screen_width // 2 - WINDOW_WIDTH // 2
+            self.page.window.top = 0
+            self.page.update()
 
         try:
-            if self.hwnd not in original_styles:
-                original_styles[self.hwnd] = win32gui.GetWindowLong(self.hwnd, win32con.GWL_EXSTYLE)
-
-            styles = original_styles[self.hwnd]
-            styles |= win32con.WS_EX_LAYERED | win32con.WS_EX_NOACTIVATE | win32con.WS_EX_TOOLWINDOW
-            styles &= ~win32con.WS_EX_APPWINDOW
-            
-            win32gui.SetWindowLong(self.hwnd, win32con.GWL_EXSTYLE, styles)
-            win32gui.SetLayeredWindowAttributes(self.hwnd, 0, 255, win32con.LWA_ALPHA)
-            win32gui.SetWindowRgn(self.hwnd, region, True)
-            
-            user32.SetWindowPos(
-                self.hwnd, win32con.HWND_TOPMOST, 0, 0, 0, 0, 
-                win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
-            )
+            window.apply_overlay_style()
+            # The hit-test region follows the island from here on
+            self.app.attach_window(window)
         except Exception as e:
-            print(f"Error setting clickthrough: {e}")
+            log.error("clickthrough_failed", error=str(e))
 
     async def main(self):
-        self.controller = MediaPlayerController()
-        self.app = ControlDynamicIsland(controller_media=self.controller)
-        self.page.add(self.app)
-        self.page.update()
-        
+        with startup.phase("snapshot"):
+            snapshot = self.snapshot.load() if WARM_START else None
+        with startup.phase("island"):
+            self.app = ControlDynamicIsland(live_blur=LIVE_BLUR)
+            restored = snapshot is not None and self.app.restore_snapshot(snapshot)
+            self.page.add(self.app)
+        startup.mark("first_paint")
+        if restored:
+            startup.mark("first_content")
+
+        with startup.phase("window_style"):
+            self.hwnd = await self.wait_for_window()
+            if self.hwnd:
+                self.setClickthrough()
+
+        with startup.phase("media_backend"):
+            from functions.media_checker import MediaPlayerController
+            self.controller = MediaPlayerController()
+            self.app.attach_controller(self.controller)
+
+        with startup.phase("notifications"):
+            self.notifications = NotificationCenter(self.app.island_state)
+            if NOTIFICATION_FILE:
+                await self.notifications.attach(FileNotificationSource(NOTIFICATION_FILE))
+
         await self.start_monitoring_sound()
 
     async def start_monitoring_sound(self):
-        async def on_track_change(track_info, cover_base64):
-            if cover_base64:
-               await self.app.change_track(cover_base64)
+        async def on_track_change(track_info, cover):
+            startup.mark("first_track")
+            startup.report()
+            self.snapshot.schedule(self.controller.changes.state, MEDIA)
+            if cover:
+               await self.app.change_track(cover, switched=track_info['switched'])
 
         async def on_playback_state_change(is_playing):
             self.app.playing_pause(is_playing)
+            self.snapshot.schedule(self.controller.changes.state, MEDIA)
+
+        async def on_nothing():
+            startup.report()
+            self.snapshot.schedule(None, COLLAPSED)
+            await self.app.clear_track()
         
         try:
             await self.controller.monitor_track_changes(
                 change_callback=on_track_change,
                 playback_state_callback=on_playback_state_change,
-                on_nothing=self.app.reset_animation,
+                on_nothing=on_nothing,
+                sessions_callback=self.app.update_sessions,
+                timeline_callback=self.app.update_timeline,
                 interval=0.05
             )
-        except Exception as e:
-            print(f"Monitoring stopped due to error: {e}")
+        except Exception:
+            log.exception("monitoring_stopped")
 
 if __name__ == "__main__":
+    configure_logging()
     ft.app(target=MainApp,assets_dir="assets")
\ No newline at end of file
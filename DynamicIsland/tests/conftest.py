@@ -0,0 +1,53 @@
+import asyncio
+import os
+import selectors
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+# Keep the cover store and snapshot of the test runs out of the real app data directory
+os.environ["XDG_STATE_HOME"] = tempfile.mkdtemp(prefix="dynamic_island_tests_")
+
+
+class _JumpingSelector(selectors.DefaultSelector):
+    """Moves the loop's clock to the next timer instead of waiting for it"""
+
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled, only another thread can wake the loop
+            return super().select(None)
+        self.loop.now += timeout
+        return super().select(0)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time() only moves when every task waits on a timer"""
+
+    def __init__(self):
+        self.now = 0.0
+        super().__init__(selector=_JumpingSelector(self))
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def virtual_loop():
+    """A VirtualClockLoop, run coroutines with loop.run_until_complete"""
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    # Stop what outlives the test, such as the animation ticker
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    asyncio.set_event_loop(None)
+    loop.close()
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from animation_functions.AnimationManager import AnimationManager
+from animation_functions.animation_bundle import load_bundle
+from animation_functions.animation_curves import AnimationCurve
+
+TOLERANCE = 0.002
+# Knots are stored as float32
+FLOAT_SLACK = 1e-5
+
+BUNDLE = load_bundle()
+
+
+@pytest.mark.parametrize("name", BUNDLE.names())
+def test_fit_stays_within_tolerance_of_every_frame(name):
+    clip = BUNDLE.clip(name)
+    first_frame = BUNDLE.first_frame(name)
+    curve = AnimationCurve.fit(clip, first_frame, tolerance=TOLERANCE)
+    frames = np.arange(first_frame, first_frame + clip.shape[1])
+    width, height = curve.sample(frames)
+    error = max(np.abs(width - clip[0]).max(), np.abs(height - clip[1]).max())
+    assert error <= TOLERANCE + FLOAT_SLACK
+    assert len(curve) <= clip.shape[1]
+
+
+@pytest.mark.parametrize("name", BUNDLE.names())
+@pytest.mark.parametrize("fps", [60, 120])
+def test_render_matches_sample_at_its_frame_times(name, fps):
+    manager = AnimationManager(scale_factor=70, bundle=BUNDLE)
+    manager.load_animation(name, name)
+    frame_duration = 0.01
+    rendered = manager.render(name, fps, frame_duration)
+    curve = manager.get_curve(name)
+    assert rendered[0] == pytest.approx(manager.sample(name, curve.first_frame), abs=1e-3)
+    assert rendered[-1] == pytest.approx(manager.sample(name, curve.last_frame), abs=1e-3)
+    for index, row in enumerate(rendered):
+        position = min(curve.first_frame + index / fps / frame_duration, curve.last_frame)
+        assert tuple(row) == pytest.approx(manager.sample(name, position), abs=1e-3)
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from animation_functions.AnimationScheduler import AnimationScheduler
+
+FRAME = 1 / 60
+
+
+class LinearClips:
+    """Animation manager stand-in: clips of 61 frames moving linearly between two sizes"""
+
+    clips = {
+        "grow": ((100.0, 40.0), (200.0, 40.0)),
+        "wide": ((300.0, 80.0), (300.0, 80.0)),
+    }
+
+    def get_animation(self, name):
+        return self.clips.get(name)
+
+    def frame_count(self, name):
+        return 61
+
+    def sample(self, name, position):
+        (w0, h0), (w1, h1) = self.clips[name]
+        t = min(max((position - 1) / 60, 0.0), 1.0)
+        return w0 + (w1 - w0) * t, h0 + (h1 - h0) * t
+
+
+class Frames:
+    def __init__(self, loop):
+        self.loop = loop
+        self.applied = []
+        self.stall_at = None
+
+    def __call__(self, width, height):
+        self.applied.append((self.loop.time(), width, height))
+        if len(self.applied) == self.stall_at:
+            # This frame took 55 ms, three ticks go by
+            self.loop.now += 0.055
+
+
+def scheduler(loop, frames):
+    return AnimationScheduler(LinearClips(), frames, fps=60, blend_frames=6, clock=loop.time)
+
+
+def test_frames_are_paced_at_the_display_rate(virtual_loop):
+    frames = Frames(virtual_loop)
+    clips = scheduler(virtual_loop, frames)
+
+    async def scenario():
+        return await clips.play("grow", speed=FRAME)
+
+    assert virtual_loop.run_until_complete(scenario()) is True
+    times = [at for at, _, _ in frames.applied]
+    assert all(b - a == pytest.approx(FRAME) for a, b in zip(times, times[1:]))
+    assert frames.applied[-1][1:] == (200.0, 40.0)
+    assert clips.frames_dropped == 0
+
+
+def test_late_frames_are_skipped_and_counted(virtual_loop):
+    frames = Frames(virtual_loop)
+    frames.stall_at = 10
+    clips = scheduler(virtual_loop, frames)
+
+    async def scenario():
+        return await clips.play("grow", speed=FRAME)
+
+    assert virtual_loop.run_until_complete(scenario()) is True
+    assert clips.frames_dropped == 3
+    # The clip keeps its length, the ticks after the stall jump ahead instead of rendering late
+    assert len(frames.applied) == 61 - 3
+    assert frames.applied[-1][1:] == (200.0, 40.0)
+
+
+def test_preempting_clip_blends_from_the_current_size(virtual_loop):
+    frames = Frames(virtual_loop)
+    clips = scheduler(virtual_loop, frames)
+
+    async def scenario():
+        first = clips.play("grow", speed=FRAME)
+        await asyncio.sleep(0.25)
+        reached = frames.applied[-1][1]
+        mark = len(frames.applied)
+        second = clips.play("wide", speed=FRAME)
+        return await first, await second, reached, frames.applied[mark:]
+
+    first, second, reached, after = virtual_loop.run_until_complete(scenario())
+    assert (first, second) == (False, True)
+    assert clips.clips_preempted == 1
+    widths = [width for _, width, _ in after]
+    # No jump: the new clip starts near where the old one stopped and eases into its own size
+    assert reached < widths[0] <= reached + (300.0 - reached) * 2 / 6 + 1e-9
+    assert widths == sorted(widths)
+    assert len(widths) <= clips.blend_frames and widths[-1] == 300.0
+    assert after[-1][1:] == (300.0, 80.0)
@@ -0,0 +1,21 @@
+import os
+import stat
+from functions.cover_cache import cover_key
+from functions.cover_store import CoverStore
+
+
+def test_directory_is_private(tmp_path):
+    directory = tmp_path / "covers"
+    CoverStore(str(directory))
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+
+def test_only_cover_names_are_adopted(tmp_path):
+    key = cover_key(b"cover")
+    names = [f"{key}.jpg", f"{key}_thumb.jpg", f"{key}_backdrop.jpg",
+             "planted.jpg", f"{key}.jpg.123.tmp", f"{key}.png", f"{key.upper()}.jpg"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"data")
+    store = CoverStore(str(tmp_path))
+    assert sorted(name for name in names if name in store) == sorted(names[:3])
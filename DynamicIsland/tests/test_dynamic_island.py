@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+
+pytest.importorskip("flet")
+
+from dynamic_island.DynamicIslandClass import ControlDynamicIsland
+from functions.cover_cache import CoverArt
+from functions.island_state import COLLAPSED, MEDIA
+from functions.media_backend import PAUSED, PLAYING
+from functions.track_state import TrackState
+from functions.warm_snapshot import Snapshot
+
+
+def track(cover, status):
+    return TrackState("player", "Song", "Artist", "Album", cover, status, 0.0, 200.0)
+
+
+async def settle(island):
+    await island.transitions.settle()
+    await island.island_state.settle()
+
+
+def test_restored_track_shows_again_after_the_island_was_cleared():
+    cover = CoverArt("0" * 32, b"jpeg", b"jpeg", "white", ["#202020"])
+
+    async def scenario():
+        island = ControlDynamicIsland(track_debounce=0)
+        assert island.restore_snapshot(Snapshot(track(cover, PAUSED), MEDIA))
+        # Nothing plays at startup, the restored island collapses
+        await island.clear_track()
+        await settle(island)
+        assert island.island_state.mode == COLLAPSED
+        # The player starts the snapshot's track later on
+        await island.change_track(cover)
+        await settle(island)
+        return island
+
+    island = asyncio.run(scenario())
+    assert island.island_state.mode == MEDIA
+    assert island.shown_cover is cover
+    assert island.track_shown
+
+
+def test_skip_burst_ends_on_the_last_track_without_collapsing(virtual_loop):
+    covers = [CoverArt(f"{i:032x}", b"jpeg", b"jpeg", "white", ["#202020"]) for i in range(21)]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        island = ControlDynamicIsland(track_debounce=0.15)
+        island.scheduler.clock = loop.time
+        await island.change_track(covers[0])
+        await settle(island)
+        # 20 skips within 500 ms
+        for cover in covers[1:]:
+            await island.change_track(cover)
+            await asyncio.sleep(0.025)
+        last_change = loop.time() - 0.025
+        await settle(island)
+        island.scheduler.cancel()
+        return island, loop.time() - last_change
+
+    island, latency = virtual_loop.run_until_complete(scenario())
+    assert island.shown_cover is covers[-1]
+    assert island.track_shown
+    assert island.island_state.mode == MEDIA
+    # Debounce, one coalesce window and the 0.2 s reveal, the collapse sleeps are skipped
+    assert latency <= 0.15 + island.island_state.coalesce_window + 0.2 + 0.01
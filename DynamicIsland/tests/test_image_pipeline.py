@@ -0,0 +1,75 @@
+import asyncio
+import io
+import threading
+from PIL import Image
+from functions import image_pipeline
+from functions.cover_cache import cover_key
+from functions.image_pipeline import ImagePipeline
+
+
+def cover_bytes(color):
+    data = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(data, format="PNG")
+    return data.getvalue()
+
+
+FIRST, SECOND, THIRD = cover_bytes("red"), cover_bytes("green"), cover_bytes("blue")
+
+
+def hold_first_decode(monkeypatch):
+    """Block the decode of FIRST in its worker until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+    process_cover = image_pipeline.process_cover
+
+    def held(data, *args):
+        if data == FIRST:
+            started.set()
+            release.wait(5)
+        return process_cover(data, *args)
+
+    monkeypatch.setattr(image_pipeline, "process_cover", held)
+    return started, release
+
+
+def test_superseded_running_decode_still_fills_the_cache(monkeypatch):
+    started, release = hold_first_decode(monkeypatch)
+
+    async def scenario():
+        pipeline = ImagePipeline(max_workers=2)
+        older = asyncio.ensure_future(pipeline.process(FIRST))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        newer = asyncio.ensure_future(pipeline.process(SECOND))
+        await asyncio.sleep(0)
+        release.set()
+        result = await older, await newer
+        pipeline.shutdown()
+        return pipeline, result
+
+    pipeline, (older, newer) = asyncio.run(scenario())
+    assert older is None
+    assert newer.key == cover_key(SECOND)
+    assert cover_key(FIRST) in pipeline.cache
+    assert pipeline.processed == 2
+
+
+def test_superseded_queued_decode_is_dropped(monkeypatch):
+    started, release = hold_first_decode(monkeypatch)
+
+    async def scenario():
+        pipeline = ImagePipeline(max_workers=1)
+        first = asyncio.ensure_future(pipeline.process(FIRST))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        queued = asyncio.ensure_future(pipeline.process(SECOND))
+        await asyncio.sleep(0)
+        last = asyncio.ensure_future(pipeline.process(THIRD))
+        await asyncio.sleep(0)
+        release.set()
+        result = await first, await queued, await last
+        pipeline.shutdown()
+        return pipeline, result
+
+    pipeline, (first, queued, last) = asyncio.run(scenario())
+    assert queued is None
+    assert last.key == cover_key(THIRD)
+    assert cover_key(FIRST) in pipeline.cache
+    assert cover_key(SECOND) not in pipeline.cache
@@ -0,0 +1,141 @@
+import asyncio
+import random
+import pytest
+from functions.island_state import (
+    IslandStateMachine, COLLAPSED, HOVERED, MEDIA, MEDIA_HOVERED,
+    HOVER_ENTER, HOVER_EXIT, TRACK, SWITCH, CLEAR
+)
+
+
+async def run(initial, events):
+    """Post events one after another, return the actions that ran and the final mode"""
+    ran = []
+
+    def action(name):
+        async def run_action(payload):
+            ran.append((name, payload))
+        return run_action
+
+    names = ("show_track", "swap_track", "reset", "side_hovered", "side_unhovered")
+    machine = IslandStateMachine({name: action(name) for name in names}, initial=initial)
+    for event, payload in events:
+        await machine.post(event, payload)
+    return ran, machine.mode
+
+
+def test_switch_swaps_the_track_when_media_is_up():
+    for mode in (MEDIA, MEDIA_HOVERED):
+        ran, final = asyncio.run(run(mode, [(SWITCH, "b")]))
+        assert ran == [("swap_track", "b")]
+        assert final == mode
+
+
+def test_switch_on_the_collapsed_island_is_a_full_transition():
+    ran, final = asyncio.run(run(COLLAPSED, [(SWITCH, "b")]))
+    assert ran == [("show_track", "b")]
+    assert final == MEDIA
+
+
+def test_track_after_clear_is_a_full_transition_again():
+    ran, final = asyncio.run(run(MEDIA, [(CLEAR, None), (TRACK, "a")]))
+    assert ran == [("reset", None), ("show_track", "a")]
+    assert final == MEDIA
+
+
+class Clips:
+    """Actions that take duration seconds, recording starts, completions and overlaps"""
+
+    def __init__(self, duration=0.3):
+        self.duration = duration
+        self.started = []
+        self.completed = []
+        self.running = 0
+        self.max_running = 0
+
+    def action(self, name):
+        async def run(payload):
+            self.started.append((name, payload))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(self.duration)
+                self.completed.append((name, payload))
+            finally:
+                self.running -= 1
+        return run
+
+    def actions(self, *names):
+        return {name: self.action(name) for name in names}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hover_storm_starts_a_bounded_number_of_clips(virtual_loop, seed):
+    rng = random.Random(seed)
+    clips = Clips()
+    machine = IslandStateMachine(clips.actions("callback", "close"))
+    events = [rng.choice((HOVER_ENTER, HOVER_EXIT)) for _ in range(200)]
+
+    async def storm():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for event in events:
+            machine.post(event)
+            await asyncio.sleep(rng.uniform(0, 0.015))
+        elapsed = loop.time() - start
+        await machine.settle()
+        return elapsed
+
+    elapsed = virtual_loop.run_until_complete(storm())
+    # At most one clip per coalesce window, far fewer than events, never two at once
+    assert len(clips.started) <= elapsed / machine.coalesce_window + 1
+    assert len(clips.started) <= len(events) // 4
+    assert clips.max_running == 1
+    assert machine.mode == (HOVERED if events[-1] == HOVER_ENTER else COLLAPSED)
+
+
+def test_hover_while_transitioning_does_not_cancel_the_track(virtual_loop):
+    clips = Clips()
+    machine = IslandStateMachine(clips.actions("show_track", "side_hovered"))
+
+    async def scenario():
+        track = machine.post(TRACK, "a")
+        await asyncio.sleep(0.1)
+        hover = machine.post(HOVER_ENTER)
+        return await track, await hover
+
+    assert virtual_loop.run_until_complete(scenario()) == (True, True)
+    assert clips.completed == [("show_track", "a"), ("side_hovered", None)]
+    assert machine.stats()['interrupted'] == 0
+    assert machine.mode == MEDIA_HOVERED
+
+
+@pytest.mark.parametrize("event, payload, final", [(TRACK, "b", MEDIA), (CLEAR, None, COLLAPSED)])
+def test_media_event_supersedes_a_running_track(virtual_loop, event, payload, final):
+    clips = Clips()
+    machine = IslandStateMachine(clips.actions("show_track", "reset"))
+
+    async def scenario():
+        first = machine.post(TRACK, "a")
+        await asyncio.sleep(0.1)
+        second = machine.post(event, payload)
+        return await first, await second
+
+    assert virtual_loop.run_until_complete(scenario()) == (False, True)
+    assert clips.started[0] == ("show_track", "a")
+    assert ("show_track", "a") not in clips.completed
+    assert machine.stats()['interrupted'] == 1
+    assert machine.mode == final
+
+
+def test_cancelled_post_is_withdrawn(virtual_loop):
+    clips = Clips()
+    machine = IslandStateMachine(clips.actions("show_track"))
+
+    async def scenario():
+        machine.post(TRACK, "a").cancel()
+        await machine.settle()
+
+    virtual_loop.run_until_complete(scenario())
+    assert clips.started == []
+    assert machine.mode == COLLAPSED
+    assert machine.stats()['ignored'] == 1
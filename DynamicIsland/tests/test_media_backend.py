@@ -0,0 +1,27 @@
+import asyncio
+import pytest
+from functions import media_backend
+from functions.media_backend import MediaBackend, NullMediaBackend, default_backend
+
+
+def test_base_backend_is_abstract():
+    with pytest.raises(TypeError):
+        MediaBackend()
+
+
+def test_unsupported_platform_gets_the_null_backend(monkeypatch):
+    monkeypatch.setattr(media_backend.sys, "platform", "sunos5")
+    assert isinstance(default_backend(), NullMediaBackend)
+
+
+def test_null_backend_has_no_sessions_and_ignores_commands():
+    async def scenario():
+        backend = NullMediaBackend()
+        session = object()
+        for command in (backend.play, backend.pause, backend.next_track, backend.previous_track):
+            assert await command(session) is None
+        assert await backend.seek(session, 10.0) is None
+        return (await backend.get_sessions(), backend.session_id(session),
+                backend.playback_status(session), await backend.media_properties(session))
+
+    assert asyncio.run(scenario()) == ([], None, None, None)
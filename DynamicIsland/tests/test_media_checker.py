@@ -0,0 +1,57 @@
+import asyncio
+from functions.fake_media_backend import FakeMediaBackend, FakeSession
+from functions.media_backend import PLAYING
+from functions.media_checker import MediaPlayerController
+
+TICK = 0.05
+
+
+async def watch(backend, script):
+    """Run the monitor loop over script(backend), return the callbacks it fired"""
+    calls = []
+
+    async def on_track(info, cover):
+        calls.append(("track", info['title']))
+
+    async def on_nothing():
+        calls.append(("nothing",))
+
+    controller = MediaPlayerController(backend=backend)
+    monitor = asyncio.ensure_future(controller.monitor_track_changes(
+        change_callback=on_track, on_nothing=on_nothing, interval=TICK, fallback_interval=TICK, max_interval=TICK))
+    try:
+        await asyncio.sleep(4 * TICK)
+        await script(backend)
+        await asyncio.sleep(4 * TICK)
+    finally:
+        monitor.cancel()
+    return calls
+
+
+def test_same_track_after_player_closed_is_shown_again():
+    async def script(backend):
+        backend.remove_session("player")
+        await asyncio.sleep(4 * TICK)
+        backend.add_session(FakeSession("player", "Song", status=PLAYING))
+
+    backend = FakeMediaBackend([FakeSession("player", "Song", status=PLAYING)])
+    calls = asyncio.run(watch(backend, script))
+    assert calls == [("track", "Song"), ("nothing",), ("track", "Song")]
+
+
+def test_same_track_after_failed_read_is_shown_again():
+    async def script(backend):
+        read = backend.media_properties
+
+        async def failing(session):
+            raise OSError("media service restarted")
+
+        backend.media_properties = failing
+        backend.update("player", status=PLAYING)
+        await asyncio.sleep(4 * TICK)
+        backend.media_properties = read
+        backend.update("player", status=PLAYING)
+
+    backend = FakeMediaBackend([FakeSession("player", "Song", status=PLAYING)])
+    calls = asyncio.run(watch(backend, script))
+    assert calls == [("track", "Song"), ("nothing",), ("track", "Song")]
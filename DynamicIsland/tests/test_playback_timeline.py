@@ -0,0 +1,93 @@
+from functions.playback_timeline import PlaybackTimeline
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def playing_timeline(position=10.0, duration=200.0):
+    clock = Clock()
+    timeline = PlaybackTimeline(drift_threshold=1.0, clock=clock)
+    assert timeline.observe(position, duration, True, session_id="player")
+    return clock, timeline
+
+
+def test_position_is_extrapolated_from_the_clock():
+    clock, timeline = playing_timeline()
+    clock.now += 5.0
+    assert timeline.position() == 15.0
+    clock.now += 500.0
+    assert timeline.position() == 200.0
+
+
+def test_report_within_drift_threshold_keeps_the_anchor():
+    clock, timeline = playing_timeline()
+    clock.now += 5.0
+    assert not timeline.observe(15.6, 200.0, True, session_id="player")
+    assert timeline.stats()['resyncs'] == 1
+    assert round(timeline.last_drift, 6) == 0.6
+    assert timeline.position() == 15.0
+
+
+def test_report_past_drift_threshold_resyncs():
+    clock, timeline = playing_timeline()
+    clock.now += 5.0
+    assert timeline.observe(17.0, 200.0, True, session_id="player")
+    assert timeline.stats()['drift_corrections'] == 1
+    assert timeline.position() == 17.0
+
+
+def test_timeline_event_resyncs_even_without_drift():
+    clock, timeline = playing_timeline()
+    clock.now += 5.0
+    assert timeline.observe(15.0, 200.0, True, session_id="player", event=True)
+    assert timeline.stats()['drift_corrections'] == 0
+
+
+def test_seek_moves_the_position_right_away():
+    clock, timeline = playing_timeline()
+    version = timeline.version
+    timeline.seek(120.0)
+    assert timeline.position() == 120.0
+    assert timeline.version == version + 1
+    clock.now += 2.0
+    assert timeline.position() == 122.0
+
+
+def test_pause_and_resume_resync_and_freeze_the_position():
+    clock, timeline = playing_timeline()
+    clock.now += 5.0
+    assert timeline.observe(15.0, 200.0, False, session_id="player")
+    clock.now += 30.0
+    assert timeline.position() == 15.0
+    assert timeline.observe(15.0, 200.0, True, session_id="player")
+    clock.now += 1.0
+    assert timeline.position() == 16.0
+
+
+def test_aged_report_is_compared_at_the_time_it_was_measured():
+    clock, timeline = playing_timeline()
+    clock.now += 10.0
+    # Measured 8 s ago at position 12, read only now: on time, not 8 s behind
+    assert not timeline.observe(12.0, 200.0, True, at=clock.now - 8.0, session_id="player")
+    assert abs(timeline.last_drift) < 1e-9
+    assert timeline.position() == 20.0
+
+
+def test_resync_with_an_aged_report_extrapolates_from_its_time():
+    clock, timeline = playing_timeline()
+    clock.now += 10.0
+    assert timeline.observe(50.0, 200.0, True, at=clock.now - 3.0, session_id="player")
+    assert timeline.position() == 53.0
+
+
+def test_clear_stops_and_forgets_the_session():
+    clock, timeline = playing_timeline()
+    timeline.clear()
+    clock.now += 5.0
+    assert timeline.position() == 0.0
+    assert timeline.session_id is None
@@ -0,0 +1,142 @@
+import asyncio
+from functions.island_state import IslandStateMachine, COLLAPSED, MEDIA, TRACK
+from functions.track_transitions import TrackTransitionPipeline
+
+DEBOUNCE = 0.02
+
+
+class Island:
+    """Transition that takes duration seconds and records what it started and finished"""
+
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.started = []
+        self.shown = []
+        self.cancels = 0
+
+    async def transition(self, target):
+        self.started.append(target)
+        await asyncio.sleep(self.duration)
+        self.shown.append(target)
+
+    def on_cancel(self):
+        self.cancels += 1
+
+
+def pipeline(island):
+    return TrackTransitionPipeline(island.transition, debounce=DEBOUNCE, on_cancel=island.on_cancel)
+
+
+def test_burst_within_debounce_runs_only_the_last_track():
+    async def scenario():
+        island = Island()
+        transitions = pipeline(island)
+        for target in ("a", "b", "c"):
+            transitions.submit(target)
+            await asyncio.sleep(DEBOUNCE / 4)
+        await transitions.settle()
+        return island, transitions
+
+    island, transitions = asyncio.run(scenario())
+    assert island.started == ["c"]
+    assert island.shown == ["c"]
+    assert transitions.applied == "c"
+    assert transitions.stats()['superseded'] == 2
+    assert transitions.stats()['cancelled'] == 0
+    assert island.cancels == 0
+
+
+def test_newer_track_cancels_the_running_transition():
+    async def scenario():
+        island = Island()
+        transitions = pipeline(island)
+        transitions.submit("a")
+        await asyncio.sleep(DEBOUNCE + island.duration / 2)
+        transitions.submit("b")
+        await transitions.settle()
+        return island, transitions
+
+    island, transitions = asyncio.run(scenario())
+    assert island.started == ["a", "b"]
+    assert island.shown == ["b"]
+    assert transitions.applied == "b"
+    assert transitions.stats()['cancelled'] == 1
+    assert island.cancels == 1
+
+
+def test_cancel_drops_the_pending_track():
+    async def scenario():
+        island = Island()
+        transitions = pipeline(island)
+        transitions.submit("a")
+        transitions.cancel()
+        await transitions.settle()
+        return island, transitions
+
+    island, transitions = asyncio.run(scenario())
+    assert island.started == []
+    assert transitions.applied is None
+    assert not transitions.pending
+
+
+# Collapse sleeps and reveal of ControlDynamicIsland.__show_track
+COLLAPSE_TIME = 0.32
+REVEAL_TIME = 0.2
+
+
+class TrackIsland:
+    """show_track action with the island's timing, a replaced track skips the collapse"""
+
+    def __init__(self, shown=None):
+        self.on_island = self.shown = shown
+        self.started = []
+        self.shown_at = None
+
+    async def show_track(self, target):
+        self.started.append(target)
+        replacing, self.on_island = self.on_island is not None, target
+        if not replacing:
+            await asyncio.sleep(COLLAPSE_TIME)
+        await asyncio.sleep(REVEAL_TIME)
+        self.shown = target
+        self.shown_at = asyncio.get_running_loop().time()
+
+
+def burst(virtual_loop, changes, gap, shown="start"):
+    """Skip through changes tracks gap seconds apart, return the island and the last change time"""
+    island = TrackIsland(shown)
+    machine = IslandStateMachine({"show_track": island.show_track}, initial=MEDIA if shown else COLLAPSED)
+    transitions = TrackTransitionPipeline(lambda target: machine.post(TRACK, target),
+                                          debounce=0.15, on_cancel=lambda: machine.interrupt(TRACK))
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        for i in range(changes):
+            transitions.submit(f"Track {i}")
+            await asyncio.sleep(gap)
+        last_change = loop.time() - gap
+        await transitions.settle()
+        await machine.settle()
+        return last_change
+
+    last_change = virtual_loop.run_until_complete(scenario())
+    return island, machine, transitions, last_change
+
+
+def test_skip_burst_shows_only_the_last_track(virtual_loop):
+    island, machine, transitions, last_change = burst(virtual_loop, 20, 0.5 / 20)
+    assert island.shown == "Track 19"
+    assert island.started == ["Track 19"]
+    assert machine.mode == MEDIA
+    # Debounce, one coalesce window of the state machine and the reveal, no collapse
+    assert island.shown_at - last_change <= 0.15 + machine.coalesce_window + REVEAL_TIME + 0.01
+    assert transitions.stats()['superseded'] == 19
+
+
+def test_slow_skips_converge_on_the_last_track(virtual_loop):
+    island, machine, transitions, last_change = burst(virtual_loop, 20, 0.25)
+    assert island.shown == "Track 19"
+    assert island.started[-1] == "Track 19"
+    assert island.shown_at - last_change <= 0.15 + machine.coalesce_window + REVEAL_TIME + 0.01
+    # Every skip after the debounce cuts the running transition short
+    assert machine.stats()['interrupted'] == len(island.started) - 1
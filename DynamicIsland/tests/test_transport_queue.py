@@ -0,0 +1,130 @@
+import asyncio
+from functions.fake_media_backend import FakeMediaBackend, FakeSession
+from functions.media_backend import PLAYING, PAUSED
+from functions.transport_queue import TransportQueue, PLAY, PAUSE, NEXT, PREVIOUS, SEEK
+
+PLAYLIST = [{'title': f"Track {i}", 'duration': 200.0} for i in range(5)]
+
+
+class IgnoresPause(FakeMediaBackend):
+    """A player that accepts the pause command and keeps playing"""
+
+    async def pause(self, session):
+        await self._command(session, "pause")
+
+
+def player(latency, backend_class=FakeMediaBackend):
+    backend = backend_class(latency=latency)
+    backend.add_session(FakeSession("player", status=PLAYING, playlist=PLAYLIST, **PLAYLIST[0]))
+    return backend, backend.sessions["player"]
+
+
+def transport(backend, session, on_state=None, grace=1.0):
+    commands = {PLAY: backend.play, PAUSE: backend.pause, NEXT: backend.next_track,
+                PREVIOUS: backend.previous_track, SEEK: backend.seek}
+
+    async def send(command, *args):
+        await commands[command](session, *args)
+
+    queue = TransportQueue(send, on_state=on_state, grace=grace, clock=asyncio.get_running_loop().time)
+    queue.confirm(session.status == PLAYING)
+    return queue
+
+
+def sent(backend):
+    return [command[1:] for command in backend.commands]
+
+
+def test_last_toggle_wins_when_commands_complete_out_of_order(virtual_loop):
+    # Pauses take far longer than plays, sent one per click they would land out of order
+    backend, session = player(lambda name: 0.3 if name == "pause" else 0.05)
+
+    async def scenario():
+        queue = transport(backend, session)
+        for click in (queue.pause, queue.play, queue.pause, queue.play, queue.pause):
+            click()
+            await asyncio.sleep(0.03)
+        await queue.flush()
+        assert queue.playing is False
+        queue.confirm(session.status == PLAYING)
+        return queue
+
+    queue = virtual_loop.run_until_complete(scenario())
+    assert session.status == PAUSED
+    assert queue.playing is False
+    assert sent(backend) == [("pause",)]
+
+
+def test_play_pause_pair_sends_nothing(virtual_loop):
+    backend, session = player(0.2)
+
+    async def scenario():
+        queue = transport(backend, session)
+        queue.seek(30.0)
+        await asyncio.sleep(0.01)
+        queue.pause()
+        assert queue.playing is False
+        queue.play()
+        await queue.flush()
+        return queue
+
+    queue = virtual_loop.run_until_complete(scenario())
+    assert sent(backend) == [("seek", 30.0)]
+    assert queue.playing is True
+    assert queue.stats()['cancelled'] == 1
+
+
+def test_next_and_previous_cancel(virtual_loop):
+    backend, session = player(0.2)
+
+    async def scenario():
+        queue = transport(backend, session)
+        queue.seek(30.0)
+        await asyncio.sleep(0.01)
+        clicks = [queue.next(), queue.previous()]
+        await queue.flush()
+        return clicks
+
+    clicks = virtual_loop.run_until_complete(scenario())
+    assert sent(backend) == [("seek", 30.0)]
+    assert session.title == "Track 0"
+    # The clicks still resolve although nothing was sent for them
+    assert all(click.done() and click.result() for click in clicks)
+
+
+def test_skip_drops_a_pending_seek(virtual_loop):
+    backend, session = player(0.2)
+
+    async def scenario():
+        queue = transport(backend, session)
+        queue.pause()
+        await asyncio.sleep(0.01)
+        queue.seek(120.0)
+        queue.next()
+        await queue.flush()
+
+    virtual_loop.run_until_complete(scenario())
+    assert sent(backend) == [("pause",), ("next",)]
+    assert session.title == "Track 1"
+    assert session.position == 0.0
+
+
+def test_ignored_pause_reverts_through_on_state(virtual_loop):
+    backend, session = player(0.05, IgnoresPause)
+    states = []
+
+    async def scenario():
+        queue = transport(backend, session, on_state=states.append, grace=1.0)
+        queue.pause()
+        await queue.flush()
+        # The player keeps reporting playing, within the grace period that is stale
+        assert queue.confirm(session.status == PLAYING) is False
+        assert queue.playing is False
+        await asyncio.sleep(1.0)
+        return queue
+
+    queue = virtual_loop.run_until_complete(scenario())
+    assert states == [True]
+    assert queue.playing is True
+    assert queue.stats()['reverted'] == 1
+    assert queue.stats()['stale_confirmations'] == 1
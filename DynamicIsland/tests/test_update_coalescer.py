@@ -0,0 +1,84 @@
+from functions.update_coalescer import UpdateCoalescer
+
+
+class Page:
+    """Records every page.update() call with the controls it carried"""
+
+    def __init__(self):
+        self.calls = []
+
+    def update(self, *controls):
+        self.calls.append(controls)
+
+
+class Control:
+    def __init__(self, page=None, **props):
+        self.page = page
+        self.__dict__.update(props)
+
+
+def test_assigning_the_current_value_sends_nothing():
+    page = Page()
+    box = Control(width=100, height=40)
+    updates = UpdateCoalescer(page)
+
+    assert updates.set(box, width=100, height=40) is False
+    assert updates.flush() == 0
+    assert page.calls == []
+    assert updates.changes_dropped == 2
+    assert updates.messages_sent == 0
+
+
+def test_only_changed_properties_mark_the_control():
+    page = Page()
+    box = Control(width=100, height=40)
+    updates = UpdateCoalescer(page)
+
+    assert updates.set(box, width=100, height=50) is True
+    assert (updates.changes_applied, updates.changes_dropped) == (1, 1)
+    assert updates.flush() == 1
+    assert page.calls == [(box,)]
+    assert box.height == 50
+
+
+def test_nested_batches_send_one_update():
+    page = Page()
+    island, cover, title = Control(width=100), Control(src=None), Control(value="")
+    updates = UpdateCoalescer(page)
+
+    with updates.batch():
+        updates.set(island, width=200)
+        updates.flush()
+        with updates.batch():
+            updates.set(cover, src="a.png")
+            updates.set(island, width=250)
+            updates.flush()
+        assert page.calls == []
+        updates.mark(title)
+    assert len(page.calls) == 1
+    assert set(page.calls[0]) == {island, cover, title}
+    assert len(page.calls[0]) == 3
+    assert updates.messages_sent == 1
+    assert updates.controls_sent == 3
+    assert updates.pending == 0
+
+
+def test_control_page_is_used_when_the_coalescer_has_none():
+    page = Page()
+    box = Control(page=page, width=1)
+    updates = UpdateCoalescer()
+
+    updates.set(box, width=2)
+    assert updates.flush() == 1
+    assert page.calls == [(box,)]
+
+
+def test_unmounted_controls_are_discarded_without_a_message():
+    box = Control(width=1)
+    updates = UpdateCoalescer()
+
+    updates.set(box, width=2)
+    assert updates.flush() == 0
+    assert updates.pending == 0
+    assert updates.messages_sent == 0
+    assert box.width == 2